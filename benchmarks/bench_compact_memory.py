@@ -0,0 +1,60 @@
+"""Memory report of results stored with and without `compact=True`.
+
+Scales every mock payload in tests/mocks up to the given number of rows per
+league, across all seven leagues, and reports the deep memory footprint of the
+default dtypes against the compact ones.
+
+Run it as a module from the root of the repository:
+
+    python -m benchmarks.bench_compact_memory --rows 20000
+"""
+
+import argparse
+import json
+from pathlib import Path
+
+from pandas import DataFrame, concat
+
+from itscalledsoccer.client import LEAGUES
+from itscalledsoccer.compact import compact_frame
+
+MOCKS_DIR = Path(__file__).parent.parent / "tests" / "mocks"
+
+
+def scaled_result(path: Path, rows: int) -> DataFrame:
+    """Builds a result with `rows` rows per league by repeating a mock payload"""
+    payload = json.loads(path.read_text())
+    frames = []
+    for league in LEAGUES:
+        records = [payload[i % len(payload)] for i in range(rows)]
+        frames.append(DataFrame(records).assign(competition=league))
+    return concat(frames, ignore_index=True)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=20000)
+    args = parser.parse_args()
+
+    total_before = total_after = 0
+    print(f"{'endpoint':<24} {'default (MB)':>12} {'compact (MB)':>12} {'saved':>6}")
+    for path in sorted(MOCKS_DIR.glob("*_payload.json")):
+        name = path.name.removesuffix("_payload.json")
+        endpoint = name.replace("_", "/", 1).replace("_", "-")
+        result = scaled_result(path, args.rows)
+        before = result.memory_usage(deep=True).sum()
+        after = compact_frame(result, endpoint).memory_usage(deep=True).sum()
+        total_before += before
+        total_after += after
+        print(
+            f"{endpoint:<24} {before / 1e6:>12.1f} {after / 1e6:>12.1f} "
+            f"{1 - after / before:>6.0%}"
+        )
+    print(
+        f"{'total':<24} {total_before / 1e6:>12.1f} {total_after / 1e6:>12.1f} "
+        f"{1 - total_after / total_before:>6.0%}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,221 @@
+"""End-to-end benchmark of the client against a local replay of the API.
+
+Serves the payloads in tests/mocks from `tests.replay_server.ReplayServer`, scaled
+up to `--rows` rows per league so results span several pages of `MAX_API_LIMIT`
+rows, with `--latency` milliseconds waited before each response. Every scenario
+runs across all leagues on a fresh client, so nothing is served from a cache, and
+reports its latency, throughput and peak memory. The results are written as JSON
+so runs can be compared in review.
+
+With `--transport memory`, the same payloads are served in-process by a
+`MemoryTransport` instead, which removes the network and measures the decoding and
+DataFrame pipeline alone.
+
+Run it as a module from the root of the repository:
+
+    python -m benchmarks.bench_end_to_end --rows 2500 --latency 20 --output results.json
+    python -m benchmarks.bench_end_to_end --rows 2500 --transport memory
+"""
+
+import argparse
+import json
+import platform
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+from collections.abc import Callable
+from contextlib import nullcontext
+
+import pandas
+
+from itscalledsoccer import AmericanSoccerAnalysis, MemoryTransport, MetricsAggregator
+from tests.replay_server import MOCKS_DIR, ReplayServer
+
+ENDPOINTS = (
+    "games",
+    "players",
+    "teams",
+    "stadia",
+    "managers",
+    "referees",
+    "players/xgoals",
+)
+
+
+def scaled_payload(records: list[dict], rows: int) -> list[dict]:
+    """Repeats the records of a mock payload up to `rows` records.
+
+    Ids and names of repeated records get a suffix, so that every record stays
+    distinct, the way the real API never repeats a game or player id.
+    """
+    scaled = []
+    for i in range(rows):
+        record = dict(records[i % len(records)])
+        copy = i // len(records)
+        if copy:
+            for key, value in record.items():
+                if isinstance(value, str) and key.endswith(("_id", "_name")):
+                    record[key] = f"{value} {copy}"
+        scaled.append(record)
+    return scaled
+
+
+def misspelled_names(client: AmericanSoccerAnalysis, count: int) -> list[str]:
+    """Samples player names and drops one letter of each, so every name goes through fuzzy matching"""
+    rng = random.Random(0)
+    names = rng.sample(client.players["player_name"].dropna().tolist(), count)
+    misspelled = []
+    for name in names:
+        position = rng.randrange(len(name))
+        misspelled.append(name[:position] + name[position + 1 :])
+    return misspelled
+
+
+def scenarios(names: int) -> dict[str, tuple[Callable, Callable]]:
+    """Returns each scenario as a setup function, run untimed, and a timed function
+    returning the number of rows it produced"""
+
+    def no_setup(client: AmericanSoccerAnalysis) -> None:
+        return None
+
+    def load_players(client: AmericanSoccerAnalysis) -> list[str]:
+        client.get_players()
+        return misspelled_names(client, names)
+
+    def load_entities(client: AmericanSoccerAnalysis) -> int:
+        return sum(
+            len(client._entity_lookup(entity_type))
+            for entity_type in client.ENTITY_TYPES
+        )
+
+    return {
+        "get_games": (no_setup, lambda client, _: len(client.get_games())),
+        "get_player_xgoals": (
+            no_setup,
+            lambda client, _: len(client.get_player_xgoals()),
+        ),
+        "entity_loads": (no_setup, lambda client, _: load_entities(client)),
+        "name_resolution": (
+            load_players,
+            lambda client, player_names: len(
+                client._convert_names_to_ids("player", player_names)
+            ),
+        ),
+    }
+
+
+def run_once(
+    replay: ReplayServer | None,
+    payloads: dict[str, list],
+    setup: Callable,
+    timed: Callable,
+    trace_memory: bool,
+) -> dict:
+    """Runs a scenario on a fresh client, and measures the timed part.
+    Without a replay server, the payloads are served by a `MemoryTransport`."""
+    if replay is None:
+        client = AmericanSoccerAnalysis(
+            max_workers=4, result_cache_bytes=0, transport=MemoryTransport(payloads)
+        )
+    else:
+        client = AmericanSoccerAnalysis(max_workers=4, result_cache_bytes=0)
+        client.base_url = replay.base_url
+    prepared = setup(client)
+    metrics = MetricsAggregator()
+    client.on_request_end(metrics)
+
+    if trace_memory:
+        tracemalloc.start()
+    start = time.perf_counter()
+    rows = timed(client, prepared)
+    elapsed = time.perf_counter() - start
+    peak = 0
+    if trace_memory:
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    summary = metrics.summary()
+    return {
+        "seconds": elapsed,
+        "rows": rows,
+        "requests": int(summary["requests"].sum()),
+        "bytes_received": int(summary["bytes_received"].sum()),
+        "peak_memory_bytes": peak,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=2500, help="rows per league")
+    parser.add_argument("--latency", type=float, default=20, help="milliseconds")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--names", type=int, default=50)
+    parser.add_argument("--transport", choices=("http", "memory"), default="http")
+    parser.add_argument("--output", help="JSON file, defaults to standard output")
+    args = parser.parse_args()
+
+    report = {
+        "config": {
+            "rows_per_league": args.rows,
+            "latency_ms": args.latency if args.transport == "http" else 0,
+            "transport": args.transport,
+            "repeat": args.repeat,
+            "names": args.names,
+            "leagues": len(AmericanSoccerAnalysis.LEAGUES),
+        },
+        "environment": {
+            "python": platform.python_version(),
+            "pandas": pandas.__version__,
+            "platform": platform.platform(),
+        },
+        "results": {},
+    }
+
+    server = (
+        ReplayServer(latency=args.latency / 1000)
+        if args.transport == "http"
+        else nullcontext()
+    )
+    with server as replay:
+        fixtures = MemoryTransport(MOCKS_DIR)
+        payloads = {
+            endpoint: scaled_payload(fixtures.records("mls", endpoint), args.rows)
+            for endpoint in ENDPOINTS
+        }
+        if replay is not None:
+            for endpoint, records in payloads.items():
+                replay.set_payload(endpoint, records)
+
+        for name, (setup, timed) in scenarios(args.names).items():
+            runs = [
+                run_once(replay, payloads, setup, timed, trace_memory=False)
+                for _ in range(args.repeat)
+            ]
+            # Tracing slows allocations down, so peak memory is measured in a separate run
+            traced = run_once(replay, payloads, setup, timed, trace_memory=True)
+            seconds = [run["seconds"] for run in runs]
+            median = statistics.median(seconds)
+            report["results"][name] = {
+                "seconds_min": min(seconds),
+                "seconds_median": median,
+                "seconds_max": max(seconds),
+                "rows": runs[0]["rows"],
+                "requests": runs[0]["requests"],
+                "rows_per_second": runs[0]["rows"] / median,
+                "megabytes_per_second": runs[0]["bytes_received"] / median / 1e6,
+                "peak_memory_megabytes": traced["peak_memory_bytes"] / 1e6,
+            }
+            print(f"{name:<20} {median:>8.3f} s", file=sys.stderr)
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
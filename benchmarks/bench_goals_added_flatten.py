@@ -0,0 +1,66 @@
+"""Benchmark of flattening goals added results against the number of rows.
+
+Scales the mock payload in tests/mocks/players_goals_added_payload.json up to
+game-level sizes, and compares the client's flatten modes with the usual
+row-by-row unnesting done by consumers of the nested `data` column.
+
+Run it as a module from the root of the repository:
+
+    python -m benchmarks.bench_goals_added_flatten --rows 10000 100000
+"""
+
+import argparse
+import json
+import time
+from pathlib import Path
+
+from pandas import DataFrame, Series, concat
+
+from itscalledsoccer.client import _flatten_goals_added
+
+MOCKS_DIR = Path(__file__).parent.parent / "tests" / "mocks"
+
+
+def scaled_payload(rows: int) -> DataFrame:
+    """Repeats the mock payload until it holds the given number of rows"""
+    payload = json.loads((MOCKS_DIR / "players_goals_added_payload.json").read_text())
+    records = [{**payload[i % len(payload)], "game_id": f"g{i}"} for i in range(rows)]
+    return DataFrame(records)
+
+
+def explode_row_by_row(stats: DataFrame) -> DataFrame:
+    """Unnests the `data` column with explode and one Series per action record"""
+    exploded = stats.explode("data", ignore_index=True)
+    actions = exploded["data"].apply(Series)
+    return concat([exploded.drop(columns="data"), actions], axis=1)
+
+
+def timed(func, *args) -> tuple[float, DataFrame]:
+    start = time.perf_counter()
+    result = func(*args)
+    return time.perf_counter() - start, result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[1000, 10000, 100000])
+    args = parser.parse_args()
+
+    print(
+        f"{'rows':>7} {'row-by-row (s)':>15} {'long (s)':>9} {'wide (s)':>9} {'speedup':>8}"
+    )
+    for rows in args.rows:
+        stats = scaled_payload(rows)
+        row_by_row, expected = timed(explode_row_by_row, stats)
+        long_time, long = timed(_flatten_goals_added, stats, "long")
+        wide_time, _ = timed(_flatten_goals_added, stats, "wide")
+
+        assert long.equals(expected[long.columns])
+        print(
+            f"{rows:>7} {row_by_row:>15.3f} {long_time:>9.3f} {wide_time:>9.3f} "
+            f"{row_by_row / long_time:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
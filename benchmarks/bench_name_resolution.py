@@ -0,0 +1,97 @@
+"""Benchmark of name resolution time against the length of the list of names.
+
+Compares the name index used by the client with the previous approach of one
+list build, `extractOne` call and table scan per name. The names are misspelled
+so that every one of them goes through fuzzy matching.
+
+Run it as a module from the root of the repository:
+
+    python -m benchmarks.bench_name_resolution --players 20000
+"""
+
+import argparse
+import random
+import time
+from pathlib import Path
+
+from pandas import DataFrame, read_json
+from rapidfuzz import fuzz, process
+
+from itscalledsoccer import AmericanSoccerAnalysis
+
+MOCKS_DIR = Path(__file__).parent.parent / "tests" / "mocks"
+
+
+def synthetic_players(count: int) -> DataFrame:
+    """Builds a players table of the given size from the names in the mock payload"""
+    names = read_json(MOCKS_DIR / "players_payload.json")["player_name"].tolist()
+    first = [name.split(" ")[0] for name in names]
+    last = [name.split(" ")[-1] for name in names]
+    rng = random.Random(0)
+    return DataFrame(
+        {
+            "player_id": [f"p{i}" for i in range(count)],
+            "player_name": [
+                f"{rng.choice(first)} {rng.choice(last)}{i}" for i in range(count)
+            ],
+            "competition": "mls",
+        }
+    )
+
+
+def misspell(name: str, rng: random.Random) -> str:
+    """Drops one letter of the first name, so the name is never an exact match"""
+    position = rng.randrange(name.index(" "))
+    return name[:position] + name[position + 1 :]
+
+
+def resolve_one_by_one(players: DataFrame, names: list[str]) -> list[str]:
+    """The previous implementation: one list build, match and table scan per name"""
+    ids = []
+    for name in names:
+        choices = players["player_name"].to_list()
+        match = process.extractOne(name, choices, scorer=fuzz.partial_ratio)
+        if match and match[1] >= 70:
+            ids.append(
+                players.loc[players["player_name"] == match[0], "player_id"].iloc[0]
+            )
+        else:
+            ids.append("")
+    return ids
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--players", type=int, default=20000)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 10, 50, 100, 500])
+    args = parser.parse_args()
+
+    players = synthetic_players(args.players)
+    client = AmericanSoccerAnalysis()
+    client.players = players
+    rng = random.Random(1)
+
+    print(f"{'names':>6} {'one-by-one (s)':>15} {'indexed (s)':>12} {'speedup':>8}")
+    for size in args.sizes:
+        names = [
+            misspell(name, rng)
+            for name in rng.sample(players["player_name"].tolist(), size)
+        ]
+
+        start = time.perf_counter()
+        expected = resolve_one_by_one(players, names)
+        one_by_one = time.perf_counter() - start
+
+        client._name_indexes.clear()
+        start = time.perf_counter()
+        ids = client._convert_names_to_ids("player", names)
+        indexed = time.perf_counter() - start
+
+        assert ids == expected
+        print(
+            f"{size:>6} {one_by_one:>15.3f} {indexed:>12.3f} {one_by_one / indexed:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
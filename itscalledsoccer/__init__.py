@@ -1,4 +1,6 @@
-from itscalledsoccer.client import AmericanSoccerAnalysis
+from importlib import import_module
+from typing import TYPE_CHECKING
+
 from itscalledsoccer.errors import (
     ASAError,
     ConflictingParametersError,
@@ -7,15 +9,77 @@ from itscalledsoccer.errors import (
     InvalidParameterFormatError,
     InvalidSeasonError,
     SalaryDataError,
+    SnapshotError,
 )
 
+if TYPE_CHECKING:
+    from itscalledsoccer.async_client import AsyncAmericanSoccerAnalysis
+    from itscalledsoccer.cache import ResultCache, SQLiteCache
+    from itscalledsoccer.client import AmericanSoccerAnalysis, StatsPage
+    from itscalledsoccer.entity_store import EntityStore
+    from itscalledsoccer.events import MetricsAggregator, RequestEvent
+    from itscalledsoccer.ratelimit import RateLimiter
+    from itscalledsoccer.snapshot import Snapshot
+    from itscalledsoccer.transport import (
+        MemoryTransport,
+        RequestsTransport,
+        Transport,
+        TransportResponse,
+    )
+
+# Modules are imported on first access, so importing the package stays cheap
+_LAZY_IMPORTS = {
+    "AmericanSoccerAnalysis": "itscalledsoccer.client",
+    "AsyncAmericanSoccerAnalysis": "itscalledsoccer.async_client",
+    "EntityStore": "itscalledsoccer.entity_store",
+    "MemoryTransport": "itscalledsoccer.transport",
+    "MetricsAggregator": "itscalledsoccer.events",
+    "RateLimiter": "itscalledsoccer.ratelimit",
+    "RequestEvent": "itscalledsoccer.events",
+    "RequestsTransport": "itscalledsoccer.transport",
+    "ResultCache": "itscalledsoccer.cache",
+    "Snapshot": "itscalledsoccer.snapshot",
+    "SQLiteCache": "itscalledsoccer.cache",
+    "StatsPage": "itscalledsoccer.client",
+    "Transport": "itscalledsoccer.transport",
+    "TransportResponse": "itscalledsoccer.transport",
+}
+
+
+def __getattr__(name: str):
+    module = _LAZY_IMPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
+
+
 __all__ = [
     "AmericanSoccerAnalysis",
+    "AsyncAmericanSoccerAnalysis",
     "ASAError",
     "ConflictingParametersError",
+    "EntityStore",
     "InvalidEntityTypeError",
     "InvalidLeagueError",
     "InvalidParameterFormatError",
     "InvalidSeasonError",
+    "MemoryTransport",
+    "MetricsAggregator",
+    "RateLimiter",
+    "RequestEvent",
+    "RequestsTransport",
+    "ResultCache",
     "SalaryDataError",
+    "Snapshot",
+    "SnapshotError",
+    "SQLiteCache",
+    "StatsPage",
+    "Transport",
+    "TransportResponse",
 ]
@@ -0,0 +1,228 @@
+import socket
+import threading
+from collections import Counter
+from collections.abc import Callable
+from datetime import timedelta
+from typing import Any
+from urllib.parse import parse_qs, urlsplit
+
+from cachecontrol.adapter import CacheControlAdapter
+from cachecontrol.heuristics import ExpiresAfter, datetime_to_header, expire_after
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.poolmanager import PoolManager
+
+from itscalledsoccer.ratelimit import THROTTLE_STATUSES, RateLimiter, parse_retry_after
+
+
+class _PoolCounter:
+    """Thread-safe counts of connection pool events"""
+
+    def __init__(self) -> None:
+        self._counts: Counter[str] = Counter()
+        self._lock = threading.Lock()
+
+    def add(self, event: str) -> None:
+        with self._lock:
+            self._counts[event] += 1
+
+    def counts(self) -> Counter[str]:
+        with self._lock:
+            return self._counts.copy()
+
+
+class _CountingPoolMixin:
+    """Counts the connections a urllib3 pool opens, reuses and discards"""
+
+    counter: _PoolCounter
+
+    def _get_conn(self, timeout: float | None = None) -> Any:
+        if self.block and self.pool is not None and self.pool.empty():
+            # Every connection is in use, the request waits for one to be returned
+            self.counter.add("waited")
+        conn = super()._get_conn(timeout)
+        # New connections, and pooled ones dropped by the server, have no socket and
+        # connect again. `sock` is set by urllib3 1.26 and 2.x alike, unlike `is_closed`
+        self.counter.add("opened" if conn.sock is None else "reused")
+        return conn
+
+    def _put_conn(self, conn: Any) -> None:
+        if conn is not None and self.pool is not None and self.pool.full():
+            # The pool has no room left, the connection is closed instead of kept
+            self.counter.add("discarded")
+        super()._put_conn(conn)
+
+
+class _CountingHTTPConnectionPool(_CountingPoolMixin, HTTPConnectionPool):
+    pass
+
+
+class _CountingHTTPSConnectionPool(_CountingPoolMixin, HTTPSConnectionPool):
+    pass
+
+
+class _CountingPoolManager(PoolManager):
+    """Pool manager whose pools report to a shared counter"""
+
+    def __init__(self, *args: Any, counter: _PoolCounter, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.counter = counter
+        self.pool_classes_by_scheme = {
+            "http": _CountingHTTPConnectionPool,
+            "https": _CountingHTTPSConnectionPool,
+        }
+
+    def _new_pool(self, scheme: str, host: str, port: int, request_context=None):
+        pool = super()._new_pool(scheme, host, port, request_context)
+        pool.counter = self.counter
+        return pool
+
+
+class _RateLimitedAdapter(HTTPAdapter):
+    """Sends requests through a `RateLimiter`, sending throttled requests again once it allows"""
+
+    rate_limiter: RateLimiter | None = None
+
+    def send(self, request: Any, *args: Any, **kwargs: Any) -> Any:
+        if self.rate_limiter is None:
+            return super().send(request, *args, **kwargs)
+        for attempt in range(self.rate_limiter.max_retries + 1):
+            self.rate_limiter.acquire()
+            status = retry_after = None
+            try:
+                response = super().send(request, *args, **kwargs)
+                status = response.status_code
+                retry_after = parse_retry_after(response.headers.get("Retry-After"))
+            finally:
+                self.rate_limiter.release(status, retry_after)
+            if (
+                status not in THROTTLE_STATUSES
+                or attempt == self.rate_limiter.max_retries
+            ):
+                return response
+            # Read the body so the connection goes back to the pool
+            _ = response.content
+            response.close()
+
+
+class CompletedSeasonsHeuristic(ExpiresAfter):
+    """Caches responses for one day, and responses about completed seasons only for
+    `completed_days`, since their data no longer changes"""
+
+    def __init__(
+        self,
+        is_completed: Callable[[str, dict[str, str]], bool],
+        completed_days: int = 365,
+    ) -> None:
+        """Class constructor
+
+        Args:
+            is_completed (Callable[[str, dict[str, str]], bool]): tells from the path and URL query strings of a request whether it only covers completed seasons
+            completed_days (int): Number of days responses about completed seasons are cached for. Defaults to 365.
+        """
+        super().__init__(days=1)
+        self.is_completed = is_completed
+        self.completed_delta = timedelta(days=completed_days)
+
+    def update_headers(self, response: Any) -> dict[str, str]:
+        if response.url:
+            parts = urlsplit(response.url)
+            params = {key: values[-1] for key, values in parse_qs(parts.query).items()}
+            if self.is_completed(parts.path, params):
+                expires = expire_after(self.completed_delta)
+                return {
+                    "expires": datetime_to_header(expires),
+                    "cache-control": "public",
+                }
+        return super().update_headers(response)
+
+
+class PooledCacheAdapter(CacheControlAdapter, _RateLimitedAdapter):
+    """Caching HTTP adapter with a tunable, instrumented connection pool.
+
+    Connections to each host are kept in a pool of `pool_maxsize` connections and
+    reused across requests. The pool reports how many connections were opened,
+    reused, waited for or discarded, so it can be sized for the concurrent league
+    and page requests of a client. Given a `RateLimiter`, requests sent to the API,
+    but not those served by the cache, wait for it.
+    """
+
+    __attrs__ = CacheControlAdapter.__attrs__ + ["keep_alive", "keep_alive_idle"]
+
+    def __init__(
+        self,
+        *args: Any,
+        keep_alive: bool = True,
+        keep_alive_idle: int = 60,
+        rate_limiter: RateLimiter | None = None,
+        **kwargs: Any,
+    ) -> None:
+        """Class constructor
+
+        Args:
+            *args: positional arguments of `CacheControlAdapter`
+            keep_alive (bool): Whether connections are kept open between requests. Defaults to True.
+            keep_alive_idle (int): Number of idle seconds before TCP keep-alive probes are sent on pooled connections, where the platform supports it. Defaults to 60.
+            rate_limiter (RateLimiter | None): Limiter every request sent to the API waits for. Defaults to None.
+            **kwargs: keyword arguments of `CacheControlAdapter` and `HTTPAdapter`, such as `max_retries`, `pool_connections`, `pool_maxsize` and `pool_block`
+        """
+        self.keep_alive = keep_alive
+        self.keep_alive_idle = keep_alive_idle
+        self.rate_limiter = rate_limiter
+        self._counter = _PoolCounter()
+        super().__init__(*args, **kwargs)
+
+    def __setstate__(self, state: dict) -> None:
+        # HTTPAdapter rebuilds its pool manager when unpickled
+        self._counter = _PoolCounter()
+        super().__setstate__(state)
+
+    def _socket_options(self) -> list[tuple[int, int, int]]:
+        """Returns the options set on every new socket
+
+        Returns:
+            list[tuple[int, int, int]]
+        """
+        options = list(HTTPConnection.default_socket_options)
+        if self.keep_alive:
+            options.append((socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1))
+            if hasattr(socket, "TCP_KEEPIDLE"):
+                options.append(
+                    (socket.IPPROTO_TCP, socket.TCP_KEEPIDLE, self.keep_alive_idle)
+                )
+        return options
+
+    def init_poolmanager(
+        self, connections: int, maxsize: int, block: bool = False, **pool_kwargs: Any
+    ) -> None:
+        self._pool_connections = connections
+        self._pool_maxsize = maxsize
+        self._pool_block = block
+        pool_kwargs.setdefault("socket_options", self._socket_options())
+        self.poolmanager = _CountingPoolManager(
+            num_pools=connections,
+            maxsize=maxsize,
+            block=block,
+            counter=self._counter,
+            **pool_kwargs,
+        )
+
+    def add_headers(self, request: Any, **kwargs: Any) -> None:
+        if not self.keep_alive:
+            request.headers["Connection"] = "close"
+
+    def stats(self) -> dict[str, int]:
+        """Reports the connection pool usage
+
+        Returns:
+            dict[str, int]: the size of each host pool, connections opened, requests served by a reused connection, requests that waited for a free connection, and connections closed because the pool was full
+        """
+        counts = self._counter.counts()
+        return {
+            "pool_maxsize": self._pool_maxsize,
+            "opened": counts["opened"],
+            "reused": counts["reused"],
+            "waited": counts["waited"],
+            "discarded": counts["discarded"],
+        }
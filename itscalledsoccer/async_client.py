@@ -0,0 +1,999 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+from collections import deque
+from collections.abc import AsyncIterator
+from time import perf_counter
+from typing import TYPE_CHECKING, NamedTuple
+
+from pandas import DataFrame, concat
+from requests import HTTPError
+
+from itscalledsoccer.client import (
+    LEAGUES,
+    StatsPage,
+    _ClientBase,
+    _flatten_goals_added,
+)
+
+if TYPE_CHECKING:
+    import httpx
+    from cachecontrol.cache import BaseCache
+    from cachecontrol.heuristics import BaseHeuristic
+    from requests import PreparedRequest
+    from typing_extensions import Self
+    from urllib3 import HTTPResponse
+
+
+class _Response(NamedTuple):
+    """Final response to a request, after any retries"""
+
+    target: str
+    status: int
+    reason: str
+    retries: int
+    body: bytes
+    cache_hit: bool = False
+
+    def raise_for_status(self) -> None:
+        if self.status >= 400:
+            kind = "Client" if self.status < 500 else "Server"
+            raise HTTPError(
+                f"{self.status} {kind} Error: {self.reason} for url: {self.target}"
+            )
+
+
+class _AsyncConnectionPool:
+    """Sends GET requests over the keep-alive connections of an `httpx.AsyncClient`,
+    which follows redirects and honors proxies.
+
+    Responses are cached with CacheControl, in the same cache and for as long as
+    `AmericanSoccerAnalysis` caches them, and failed requests are retried with
+    exponential backoff, honoring Retry-After. Cache lookups and writes block, such
+    as those of a `SQLiteCache` on disk, so they run in worker threads instead of on
+    the event loop. The connections belong to the event loop the pool is created on.
+    """
+
+    RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+    # httpx decodes bodies, so the cached headers must not describe the encoded body
+    ENCODING_HEADERS = frozenset(
+        {"content-encoding", "content-length", "transfer-encoding"}
+    )
+
+    def __init__(
+        self,
+        timeout: float,
+        cache: BaseCache,
+        heuristic: BaseHeuristic | None = None,
+        proxies: dict[str, str] | None = None,
+        max_retries: int = 3,
+        backoff_factor: float = 0.5,
+    ) -> None:
+        """Class constructor
+
+        Args:
+            timeout (float): Number of seconds to wait for each response.
+            cache (BaseCache): CacheControl cache the responses are stored in.
+            heuristic (BaseHeuristic | None): How long responses without caching headers are cached for. Defaults to None, not cached.
+            proxies (dict[str, str] | None): Proxy URLs keyed by scheme, such as "https", or by scheme and host, as given to `requests`. Defaults to None, the proxies of the environment.
+            max_retries (int): Number of times a failed request is retried. Defaults to 3.
+            backoff_factor (float): Base of the exponential backoff between retries, in seconds. Defaults to 0.5.
+        """
+        import httpx
+        from cachecontrol.controller import CacheController
+
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.heuristic = heuristic
+        self.controller = CacheController(cache)
+        mounts = {
+            (key if "://" in key else f"{key}://"): httpx.AsyncHTTPTransport(proxy=url)
+            for key, url in (proxies or {}).items()
+        }
+        self.client = httpx.AsyncClient(
+            timeout=timeout,
+            follow_redirects=True,
+            mounts=mounts,
+            headers={"Accept": "application/json", "User-Agent": "itscalledsoccer"},
+        )
+
+    async def get(self, url: str, params: dict[str, str | None]) -> _Response:
+        """Sends a GET request, unless the cache holds a fresh response, retrying on
+        connection errors and retryable statuses
+
+        Args:
+            url (str): the URL to request
+            params (dict[str, str | None]): URL query strings
+
+        Returns:
+            _Response: the final response, with its decoded body
+        """
+        import httpx
+        from requests import Request
+        from urllib3.exceptions import InvalidHeader
+        from urllib3.util.retry import Retry
+
+        # Requests are prepared the way `requests` prepares them, so that both
+        # clients share the entries of a cache
+        request = Request("GET", url, params=params).prepare()
+        cached = await asyncio.to_thread(self.controller.cached_request, request)
+        if cached:
+            return self._response(request, cached, 0, cache_hit=True)
+        request.headers.update(
+            await asyncio.to_thread(self.controller.conditional_headers, request)
+        )
+
+        for attempt in range(self.max_retries + 1):
+            try:
+                response = await self.client.get(
+                    request.url, headers=dict(request.headers)
+                )
+            except httpx.TransportError:
+                if attempt == self.max_retries:
+                    raise
+                await asyncio.sleep(self.backoff_factor * 2**attempt)
+                continue
+
+            if (
+                response.status_code in self.RETRY_STATUSES
+                and attempt < self.max_retries
+            ):
+                delay = self.backoff_factor * 2**attempt
+                if "retry-after" in response.headers:
+                    try:
+                        delay = Retry().parse_retry_after(
+                            response.headers["retry-after"]
+                        )
+                    except InvalidHeader:
+                        pass
+                await asyncio.sleep(delay)
+                continue
+            break
+
+        return await asyncio.to_thread(self._store, request, response, attempt)
+
+    def _store(
+        self, request: PreparedRequest, response: httpx.Response, retries: int
+    ) -> _Response:
+        """Caches a response the way the CacheControl adapter of `requests` caches it.
+        Blocks on the cache, so it is run in a worker thread
+
+        Args:
+            request (PreparedRequest): the request sent
+            response (httpx.Response): the final response
+            retries (int): number of times the request was retried
+
+        Returns:
+            _Response
+        """
+        from urllib3 import HTTPResponse
+
+        raw = HTTPResponse(
+            body=response.content,
+            headers={
+                name: value
+                for name, value in response.headers.items()
+                if name not in self.ENCODING_HEADERS
+            },
+            status=response.status_code,
+            reason=response.reason_phrase,
+            version=11,
+            request_url=request.url,
+            preload_content=False,
+            decode_content=False,
+        )
+        if self.heuristic is not None:
+            raw = self.heuristic.apply(raw)
+        if raw.status == 304:
+            # The cached response is still fresh, according to its ETag
+            cached = self.controller.update_cached_response(request, raw)
+            return self._response(request, cached, retries, cache_hit=cached is not raw)
+        self.controller.cache_response(request, raw, response.content)
+        return self._response(request, raw, retries)
+
+    @staticmethod
+    def _response(
+        request: PreparedRequest,
+        raw: HTTPResponse,
+        retries: int,
+        cache_hit: bool = False,
+    ) -> _Response:
+        """Reads the body of a response, from the network or the cache"""
+        return _Response(
+            request.url,
+            raw.status,
+            raw.reason or "",
+            retries,
+            raw.data or b"",
+            cache_hit,
+        )
+
+    async def close(self) -> None:
+        """Closes every connection"""
+        await self.client.aclose()
+
+
+class AsyncAmericanSoccerAnalysis(_ClientBase):
+    """Asynchronous wrapper around the ASA Shiny API
+
+    Mirrors every `get_*` method of `AmericanSoccerAnalysis` as a coroutine. League and
+    page requests are sent concurrently on the running event loop with httpx, sharing
+    one pool of keep-alive connections, and at most `max_workers` requests are in
+    flight at once. Responses are cached and retried like those of
+    `AmericanSoccerAnalysis`. A client can be used on several event loops one after
+    another, such as by several `asyncio.run` calls, but not on two at once.
+
+    Entity data is always loaded lazily, the first time it is needed.
+    """
+
+    def __init__(
+        self,
+        logging_level: str | None = "WARNING",
+        request_timeout: int = 30,
+        max_workers: int = 4,
+        page_window: int = 1,
+        compact: bool = False,
+        result_cache_bytes: int = 128 * 1024**2,
+        shard_seasons: bool = False,
+        proxies: dict | None = None,
+        cache: BaseCache | str | os.PathLike | None = None,
+    ) -> None:
+        """Class constructor
+
+        Args:
+            logging_level (str | None): A string representing the logging level of the logger. Defaults to "WARNING".
+            request_timeout (int): Number of seconds to wait for a response from the API. Defaults to 30.
+            max_workers (int): Maximum number of requests in flight at the same time. Defaults to 4.
+            page_window (int): Number of result pages requested at the same time, per league, when a query spans several pages. Defaults to 1.
+            compact (bool): Whether to store results and entity tables with memory-compact dtypes. Defaults to False.
+            result_cache_bytes (int): Memory budget of the in-process cache of parsed query results, in bytes. Use 0 to disable it. Defaults to 128 MiB.
+            shard_seasons (bool): Whether queries split by seasons over several seasons are sent as one query per season, each cached on its own. Results of completed seasons never expire from the result cache. Defaults to False.
+            proxies (dict | None): A dictionary containing proxy mappings, see https://docs.python-requests.org/en/latest/user/advanced/#proxies. Defaults to None.
+            cache (BaseCache | str | os.PathLike | None): Where HTTP responses are cached. A directory path stores them in a persistent `SQLiteCache`, which `AmericanSoccerAnalysis` clients can share, any CacheControl cache can also be given. Defaults to None, an in-memory cache.
+        """
+        try:
+            import httpx  # noqa: F401
+        except ImportError:
+            raise ImportError(
+                "AsyncAmericanSoccerAnalysis requires httpx, install it with "
+                'pip install "itscalledsoccer[async]"'
+            )
+        super().__init__(
+            logging_level,
+            request_timeout,
+            max_workers,
+            page_window,
+            compact,
+            result_cache_bytes,
+            shard_seasons,
+        )
+        self.proxies = proxies
+        self._cache = cache
+        # Connections, locks and pending queries belong to an event loop, so they
+        # are created again on each loop the client is used on, see `_bind_loop`
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._pool: _AsyncConnectionPool | None = None
+        self._semaphore: asyncio.Semaphore | None = None
+        self._entity_locks: dict[str, asyncio.Lock] = {}
+        self._in_flight: dict[tuple, asyncio.Future[DataFrame]] = {}
+
+    async def __aenter__(self) -> Self:
+        self._bind_loop()
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        await self.close()
+
+    @property
+    def cache(self) -> BaseCache:
+        """Cache of the HTTP responses"""
+        return self._open_http_cache()
+
+    def _bind_loop(self) -> None:
+        """Creates the connection pool, locks and semaphore of the client on the
+        running event loop, the first time the client is used on it. Those of a
+        previous loop cannot be used on another one, and are dropped."""
+        loop = asyncio.get_running_loop()
+        if loop is self._loop:
+            return
+        self._loop = loop
+        self._pool = _AsyncConnectionPool(
+            self.request_timeout,
+            self.cache,
+            heuristic=self._cache_heuristic(),
+            proxies=self.proxies,
+        )
+        self._semaphore = asyncio.Semaphore(self.max_workers)
+        self._entity_locks = {
+            entity_type: asyncio.Lock() for entity_type in self.ENTITY_TYPES
+        }
+        self._in_flight = {}
+
+    async def close(self) -> None:
+        """Closes the connections held by the client"""
+        if self._pool is not None and self._loop is asyncio.get_running_loop():
+            await self._pool.close()
+        self._loop = None
+        self._pool = None
+
+    async def _get_entity(
+        self, entity_type: str, leagues: list[str] | None = None
+    ) -> DataFrame:
+        """Gets all the data for a specific type and
+        stores it in a DataFrame.
+
+        Args:
+            entity_type (str): type of data to get
+            leagues (list[str] | None): leagues to get the data of. Defaults to None, for all leagues.
+
+        Returns:
+            DataFrame: All records for the given entity type across the leagues,
+          with a "competition" column indicating the source league.
+        """
+        plural_type = self.ENTITY_TYPES[entity_type][0]
+        self.logger.info(f"Gathering all {plural_type}")
+
+        async def fetch(league: str) -> DataFrame:
+            url = f"{self.base_url}{league}/{plural_type}"
+            return (await self._execute_query(url, {})).assign(competition=league)
+
+        frames = await asyncio.gather(
+            *(fetch(league) for league in leagues or self.LEAGUES)
+        )
+        entity_data = concat(frames, ignore_index=True) if frames else DataFrame([])
+        return self._compact(entity_data, plural_type)
+
+    async def _load_entity(
+        self, entity_type: str, leagues: str | list[str] | None = None
+    ) -> DataFrame:
+        """Returns the data of an entity type for the given leagues, loading
+        the leagues that are missing from the API the first time they are needed.
+
+        Args:
+            entity_type (str): type of data to get
+            leagues (str | list[str] | None): leagues the data must cover. Defaults to None, for all leagues.
+
+        Returns:
+            DataFrame
+        """
+        leagues = self._entity_leagues(leagues)
+        self._bind_loop()
+        async with self._entity_locks[entity_type]:
+            missing = self._missing_entity_leagues(entity_type, leagues)
+            if missing:
+                if set(missing) >= set(self.LEAGUES):
+                    entity_data = await self._get_entity(entity_type)
+                else:
+                    entity_data = await self._get_entity(entity_type, missing)
+                self._store_entity(entity_type, missing, entity_data)
+        return self._entity_table(entity_type, leagues)
+
+    def _entity_lookup(
+        self, entity_type: str, leagues: str | list[str] | None = None
+    ) -> DataFrame:
+        """Returns the table used to convert names of the given entity type to ids.
+        The table must have been loaded with `_load_entity` beforehand.
+
+        Args:
+            entity_type (str): type of name to convert
+            leagues (str | list[str] | None): leagues the table must cover. Defaults to None, for all leagues.
+
+        Returns:
+            DataFrame
+        """
+        lookup = self._entity_table(entity_type, self._entity_leagues(leagues))
+        if lookup is None:
+            raise RuntimeError(f"{entity_type} data has not been loaded")
+        return lookup
+
+    async def _execute_query(
+        self, url: str, params: dict[str, str | list[str] | None]
+    ) -> DataFrame:
+        """Executes a query while handling the max number of responses from the API
+
+        Args:
+            url (str): the API endpoint to call
+            params (dict[str, str | list[str] | None): URL query strings
+
+        Returns:
+            DataFrame
+        """
+        params = self._canonical_params(params)
+        parts = self._split_query(url, params)
+        if parts is not None:
+            self.logger.info(f"Splitting a query to {url} into {len(parts)} parts")
+            return self._merge_chunks(
+                await asyncio.gather(
+                    *(self._execute_query(url, part) for part in parts)
+                )
+            )
+        key = (url, tuple(params.items()))
+        if self.result_cache is not None:
+            cached = self.result_cache.get(key)
+            if cached is not None:
+                return cached
+
+        self._bind_loop()
+        # Concurrent callers of the same query wait for one set of requests
+        task = self._in_flight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._run_query(url, params, key))
+            self._in_flight[key] = task
+            task.add_done_callback(lambda _: self._in_flight.pop(key, None))
+            # Shielded, so cancelling one caller does not fail the others
+            return await asyncio.shield(task)
+        return (await asyncio.shield(task)).copy()
+
+    async def _run_query(
+        self, url: str, params: dict[str, str], key: tuple
+    ) -> DataFrame:
+        """Requests every page of a query and caches the result
+
+        Args:
+            url (str): the API endpoint to call
+            params (dict[str, str]): normalized URL query strings
+            key (tuple): the result cache key of the query
+
+        Returns:
+            DataFrame
+        """
+        frames = [page async for _, page in self._iter_pages(url, params)]
+        if len(frames) == 1:
+            response = frames[0]
+        else:
+            response = concat(frames, ignore_index=True) if frames else DataFrame([])
+        if self.result_cache is not None:
+            self.result_cache.set(key, response, self._result_max_age(url, params))
+        return response
+
+    async def _iter_pages(
+        self, url: str, params: dict[str, str | list[str] | None]
+    ) -> AsyncIterator[tuple[int, DataFrame]]:
+        """Requests the pages of a query, keeping up to `page_window` pages in flight.
+
+        Pages are consumed in offset order, and the next offset is requested as soon
+        as a full page is consumed, as in the sliding window of `AmericanSoccerAnalysis`.
+        Once a short page is found, or the consumer stops iterating, the requests
+        still in flight are cancelled.
+
+        Args:
+            url (str): the API endpoint to call
+            params (dict[str, str | list[str] | None): URL query strings
+
+        Yields:
+            tuple[int, DataFrame]: the offset and rows of each non-empty page, in offset order
+        """
+        params = self._canonical_params(params)
+
+        response = await self._single_request(url, params)
+        if len(response.index) > 0:
+            yield 0, response
+        if len(response.index) < self.MAX_API_LIMIT:
+            return
+
+        offset = self.MAX_API_LIMIT
+        pending: deque[tuple[int, asyncio.Task[DataFrame]]] = deque()
+
+        def submit() -> None:
+            nonlocal offset
+            request = self._single_request(url, {**params, "offset": str(offset)})
+            pending.append((offset, asyncio.ensure_future(request)))
+            offset = offset + self.MAX_API_LIMIT
+
+        try:
+            for _ in range(self.page_window):
+                submit()
+            while pending:
+                page_offset, task = pending.popleft()
+                page = await task
+                if len(page.index) > 0:
+                    yield page_offset, page
+                if len(page.index) < self.MAX_API_LIMIT:
+                    # Pages past the first short page are discarded
+                    break
+                submit()
+        finally:
+            for _, task in pending:
+                task.cancel()
+            await asyncio.gather(*(task for _, task in pending), return_exceptions=True)
+
+    async def _single_request(
+        self, url: str, params: dict[str, str | None]
+    ) -> DataFrame:
+        """Handles single call to the API
+
+        Args:
+            url (str): the API endpoint to call
+            params (dict[str, str | None]): URL query strings
+
+        Returns:
+            DataFrame
+        """
+        self._bind_loop()
+        async with self._semaphore:
+            start = perf_counter()
+            response = await self._pool.get(url, params)
+            latency = perf_counter() - start
+        if not self._listeners:
+            response.raise_for_status()
+            return DataFrame(json.loads(response.body))
+
+        measures = {
+            "status": response.status,
+            "latency": latency,
+            "bytes_received": len(response.body),
+            "cache_hit": response.cache_hit,
+            "retries": response.retries,
+        }
+        if response.status >= 400:
+            self._notify(url, params, **measures, decode_time=0.0, build_time=0.0)
+            response.raise_for_status()
+
+        start = perf_counter()
+        records = json.loads(response.body)
+        decoded = perf_counter()
+        result = DataFrame(records)
+        built = perf_counter()
+        self._notify(
+            url,
+            params,
+            **measures,
+            decode_time=decoded - start,
+            build_time=built - decoded,
+        )
+        return result
+
+    async def _prepare_stats_query(
+        self, leagues: str | list[str], stat_type: str, entity: str, kwargs: dict
+    ) -> dict[str, str | list[str] | None]:
+        """Loads the entities needed to convert names, then builds the URL query strings
+
+        Args:
+            leagues (str | list[str]): league abbreviation or list of league abbreviations
+            stat_type (str): the type of stats requested
+            entity (str): the type of entity the stats are about
+            kwargs (dict): the keyword arguments given to the stats method
+
+        Returns:
+            dict[str, str | list[str] | None]: URL query strings
+        """
+        if stat_type == "salaries":
+            self._check_leagues_salaries(leagues)
+        else:
+            self._check_leagues(leagues)
+        if kwargs.get("player_names", None):
+            await self._load_entity("player", leagues)
+        if kwargs.get("team_names", None):
+            await self._load_entity("team", leagues)
+
+        return self._build_stats_query(leagues, stat_type, entity, kwargs)
+
+    async def _get_stats(
+        self, leagues: str | list[str], stat_type: str, entity: str, **kwargs
+    ) -> DataFrame:
+        """Handles calls to stats APIs
+
+        Args:
+            leagues (str | list[str]): league abbreviation or list of league abbreviations
+            stat_type (str): the API endpoint to call
+            entity (str): the type of entity the stats are about
+
+        Returns:
+            DataFrame
+        """
+        flatten = kwargs.pop("flatten", None)
+        self._check_flatten(flatten)
+        query = await self._prepare_stats_query(leagues, stat_type, entity, kwargs)
+
+        leagues = [leagues] if isinstance(leagues, str) else leagues
+        frames = await asyncio.gather(
+            *(
+                self._execute_query(
+                    f"{self.base_url}{league}/{entity}/{stat_type}", query
+                )
+                for league in leagues
+            )
+        )
+        stats = concat(frames, ignore_index=True) if frames else DataFrame([])
+        return self._finish_stats(stats, f"{entity}/{stat_type}", flatten)
+
+    async def _get_filtered_entity(
+        self,
+        entity_type: str,
+        leagues: str | list[str] | None,
+        ids: str | list[str] | None,
+        names: str | list[str] | None,
+    ) -> DataFrame:
+        """Loads an entity type and filters it based on the arguments given.
+
+        Args:
+            entity_type (str): type of data to get
+            leagues (str | list[str] | None): league abbreviation or list of league abbreviations
+            ids (str | list[str] | None): a single id or list of ids
+            names (str | list[str] | None): a single name or list of names
+
+        Returns:
+            DataFrame
+        """
+        self._check_leagues(leagues)
+        entity_all = await self._load_entity(entity_type, leagues)
+        return self._filter_entity(entity_all, entity_type, leagues, ids, names)
+
+    async def get_stadia(
+        self,
+        leagues: str | list[str] | None = None,
+        ids: str | list[str] | None = None,
+        names: str | list[str] | None = None,
+    ) -> DataFrame:
+        """Get information associated with stadia
+
+        Args:
+            leagues (str | list[str] | None): league abbreviation or list of league abbreviations. Defaults to None.
+            ids (str | list[str] | None): a single id or list of ids. Defaults to None.
+            names (str | list[str] | None): a single name or list of names. Defaults to None.
+
+        Returns:
+            DataFrame
+        """
+        return await self._get_filtered_entity("stadium", leagues, ids, names)
+
+    async def get_referees(
+        self,
+        leagues: str | list[str] | None = None,
+        ids: str | list[str] | None = None,
+        names: str | list[str] | None = None,
+    ) -> DataFrame:
+        """Get information associated with referees
+
+        Args:
+            leagues (str | list[str] | None): league abbreviation or a list of league abbreviations. Defaults to None.
+            ids (str | list[str] | None): a single referee id or a list of referee ids. Defaults to None.
+            names (str | list[str] | None): a single referee name or a list of referee names. Defaults to None.
+
+        Returns:
+            DataFrame
+        """
+        return await self._get_filtered_entity("referee", leagues, ids, names)
+
+    async def get_managers(
+        self,
+        leagues: str | list[str] | None = None,
+        ids: str | list[str] | None = None,
+        names: str | list[str] | None = None,
+    ) -> DataFrame:
+        """Get information associated with managers
+
+        Args:
+            leagues (str | list[str] | None): league abbreviation or a list of league abbreviations. Defaults to None.
+            ids (str | list[str] | None): a single manager id or a list of manager ids. Defaults to None.
+            names (str | list[str] | None): a single manager name or a list of manager names. Defaults to None.
+
+        Returns:
+            DataFrame
+        """
+        return await self._get_filtered_entity("manager", leagues, ids, names)
+
+    async def get_teams(
+        self,
+        leagues: str | list[str] | None = None,
+        ids: str | list[str] | None = None,
+        names: str | list[str] | None = None,
+    ) -> DataFrame:
+        """Get information associated with teams
+
+        Args:
+            leagues (str | list[str] | None): league abbreviation or a list of league abbreviations. Defaults to None.
+            ids (str | list[str] | None): a single team id or a list of team ids. Defaults to None.
+            names (str | list[str] | None): a single team name or a list of team names. Defaults to None.
+
+        Returns:
+            DataFrame
+        """
+        return await self._get_filtered_entity("team", leagues, ids, names)
+
+    async def get_players(
+        self,
+        leagues: str | list[str] | None = None,
+        ids: str | list[str] | None = None,
+        names: str | list[str] | None = None,
+    ) -> DataFrame:
+        """Get information associated with players
+
+        Args:
+            leagues (str | list[str] | None): league abbreviation or a list of league abbreviations. Defaults to None.
+            ids (str | list[str] | None): a single player id or a list of player ids. Defaults to None.
+            names (str | list[str] | None): a single player name or a list of player names. Defaults to None.
+
+        Returns:
+            DataFrame
+        """
+        return await self._get_filtered_entity("player", leagues, ids, names)
+
+    async def get_games(
+        self,
+        leagues: str | list[str] | None = None,
+        game_ids: str | list[str] | None = None,
+        team_ids: str | list[str] | None = None,
+        team_names: str | list[str] | None = None,
+        season_name: str | list[str] | None = None,
+        stages: str | list[str] | None = None,
+        status: str | list[str] | None = None,
+    ) -> DataFrame:
+        """Get information related to games
+
+        Args:
+            leagues (str | list[str] | None): league abbreviation or a list of league abbreviations. Defaults to None.
+            game_ids (str | list[str] | None): a single game id or a list of game ids. Defaults to None.
+            team_ids (str | list[str] | None): a single team id or a list of team ids. Defaults to None.
+            team_names (str | list[str] | None): a single team name or a list of team names. Defaults to None.
+            season_name (str | list[str] | None): a single year of a league season or a list of years. Defaults to None.
+            stages (str | list[str] | None): a single stage of competition in which a game took place or list of stages. Defaults to None.
+            status (str | list[str] | None): Describes the status (IE: if it's been played or otherwise) of a game. Can take a single value or a list of values. Valid keywords include: Abandoned, FullTime, PreMatch. Defaults to None.
+
+        Returns:
+            DataFrame
+        """
+        self._check_leagues(leagues)
+        if team_names:
+            await self._load_entity("team", leagues)
+        query = self._build_games_query(
+            leagues, game_ids, team_ids, team_names, season_name, stages, status
+        )
+        if not leagues:
+            leagues = self.LEAGUES
+        leagues = [leagues] if isinstance(leagues, str) else leagues
+
+        frames = await asyncio.gather(
+            *(
+                self._execute_query(f"{self.base_url}{league}/games", query)
+                for league in leagues
+            )
+        )
+        games = concat(frames, ignore_index=True) if frames else DataFrame([])
+        return self._finish_games(games)
+
+    async def get_player_xgoals(
+        self, leagues: str | list[str] = LEAGUES, **kwargs
+    ) -> DataFrame:
+        """Retrieves a DataFrame containing player xG data meeting the specified conditions.
+
+        Accepts the same keyword arguments as `AmericanSoccerAnalysis.get_player_xgoals`.
+
+        Args:
+            leagues (str | list[str]): League(s) on which to filter. Accepts a string or list of strings. Defaults to LEAGUES.
+
+        Returns:
+            DataFrame
+        """
+        return await self._get_stats(
+            leagues, stat_type="xgoals", entity="players", **kwargs
+        )
+
+    async def get_player_xpass(
+        self, leagues: str | list[str] = LEAGUES, **kwargs
+    ) -> DataFrame:
+        """Retrieves a DataFrame containing player xPass data meeting the specified conditions.
+
+        Accepts the same keyword arguments as `AmericanSoccerAnalysis.get_player_xpass`.
+
+        Args:
+            leagues (str | list[str]): League(s) on which to filter. Accepts a string or list of strings. Defaults to LEAGUES.
+
+        Returns:
+            DataFrame
+        """
+        return await self._get_stats(
+            leagues, stat_type="xpass", entity="players", **kwargs
+        )
+
+    async def get_player_goals_added(
+        self, leagues: str | list[str] = LEAGUES, **kwargs
+    ) -> DataFrame:
+        """Retrieves a DataFrame containing player g+ data meeting the specified conditions.
+
+        Accepts the same keyword arguments as `AmericanSoccerAnalysis.get_player_goals_added`.
+
+        Args:
+            leagues (str | list[str]): League(s) on which to filter. Accepts a string or list of strings. Defaults to LEAGUES.
+
+        Returns:
+            DataFrame
+        """
+        return await self._get_stats(
+            leagues, stat_type="goals-added", entity="players", **kwargs
+        )
+
+    async def get_player_salaries(
+        self, leagues: str | list[str] = "mls", **kwargs
+    ) -> DataFrame:
+        """Retrieves a DataFrame containing player salary data meeting the specified conditions
+
+        Accepts the same keyword arguments as `AmericanSoccerAnalysis.get_player_salaries`.
+
+        Args:
+            leagues (str | list[str]): Leagues on which to filter. Accepts a string or list of strings. Defaults to 'mls'.
+
+        Returns:
+            DataFrame
+        """
+        return await self._get_stats(
+            leagues, stat_type="salaries", entity="players", **kwargs
+        )
+
+    async def get_goalkeeper_xgoals(
+        self, leagues: str | list[str] = LEAGUES, **kwargs
+    ) -> DataFrame:
+        """Retrieves a DataFrame containing goalkeeper xG data meeting the specified conditions.
+
+        Accepts the same keyword arguments as `AmericanSoccerAnalysis.get_goalkeeper_xgoals`.
+
+        Args:
+            leagues (str | list[str]): League(s) on which to filter. Accepts a string or list of strings. Defaults to LEAGUES.
+
+        Returns:
+            DataFrame
+        """
+        return await self._get_stats(
+            leagues, stat_type="xgoals", entity="goalkeepers", **kwargs
+        )
+
+    async def get_goalkeeper_goals_added(
+        self, leagues: str | list[str] = LEAGUES, **kwargs
+    ) -> DataFrame:
+        """Retrieves a DataFrame containing goalkeeper g+ data meeting the specified conditions.
+
+        Accepts the same keyword arguments as `AmericanSoccerAnalysis.get_goalkeeper_goals_added`.
+
+        Args:
+            leagues (str | list[str]): League(s) on which to filter. Accepts a string or list of strings. Defaults to LEAGUES.
+
+        Returns:
+            DataFrame
+        """
+        return await self._get_stats(
+            leagues, stat_type="goals-added", entity="goalkeepers", **kwargs
+        )
+
+    async def get_team_xgoals(
+        self, leagues: str | list[str] = LEAGUES, **kwargs
+    ) -> DataFrame:
+        """Retrieves a DataFrame containing team xG data meeting the specified conditions.
+
+        Accepts the same keyword arguments as `AmericanSoccerAnalysis.get_team_xgoals`.
+
+        Args:
+            leagues (str | list[str]): Leagues on which to filter. Accepts a string or list of strings. Defaults to LEAGUES.
+
+        Returns:
+            DataFrame
+        """
+        return await self._get_stats(
+            leagues, stat_type="xgoals", entity="teams", **kwargs
+        )
+
+    async def get_team_xpass(
+        self, leagues: str | list[str] = LEAGUES, **kwargs
+    ) -> DataFrame:
+        """Retrieves a DataFrame containing team xPass data meeting the specified conditions.
+
+        Accepts the same keyword arguments as `AmericanSoccerAnalysis.get_team_xpass`.
+
+        Args:
+            leagues (str | list[str]): Leagues on which to filter. Accepts a string or list of strings. Defaults to LEAGUES.
+
+        Returns:
+            DataFrame
+        """
+        return await self._get_stats(
+            leagues, stat_type="xpass", entity="teams", **kwargs
+        )
+
+    async def get_team_goals_added(
+        self, leagues: str | list[str] = LEAGUES, **kwargs
+    ) -> DataFrame:
+        """Retrieves a DataFrame containing team g+ data meeting the specified conditions.
+
+        Accepts the same keyword arguments as `AmericanSoccerAnalysis.get_team_goals_added`.
+
+        Args:
+            leagues (str | list[str]): Leagues on which to filter. Accepts a string or list of strings. Defaults to LEAGUES.
+
+        Returns:
+            DataFrame
+        """
+        return await self._get_stats(
+            leagues, stat_type="goals-added", entity="teams", **kwargs
+        )
+
+    async def get_team_salaries(
+        self, leagues: str | list[str] = "mls", **kwargs
+    ) -> DataFrame:
+        """Retrieves a DataFrame containing team salary data meeting the specified conditions.
+
+        Accepts the same keyword arguments as `AmericanSoccerAnalysis.get_team_salaries`.
+
+        Args:
+            leagues (str | list[str]): Leagues on which to filter. Accepts a string or list of strings. Defaults to 'mls'.
+
+        Returns:
+            DataFrame
+        """
+        return await self._get_stats(
+            leagues, stat_type="salaries", entity="teams", **kwargs
+        )
+
+    async def get_game_xgoals(
+        self, leagues: str | list[str] = LEAGUES, **kwargs
+    ) -> DataFrame:
+        """Retrieves a DataFrame containing game xG data meeting the specified conditions.
+
+        Accepts the same keyword arguments as `AmericanSoccerAnalysis.get_game_xgoals`.
+
+        Args:
+            leagues (str | list[str]): Leagues on which to filter. Accepts a string or list of strings. Defaults to LEAGUES.
+
+        Returns:
+            DataFrame
+        """
+        return await self._get_stats(
+            leagues, stat_type="xgoals", entity="games", **kwargs
+        )
+
+    async def fetch_many(self, queries: list[str | dict]) -> dict[str, DataFrame]:
+        """Runs several stats and games queries as one batch.
+
+        Every query runs at once on the event loop. Identical league requests are sent
+        once, and at most `max_workers` requests are in flight across all queries.
+
+        Args:
+            queries (list[str | dict]): the queries to run. Each one is either the name of a stats method or "get_games", or a dict holding that name under "method", the arguments of the method, and optionally the name of the result under "name", which defaults to the method name.
+
+        Returns:
+            dict[str, DataFrame]: the result of each query by name, the same as calling its method
+        """
+        specs = self._parse_fetch_specs(queries)
+        results = await asyncio.gather(
+            *(
+                getattr(self, method)(*arguments.args, **arguments.kwargs)
+                for _, method, arguments in specs
+            )
+        )
+        return {name: result for (name, _, _), result in zip(specs, results)}
+
+    async def iter_stats(
+        self,
+        entity: str,
+        stat_type: str,
+        leagues: str | list[str] = LEAGUES,
+        **kwargs,
+    ) -> AsyncIterator[StatsPage]:
+        """Streams the results of a stats query one page at a time, instead of
+        building a single DataFrame. Leagues are queried one after the other, and
+        pages are requested `page_window` at a time.
+
+        Accepts the same arguments as `AmericanSoccerAnalysis.iter_stats`.
+
+        Args:
+            entity (str): the type of entity the stats are about: "players", "goalkeepers", "teams" or "games"
+            stat_type (str): the type of stats: "xgoals", "xpass", "goals-added" or "salaries"
+            leagues (str | list[str]): Leagues on which to filter. Accepts a string or list of strings. Defaults to LEAGUES.
+
+        Yields:
+            StatsPage: the pages, each tagged with its league and offset
+        """
+        flatten = kwargs.pop("flatten", None)
+        self._check_flatten(flatten)
+        query = await self._prepare_stats_query(leagues, stat_type, entity, kwargs)
+        leagues = [leagues] if isinstance(leagues, str) else list(leagues)
+
+        for league in leagues:
+            url = f"{self.base_url}{league}/{entity}/{stat_type}"
+            async for offset, data in self._iter_pages(url, query):
+                if flatten:
+                    data = _flatten_goals_added(data, flatten)
+                yield StatsPage(
+                    league, offset, self._compact(data, f"{entity}/{stat_type}")
+                )
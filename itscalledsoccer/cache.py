@@ -0,0 +1,431 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import shutil
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Hashable, Iterable
+from datetime import datetime
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from pandas import DataFrame
+
+
+class SQLiteCache:
+    """Persistent HTTP response cache stored in a SQLite database, implementing the
+    cache interface of CacheControl.
+
+    The database runs in WAL mode so it can be shared by several processes at once,
+    for example cron runs or the workers of a web server. Once the stored responses
+    exceed `max_bytes`, the least recently used ones are evicted. Their total size is
+    kept up to date by triggers, and reads only record the access time of a response
+    once every `ACCESS_INTERVAL` seconds, so that cache hits rarely write.
+    """
+
+    FILENAME = "itscalledsoccer-cache.sqlite"
+    # Number of seconds a recorded access time is kept before a read updates it
+    ACCESS_INTERVAL = 60
+
+    def __init__(
+        self, directory: str | os.PathLike, max_bytes: int = 512 * 1024**2
+    ) -> None:
+        """Class constructor
+
+        Args:
+            directory (str | os.PathLike): Directory the cache database is stored in. Created if missing.
+            max_bytes (int): Maximum total size of the cached responses, in bytes. Defaults to 512 MiB.
+        """
+        self.directory = Path(directory).expanduser()
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.path = self.directory / self.FILENAME
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        with self._connection() as connection:
+            # Creating the tables and counting the stored responses is atomic, so that
+            # no other process changes them in between
+            connection.execute("BEGIN IMMEDIATE")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "key TEXT PRIMARY KEY, value BLOB NOT NULL, "
+                "size INTEGER NOT NULL, accessed REAL NOT NULL)"
+            )
+            connection.execute(
+                "CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed)"
+            )
+            # Total size of the stored responses, in a single row
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS usage ("
+                "id INTEGER PRIMARY KEY CHECK (id = 1), size INTEGER NOT NULL)"
+            )
+            connection.execute(
+                "INSERT OR IGNORE INTO usage (id, size) "
+                "SELECT 1, COALESCE(SUM(size), 0) FROM responses"
+            )
+            for name, event, change in (
+                ("responses_inserted", "INSERT", "+ NEW.size"),
+                ("responses_deleted", "DELETE", "- OLD.size"),
+                ("responses_resized", "UPDATE OF size", "+ NEW.size - OLD.size"),
+            ):
+                connection.execute(
+                    f"CREATE TRIGGER IF NOT EXISTS {name} AFTER {event} ON responses "
+                    f"BEGIN UPDATE usage SET size = size {change} WHERE id = 1; END"
+                )
+
+    def _connection(self) -> sqlite3.Connection:
+        """Returns the connection of the current thread, opening it on first use"""
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=30)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+        return connection
+
+    def get(self, key: str) -> bytes | None:
+        """Returns a cached response and marks it as recently used
+
+        Args:
+            key (str): cache key
+
+        Returns:
+            bytes | None: the cached response, if any
+        """
+        with self._connection() as connection:
+            row = connection.execute(
+                "SELECT value, accessed FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            now = time.time()
+            if row is not None and now - row[1] >= self.ACCESS_INTERVAL:
+                connection.execute(
+                    "UPDATE responses SET accessed = ? WHERE key = ?", (now, key)
+                )
+        with self._lock:
+            if row is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return None if row is None else row[0]
+
+    def set(
+        self, key: str, value: bytes, expires: int | datetime | None = None
+    ) -> None:
+        """Stores a response, evicting the least recently used ones if over budget
+
+        Args:
+            key (str): cache key
+            value (bytes): serialized response
+            expires (int | datetime | None): unused, freshness is checked by CacheControl
+        """
+        with self._connection() as connection:
+            # An upsert rather than INSERT OR REPLACE, whose implicit delete does not
+            # fire the trigger keeping the total size
+            connection.execute(
+                "INSERT INTO responses (key, value, size, accessed) "
+                "VALUES (?, ?, ?, ?) ON CONFLICT (key) DO UPDATE SET "
+                "value = excluded.value, size = excluded.size, "
+                "accessed = excluded.accessed",
+                (key, value, len(value), time.time()),
+            )
+            self._evict(connection)
+
+    def _evict(self, connection: sqlite3.Connection) -> None:
+        """Deletes the least recently used responses until the cache fits in its budget
+
+        Args:
+            connection (sqlite3.Connection): connection with an open transaction
+        """
+        (total,) = connection.execute("SELECT size FROM usage").fetchone()
+        if total <= self.max_bytes:
+            return
+        evicted = []
+        for key, size in connection.execute(
+            "SELECT key, size FROM responses ORDER BY accessed"
+        ):
+            if total <= self.max_bytes:
+                break
+            evicted.append((key,))
+            total -= size
+        connection.executemany("DELETE FROM responses WHERE key = ?", evicted)
+
+    def delete(self, key: str) -> None:
+        """Removes a response from the cache
+
+        Args:
+            key (str): cache key
+        """
+        with self._connection() as connection:
+            connection.execute("DELETE FROM responses WHERE key = ?", (key,))
+
+    def clear(self) -> None:
+        """Removes every response from the cache"""
+        with self._connection() as connection:
+            connection.execute("DELETE FROM responses")
+
+    def close(self) -> None:
+        """Closes the connection of the current thread"""
+        connection = getattr(self._local, "connection", None)
+        if connection is not None:
+            connection.close()
+            self._local.connection = None
+
+    def stats(self) -> dict[str, int]:
+        """Reports the cache usage
+
+        Returns:
+            dict[str, int]: hits and misses seen by this instance, and the number and total size of stored responses
+        """
+        row = (
+            self._connection()
+            .execute("SELECT (SELECT COUNT(*) FROM responses), size FROM usage")
+            .fetchone()
+        )
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "entries": row[0],
+                "size_bytes": row[1],
+            }
+
+
+class ResultCache:
+    """In-process cache of parsed query results, kept above the HTTP cache.
+
+    Results are stored as DataFrames, so a hit skips JSON parsing and page
+    concatenation altogether. Once the stored results exceed `max_bytes`, the least
+    recently used ones are evicted. Callers get a copy of the stored result, so
+    changing it does not change the cache. Results that cannot change, such as those
+    of completed seasons, can be stored without an expiry.
+    """
+
+    def __init__(self, max_bytes: int = 128 * 1024**2, max_age: float = 86400) -> None:
+        """Class constructor
+
+        Args:
+            max_bytes (int): Maximum total size of the cached results, in bytes. Defaults to 128 MiB.
+            max_age (float): Number of seconds a result is served for. Defaults to one day, like HTTP responses.
+        """
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.hits = 0
+        self.misses = 0
+        self.size_bytes = 0
+        self._entries: OrderedDict[Hashable, tuple[DataFrame, int, float]] = (
+            OrderedDict()
+        )
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> DataFrame | None:
+        """Returns a copy of a cached result and marks it as recently used
+
+        Args:
+            key (Hashable): normalized query
+
+        Returns:
+            DataFrame | None: the cached result, if any
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and time.monotonic() > entry[2]:
+                self._remove(key)
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+        return entry[0].copy()
+
+    def set(
+        self, key: Hashable, result: DataFrame, max_age: float | None = None
+    ) -> None:
+        """Stores a copy of a result, evicting the least recently used ones if over budget.
+        Results larger than the whole budget are not stored.
+
+        Args:
+            key (Hashable): normalized query
+            result (DataFrame): parsed result
+            max_age (float | None): Number of seconds the result is served for, `math.inf` for a result that never expires. Defaults to None, the `max_age` of the cache.
+        """
+        if max_age is None:
+            max_age = self.max_age
+        size = int(result.memory_usage(index=True, deep=True).sum())
+        if size > self.max_bytes:
+            return
+        result = result.copy()
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (result, size, time.monotonic() + max_age)
+            self.size_bytes += size
+            while self.size_bytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+
+    def _remove(self, key: Hashable) -> None:
+        """Removes a result, the lock must be held
+
+        Args:
+            key (Hashable): normalized query
+        """
+        _, size, _ = self._entries.pop(key)
+        self.size_bytes -= size
+
+    def clear(self) -> None:
+        """Removes every result from the cache"""
+        with self._lock:
+            self._entries.clear()
+            self.size_bytes = 0
+
+    def stats(self) -> dict[str, int]:
+        """Reports the cache usage
+
+        Returns:
+            dict[str, int]: hits and misses, and the number and total size of stored results
+        """
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "entries": len(self._entries),
+                "size_bytes": self.size_bytes,
+            }
+
+
+class PageCheckpoint:
+    """Result pages of unfinished queries, saved to a directory as they are downloaded.
+
+    When a long query fails part of the way, running it again with the same
+    directory only requests the pages that are missing. Each call collects the
+    queries it completed and removes their pages once all of its queries have
+    succeeded, leaving those of other calls in place, and pages older than `max_age`
+    are ignored, so a checkpoint never serves stale results. Pages are stored as
+    the JSON records returned by the API.
+    """
+
+    def __init__(self, directory: str | os.PathLike, max_age: float = 86400) -> None:
+        """Class constructor
+
+        Args:
+            directory (str | os.PathLike): Directory the pages are saved in. Created if missing.
+            max_age (float): Number of seconds a saved page can be used for. Defaults to one day.
+        """
+        self.directory = Path(directory).expanduser()
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_age = max_age
+        self._lock = threading.Lock()
+        # Queries with saved pages, listed once so that the pages of other
+        # queries are not looked up on disk
+        self._queries = {
+            path.name for path in self.directory.iterdir() if path.is_dir()
+        }
+
+    def query_directory(self, url: str, params: dict) -> Path:
+        """Returns the directory the pages of a query are saved in
+
+        Args:
+            url (str): the API endpoint called
+            params (dict): URL query strings, with or without the offset
+
+        Returns:
+            Path
+        """
+        query = json.dumps(
+            [url, sorted((k, str(v)) for k, v in params.items() if k != "offset")]
+        )
+        return self.directory / hashlib.sha256(query.encode()).hexdigest()
+
+    def path(self, url: str, params: dict) -> Path:
+        """Returns the file a page is saved in
+
+        Args:
+            url (str): the API endpoint called
+            params (dict): URL query strings, offset included
+
+        Returns:
+            Path
+        """
+        offset = int(params.get("offset") or 0)
+        return self.query_directory(url, params) / f"{offset}.json"
+
+    def get(self, url: str, params: dict) -> list | None:
+        """Returns the records of a saved page
+
+        Args:
+            url (str): the API endpoint called
+            params (dict): URL query strings, offset included
+
+        Returns:
+            list | None: the records of the page, if it was saved less than `max_age` seconds ago
+        """
+        path = self.path(url, params)
+        with self._lock:
+            if path.parent.name not in self._queries:
+                return None
+        try:
+            if time.time() - path.stat().st_mtime > self.max_age:
+                return None
+            return json.loads(path.read_bytes())
+        except FileNotFoundError:
+            return None
+
+    def set(self, url: str, params: dict, records: list) -> None:
+        """Saves the records of a page
+
+        Args:
+            url (str): the API endpoint called
+            params (dict): URL query strings, offset included
+            records (list): the records of the page, as returned by the API
+        """
+        path = self.path(url, params)
+        path.parent.mkdir(exist_ok=True)
+        with self._lock:
+            self._queries.add(path.parent.name)
+        # Write to a temporary file first, so a page is never read half written
+        tmp = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp.write_text(json.dumps(records))
+        os.replace(tmp, path)
+
+    def complete(self, url: str, params: dict) -> str | None:
+        """Names a query whose pages have all been downloaded, for the call that ran it
+        to pass to `discard_completed`
+
+        Args:
+            url (str): the API endpoint called
+            params (dict): URL query strings, with or without the offset
+
+        Returns:
+            str | None: the name of the directory of the query, or None if it has no saved pages
+        """
+        name = self.query_directory(url, params).name
+        with self._lock:
+            return name if name in self._queries else None
+
+    def discard_completed(self, names: Iterable[str]) -> None:
+        """Removes the pages of completed queries, once every query of the call that
+        completed them has succeeded
+
+        Args:
+            names (Iterable[str]): the names returned by `complete` for the queries of the call
+        """
+        names = set(names)
+        with self._lock:
+            self._queries -= names
+        for name in names:
+            shutil.rmtree(self.directory / name, ignore_errors=True)
+
+    def clear(self) -> None:
+        """Removes every saved page"""
+        with self._lock:
+            self._queries.clear()
+        for path in self.directory.iterdir():
+            if path.is_dir():
+                shutil.rmtree(path, ignore_errors=True)
@@ -1,14 +1,26 @@
+from __future__ import annotations
+
+import abc
+import inspect
+import math
+import os
+import zlib
+from collections import deque
+from collections.abc import Callable, Hashable, Iterable, Iterator
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from contextlib import contextmanager
+from datetime import date
+from itertools import chain
 from logging import getLogger
+from threading import Lock, local
+from time import perf_counter
+from typing import TYPE_CHECKING, ClassVar, NamedTuple, TypeVar
+from urllib.parse import parse_qs, quote_plus, urlencode, urlsplit
 
-import requests
-from cachecontrol import CacheControl
-from cachecontrol.heuristics import ExpiresAfter
-from pandas import DataFrame, concat
-from rapidfuzz import fuzz, process
-from requests.adapters import HTTPAdapter
-from urllib3.util.retry import Retry
-
+from itscalledsoccer.cache import PageCheckpoint, ResultCache
+from itscalledsoccer.entity_store import EntityStore
 from itscalledsoccer.errors import (
+    ASAError,
     ConflictingParametersError,
     InvalidEntityTypeError,
     InvalidLeagueError,
@@ -16,47 +28,221 @@ from itscalledsoccer.errors import (
     InvalidSeasonError,
     SalaryDataError,
 )
+from itscalledsoccer.events import RequestEvent, RequestListener
+from itscalledsoccer.ratelimit import RateLimiter
+from itscalledsoccer.snapshot import Snapshot
+from itscalledsoccer.sync import (
+    OPEN_GAME_STATUS,
+    GameStore,
+    merge_games,
+    open_game_ids,
+)
+from itscalledsoccer.transport import RequestsTransport, Transport
+
+# pandas, rapidfuzz, requests and CacheControl are imported where they are first
+# needed, so importing the package and creating a client stay fast
+if TYPE_CHECKING:
+    import requests
+    from cachecontrol.cache import BaseCache
+    from cachecontrol.heuristics import BaseHeuristic
+    from pandas import DataFrame
+
+    from itscalledsoccer.adapter import PooledCacheAdapter
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+LEAGUES = ["nwsl", "mls", "uslc", "usl1", "usls", "nasl", "mlsnp"]
+
+
+class StatsPage(NamedTuple):
+    """One page of results of a stats query, as yielded by `iter_stats`"""
+
+    league: str
+    offset: int
+    data: DataFrame
+
+
+def _flatten_goals_added(stats: DataFrame, flatten: str) -> DataFrame:
+    """Unnests the per-action records in the `data` column of goals added results.
+
+    Args:
+        stats (DataFrame): goals added results, with one list of action records per row
+        flatten (str): "long" for one row per action type, or "wide" for one column per action type and value
+
+    Returns:
+        DataFrame
+    """
+    from pandas import DataFrame, concat
+
+    if "data" not in stats.columns:
+        return stats
+
+    # Rows without actions keep a single empty record, so no row is dropped
+    cells = [
+        cell if isinstance(cell, list) and cell else [{}] for cell in stats["data"]
+    ]
+    lengths = [len(cell) for cell in cells]
+    actions = DataFrame(list(chain.from_iterable(cells)))
+    parents = stats.drop(columns="data").reset_index(drop=True)
+
+    if flatten == "long":
+        parents = parents.loc[parents.index.repeat(lengths)].reset_index(drop=True)
+        return concat([parents, actions], axis=1)
+
+    actions.index = parents.index.repeat(lengths)
+    if "action_type" not in actions.columns:
+        # Records without an action type have no columns to pivot to, so they are
+        # joined as they are, one row per record as in long mode
+        return parents.join(actions)
+    actions = actions[actions["action_type"].notna()]
+    wide = actions.pivot(columns="action_type")
+    wide.columns = [f"{action}_{value}" for value, action in wide.columns]
+    # Group the columns by action type, in the order the API returns them
+    values = actions.columns.drop("action_type")
+    columns = [
+        f"{action}_{value}"
+        for action in actions["action_type"].unique()
+        for value in values
+    ]
+    return parents.join(wide[columns])
+
+
+class _SingleFlight:
+    """Runs at most one call at a time per key, sharing its outcome with the callers
+    asking for the same key while it runs"""
+
+    def __init__(self) -> None:
+        self._lock = Lock()
+        self._calls: dict[Hashable, Future] = {}
+
+    def do(self, key: Hashable, func: Callable[[], R]) -> tuple[R, bool]:
+        """Calls a function, unless a call for the same key is already running, in
+        which case its result is awaited instead. Errors are shared the same way.
+
+        Args:
+            key (Hashable): identifies the call
+            func (Callable[[], R]): function to call
+
+        Returns:
+            tuple[R, bool]: the result, and whether it comes from another caller's call
+        """
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                self._calls[key] = future
+        if not leader:
+            return future.result(), True
+
+        try:
+            result = func()
+        except BaseException as exc:
+            future.set_exception(exc)
+            raise
+        else:
+            future.set_result(result)
+            return result, False
+        finally:
+            with self._lock:
+                del self._calls[key]
+
+
+class _NameIndex:
+    """Names of an entity table prepared for fuzzy matching, with a hash map from name to id"""
+
+    def __init__(self, source: DataFrame, name_col: str, id_col: str) -> None:
+        """Class constructor
+
+        Args:
+            source (DataFrame): the entity table
+            name_col (str): column holding the names
+            id_col (str): column holding the ids
+        """
+        self.source = source
+        pairs = [
+            (name, id_)
+            for name, id_ in zip(source[name_col].tolist(), source[id_col].tolist())
+            if isinstance(name, str)
+        ]
+        self.names = [name for name, _ in pairs]
+        # Iterate in reverse so that a name shared by several rows maps to the first one
+        self.ids = {name: id_ for name, id_ in reversed(pairs)}
 
 
-class AmericanSoccerAnalysis:
-    """Wrapper around the ASA Shiny API"""
+class _ClientBase(abc.ABC):
+    """Validation, name resolution and query building shared by the synchronous and asynchronous clients"""
 
     API_VERSION = "v1"
     BASE_URL = f"https://app.americansocceranalysis.com/api/{API_VERSION}/"
-    LEAGUES = ["nwsl", "mls", "uslc", "usl1", "usls", "nasl", "mlsnp"]
+    LEAGUES = LEAGUES
     MAX_API_LIMIT = 1000
+    # Maximum number of game ids requested at once when syncing games
+    MAX_SYNC_IDS = 100
+    # Maximum number of scores computed at once when matching names
+    MAX_SCORE_CELLS = 2_000_000
+    # Longest URL sent to the API, servers and proxies reject longer ones
+    MAX_URL_LENGTH = 4000
+    # URL query strings holding id lists
+    ID_PARAMS = ("game_id", "player_id", "team_id")
+    # Id lists that can be split into chunks, by the entity of the endpoint: results
+    # are keyed on them, so chunks return disjoint rows instead of partial totals
+    CHUNKABLE_ID_PARAMS: ClassVar[dict[str, tuple[str, ...]]] = {
+        "players": ("player_id",),
+        "goalkeepers": ("player_id",),
+        "teams": ("team_id",),
+        # Games are not totaled, filtering them by team is a plain row filter
+        "games": ("game_id", "team_id"),
+    }
+    # Average number of ids in a chunk
+    ID_CHUNK_SIZE = 100
+    # Leagues whose seasons end in the year after the one they are named after
+    SPLIT_YEAR_LEAGUES = ("usls",)
+    # entity type -> (attribute, name column, id column)
+    ENTITY_TYPES: ClassVar[dict[str, tuple[str, str, str]]] = {
+        "player": ("players", "player_name", "player_id"),
+        "manager": ("managers", "manager_name", "manager_id"),
+        "stadium": ("stadia", "stadium_name", "stadium_id"),
+        "referee": ("referees", "referee_name", "referee_id"),
+        "team": ("teams", "team_name", "team_id"),
+    }
+    # stats method -> (entity, stat type) of the endpoint it queries
+    STATS_METHODS: ClassVar[dict[str, tuple[str, str]]] = {
+        "get_player_xgoals": ("players", "xgoals"),
+        "get_player_xpass": ("players", "xpass"),
+        "get_player_goals_added": ("players", "goals-added"),
+        "get_player_salaries": ("players", "salaries"),
+        "get_goalkeeper_xgoals": ("goalkeepers", "xgoals"),
+        "get_goalkeeper_goals_added": ("goalkeepers", "goals-added"),
+        "get_team_xgoals": ("teams", "xgoals"),
+        "get_team_xpass": ("teams", "xpass"),
+        "get_team_goals_added": ("teams", "goals-added"),
+        "get_team_salaries": ("teams", "salaries"),
+        "get_game_xgoals": ("games", "xgoals"),
+    }
 
     def __init__(
         self,
-        proxies: dict | None = None,
         logging_level: str | None = "WARNING",
-        lazy_load: bool | None = True,
         request_timeout: int = 30,
+        max_workers: int = 4,
+        page_window: int = 1,
+        compact: bool = False,
+        result_cache_bytes: int = 128 * 1024**2,
+        shard_seasons: bool = False,
     ) -> None:
         """Class constructor
 
         Args:
-            proxies (dict | None): A dictionary containing proxy mappings, see https://docs.python-requests.org/en/latest/user/advanced/#proxies. Defaults to None.
             logging_level (str | None): A string representing the logging level of the logger. Defaults to "WARNING".
-            lazy_load (bool | None): A boolean indicating whether to lazy load all entity data on initialization. Defaults to True.
+            request_timeout (int): Number of seconds to wait for a response from the API. Defaults to 30.
+            max_workers (int): Maximum number of requests made concurrently. Defaults to 4.
+            page_window (int): Number of result pages requested ahead of time, per league. Defaults to 1.
+            compact (bool): Whether to store results with memory-compact dtypes. Defaults to False.
+            result_cache_bytes (int): Memory budget of the cache of parsed query results, in bytes. Use 0 to disable it. Defaults to 128 MiB.
+            shard_seasons (bool): Whether queries split by seasons are sent as one query per season, each cached on its own. Defaults to False.
         """
-        session = requests.session()
-        if proxies:
-            session.proxies.update(proxies)
-
-        retry_strategy = Retry(
-            total=3,  # Total number of retries
-            backoff_factor=0.5,  # Exponential backoff: 0.5s, 1s, 2s
-            status_forcelist=[429, 500, 502, 503, 504],  # HTTP codes to retry
-            allowed_methods=["GET"],  # Only retry GET requests
-        )
-
-        adapter = HTTPAdapter(max_retries=retry_strategy)
-        session.mount("https://", adapter)
-        session.mount("http://", adapter)
-
-        cache_session = CacheControl(session, heuristic=ExpiresAfter(days=1))
-
         self.logger = getLogger(f"{__name__}.{id(self)}")
 
         if logging_level:
@@ -71,120 +257,553 @@ class AmericanSoccerAnalysis:
             else:
                 self.logger.info(f"Logging level {logging_level} not recognized!")
 
-        self.session = cache_session
         self.base_url = self.BASE_URL
-        self.lazy_load = lazy_load
         self.request_timeout = request_timeout
+        self.max_workers = max(1, max_workers)
+        self.page_window = max(1, page_window)
+        self.compact = compact
+        self.shard_seasons = shard_seasons
+        self.result_cache = (
+            ResultCache(result_cache_bytes) if result_cache_bytes else None
+        )
 
         self.players: DataFrame | None = None
         self.teams: DataFrame | None = None
         self.stadia: DataFrame | None = None
         self.managers: DataFrame | None = None
         self.referees: DataFrame | None = None
+        # entity type -> league -> entity data, until every league has been loaded
+        self._entity_partitions: dict[str, dict[str, DataFrame]] = {
+            entity_type: {} for entity_type in self.ENTITY_TYPES
+        }
+        self._name_indexes: dict[tuple[str, ...], _NameIndex] = {}
+        self._listeners: list[RequestListener] = []
+        self.partial_results = False
+        self.entity_store: EntityStore | None = None
 
-        if self.lazy_load:
-            self.logger.info(
-                "Lazy loading enabled. Initializing client without entity data."
+    def on_request_end(self, listener: RequestListener) -> RequestListener:
+        """Registers a function called with the measurements of every HTTP call to the API.
+        No events are built while no listener is registered.
+
+        Args:
+            listener (RequestListener): function taking a `RequestEvent`, such as a `MetricsAggregator`
+
+        Returns:
+            RequestListener: the listener, so this method can be used as a decorator
+        """
+        self._listeners.append(listener)
+        return listener
+
+    def remove_listener(self, listener: RequestListener) -> None:
+        """Unregisters a function registered with `on_request_end`
+
+        Args:
+            listener (RequestListener): the listener to remove
+        """
+        self._listeners.remove(listener)
+
+    def _notify(
+        self, url: str, params: dict[str, str | list[str] | None], **measures
+    ) -> None:
+        """Passes the measurements of an HTTP call to every listener
+
+        Args:
+            url (str): the API endpoint called
+            params (dict[str, str | list[str] | None]): URL query strings
+            **measures: the other fields of the `RequestEvent`
+        """
+        path = url.removeprefix(self.base_url)
+        league, _, endpoint = path.partition("/")
+        event = RequestEvent(
+            url_template=f"{{league}}/{endpoint}",
+            league=league,
+            offset=int(params.get("offset") or 0),
+            **measures,
+        )
+        for listener in list(self._listeners):
+            try:
+                listener(event)
+            except Exception:
+                # A failing listener must not fail the query
+                self.logger.exception(f"Request listener {listener!r} failed")
+
+    @staticmethod
+    def _canonical_params(
+        params: dict[str, str | list[str] | None],
+    ) -> dict[str, str]:
+        """Normalizes URL query strings, so equivalent queries send the same request.
+        Lists are deduplicated, sorted and joined with commas, and empty values dropped.
+
+        Args:
+            params (dict[str, str | list[str] | None]): URL query strings
+
+        Returns:
+            dict[str, str]: the normalized query strings, sorted by name
+        """
+        canonical = {}
+        for key in sorted(params):
+            value = params[key]
+            if value is None:
+                continue
+            if isinstance(value, (list, tuple, set)):
+                value = ",".join(sorted({str(item) for item in value}))
+            canonical[key] = str(value)
+        return canonical
+
+    def _season_completed(self, league: str, season: str) -> bool:
+        """Tells whether a season is over, so its data no longer changes
+
+        Args:
+            league (str): league abbreviation
+            season (str): year of the season
+
+        Returns:
+            bool
+        """
+        end = int(season) + (1 if league in self.SPLIT_YEAR_LEAGUES else 0)
+        return end < date.today().year
+
+    def _covers_completed_seasons(self, url: str, params: dict[str, str]) -> bool:
+        """Tells whether a query of a sharded client only covers completed seasons,
+        so that its result can be cached for good
+
+        Args:
+            url (str): the API endpoint called, or its path
+            params (dict[str, str]): normalized URL query strings
+
+        Returns:
+            bool
+        """
+        if not self.shard_seasons or not params.get("season_name"):
+            return False
+        path = urlsplit(url).path.removeprefix(urlsplit(self.base_url).path)
+        league = path.partition("/")[0]
+        try:
+            return all(
+                self._season_completed(league, season)
+                for season in params["season_name"].split(",")
             )
-        else:
-            self.logger.info(
-                "Lazy loading disabled. Initializing client with entity data."
+        except ValueError:
+            return False
+
+    def _result_max_age(self, url: str, params: dict[str, str]) -> float | None:
+        """Returns how long the result of a query is kept in the result cache
+
+        Args:
+            url (str): the API endpoint called
+            params (dict[str, str]): normalized URL query strings
+
+        Returns:
+            float | None: `math.inf` for queries only covering completed seasons, else None, the default of the cache
+        """
+        return math.inf if self._covers_completed_seasons(url, params) else None
+
+    def _open_http_cache(self) -> BaseCache:
+        """Opens the cache of HTTP responses given to the client as `cache`
+
+        Returns:
+            BaseCache: an in-memory cache if none was given, a `SQLiteCache` for a directory path, else the given cache
+        """
+        from cachecontrol.cache import DictCache
+
+        from itscalledsoccer.cache import SQLiteCache
+
+        if self._cache is None:
+            self._cache = DictCache()
+        elif isinstance(self._cache, (str, os.PathLike)):
+            self._cache = SQLiteCache(self._cache)
+        return self._cache
+
+    def _cache_heuristic(self) -> BaseHeuristic:
+        """Returns how long HTTP responses are cached for: one day, or a year for
+        responses only covering completed seasons with `shard_seasons`
+
+        Returns:
+            BaseHeuristic
+        """
+        from cachecontrol.heuristics import ExpiresAfter
+
+        from itscalledsoccer.adapter import CompletedSeasonsHeuristic
+
+        if self.shard_seasons:
+            return CompletedSeasonsHeuristic(self._covers_completed_seasons)
+        return ExpiresAfter(days=1)
+
+    def _season_shards(self, params: dict[str, str]) -> list[dict[str, str]] | None:
+        """Splits a query split by seasons into one query per season, with `shard_seasons`
+
+        Args:
+            params (dict[str, str]): normalized URL query strings
+
+        Returns:
+            list[dict[str, str]] | None: the query strings of each season, or None if the query is not sharded
+        """
+        if not self.shard_seasons:
+            return None
+        if params.get("split_by_seasons", "").lower() != "true":
+            return None
+        seasons = params.get("season_name", "").split(",")
+        if len(seasons) < 2:
+            return None
+        return [{**params, "season_name": season} for season in seasons]
+
+    def _split_query(
+        self, url: str, params: dict[str, str]
+    ) -> list[dict[str, str]] | None:
+        """Splits a query into smaller ones, run concurrently and cached on their own:
+        one per season with `shard_seasons`, and chunks of id lists too long for a URL
+
+        Args:
+            url (str): the API endpoint to call
+            params (dict[str, str]): normalized URL query strings
+
+        Returns:
+            list[dict[str, str]] | None: the query strings of each part, in the order their results are stitched together, or None if the query is sent as is
+        """
+        parts = [
+            chunk
+            for shard in self._season_shards(params) or [params]
+            for chunk in self._chunk_query(url, shard) or [shard]
+        ]
+        return parts if len(parts) > 1 else None
+
+    def _chunk_query(
+        self, url: str, params: dict[str, str]
+    ) -> list[dict[str, str]] | None:
+        """Splits the longest id list of a query whose URL is too long into chunks.
+
+        Only id lists the results are keyed on are split, see `CHUNKABLE_ID_PARAMS`,
+        plus `game_id` when results are split by games. Splitting any other list
+        would return partial totals, so a query whose URL is too long because of one
+        raises instead. Ids are sorted, and a chunk ends after every id whose hash is a multiple of
+        `ID_CHUNK_SIZE`, or once the URL would grow past `MAX_URL_LENGTH`. Chunk
+        boundaries thus only depend on the ids around them, so queries of
+        overlapping id lists share most of their chunks, and the cached results of
+        each.
+
+        Args:
+            url (str): the API endpoint to call
+            params (dict[str, str]): normalized URL query strings
+
+        Returns:
+            list[dict[str, str]] | None: the query strings of each chunk, or None if the URL is short enough or holds no id list
+
+        Raises:
+            InvalidParameterFormatError: if the URL is too long and its id lists cannot be split
+        """
+        length = len(url) + 1 + len(urlencode(params))
+        if length <= self.MAX_URL_LENGTH:
+            return None
+        present = [key for key in self.ID_PARAMS if params.get(key)]
+        if not present:
+            return None
+        endpoint = url.removeprefix(self.base_url).partition("/")[2]
+        chunkable = set(self.CHUNKABLE_ID_PARAMS.get(endpoint.partition("/")[0], ()))
+        if params.get("split_by_games", "").lower() == "true":
+            chunkable.add("game_id")
+        keys = [key for key in present if key in chunkable and "," in params[key]]
+        if not keys:
+            longest = max(present, key=lambda k: len(params[k]))
+            raise InvalidParameterFormatError(
+                f"The {longest} list makes the URL longer than {self.MAX_URL_LENGTH} "
+                f"characters, and cannot be sent in chunks because {endpoint} results "
+                "are totaled over it. Request fewer ids, or split the results by games."
             )
-            self.players = self._get_entity("player")
-            self.teams = self._get_entity("team")
-            self.stadia = self._get_entity("stadia")
-            self.managers = self._get_entity("manager")
-            self.referees = self._get_entity("referee")
-        self.logger.info("Finished initializing client")
+        key = max(keys, key=lambda k: len(params[k]))
+        # Room left for the ids once the other query strings are in the URL
+        budget = self.MAX_URL_LENGTH - length + len(quote_plus(params[key]))
+
+        chunks: list[list[str]] = []
+        chunk: list[str] = []
+        size = 0
+        for item in params[key].split(","):
+            # The id and the encoded comma separating it from the next one
+            item_size = len(quote_plus(item)) + 3
+            if chunk and size + item_size > budget:
+                chunks.append(chunk)
+                chunk, size = [], 0
+            chunk.append(item)
+            size += item_size
+            if zlib.crc32(item.encode()) % self.ID_CHUNK_SIZE == 0:
+                chunks.append(chunk)
+                chunk, size = [], 0
+        if chunk:
+            chunks.append(chunk)
+        return [{**params, key: ",".join(chunk)} for chunk in chunks]
+
+    @staticmethod
+    def _merge_chunks(frames: list[DataFrame]) -> DataFrame:
+        """Stitches the results of the parts of a query together, dropping the rows
+        returned by several parts, such as a game matched by both of its teams
 
-    def _get_entity(self, entity_type: str) -> DataFrame:
-        """Gets all the data for a specific type and
-        stores it in a DataFrame.
+        Args:
+            frames (list[DataFrame]): the result of each part
+
+        Returns:
+            DataFrame
+        """
+        from pandas import DataFrame, concat
+
+        frames = [frame for frame in frames if len(frame.columns) > 0]
+        if not frames:
+            return DataFrame([])
+        merged = concat(frames, ignore_index=True)
+        # Cells holding lists or dicts cannot be compared, rows are matched on the other columns
+        columns = [
+            column
+            for column in merged.columns
+            if merged[column].dtype != object
+            or not merged[column].map(lambda cell: isinstance(cell, (list, dict))).any()
+        ]
+        return merged.drop_duplicates(subset=columns, ignore_index=True)
+
+    def _compact(self, frame: DataFrame, endpoint: str) -> DataFrame:
+        """Converts a result to memory-compact dtypes, if the client was created with `compact=True`
 
         Args:
-            entity_type (str): type of data to get
+            frame (DataFrame): API result
+            endpoint (str): the endpoint the result comes from, such as "players/xgoals"
 
         Returns:
-            DataFrame: All records for the given entity type across all leagues,
-          with a "competition" column indicating the source league.
+            DataFrame
         """
-        plural_type = f"{entity_type}s" if entity_type != "stadia" else f"{entity_type}"
-        self.logger.info(f"Gathering all {plural_type}")
-        frames = []
-        for league in self.LEAGUES:
-            url = f"{self.base_url}{league}/{plural_type}"
-            resp_df = self._execute_query(url, {})
-            resp_df = resp_df.assign(competition=league)
-            frames.append(resp_df)
-        return concat(frames, ignore_index=True) if frames else DataFrame([])
+        if not self.compact:
+            return frame
+        from itscalledsoccer.compact import compact_frame
 
-    def _convert_name_to_id(self, entity_type: str, name: str) -> str:
+        return compact_frame(frame, endpoint)
+
+    @abc.abstractmethod
+    def _entity_lookup(
+        self, entity_type: str, leagues: str | list[str] | None = None
+    ) -> DataFrame:
+        """Returns the table used to convert names of the given entity type to ids
+
+        Args:
+            entity_type (str): type of name to convert
+            leagues (str | list[str] | None): leagues the table must cover. Defaults to None, for all leagues.
+
+        Returns:
+            DataFrame
+        """
+
+    def _entity_leagues(self, leagues: str | list[str] | None) -> list[str]:
+        """Normalizes the leagues an entity table is requested for
+
+        Args:
+            leagues (str | list[str] | None): league abbreviation or list of league abbreviations
+
+        Returns:
+            list[str]: the given leagues, or every league if none were given
+        """
+        self._check_leagues(leagues)
+        if not leagues:
+            return list(self.LEAGUES)
+        return [leagues] if isinstance(leagues, str) else list(dict.fromkeys(leagues))
+
+    def _missing_entity_leagues(
+        self, entity_type: str, leagues: list[str]
+    ) -> list[str]:
+        """Lists the leagues whose data has not been loaded yet for an entity type
+
+        Args:
+            entity_type (str): type of data
+            leagues (list[str]): league abbreviations
+
+        Returns:
+            list[str]
+        """
+        if getattr(self, self.ENTITY_TYPES[entity_type][0]) is not None:
+            return []
+        partitions = self._entity_partitions[entity_type]
+        return [league for league in leagues if league not in partitions]
+
+    def _store_entity(
+        self, entity_type: str, leagues: list[str], entity_data: DataFrame
+    ) -> None:
+        """Stores freshly loaded data of an entity type, one partition per league.
+        Once every league has been loaded, the partitions are merged into the
+        entity attribute, such as `players`.
+
+        Args:
+            entity_type (str): type of data
+            leagues (list[str]): the leagues the data was loaded for
+            entity_data (DataFrame): the loaded data
+        """
+        from pandas import concat
+
+        attr = self.ENTITY_TYPES[entity_type][0]
+        partitions = self._entity_partitions[entity_type]
+        if not partitions and set(leagues) >= set(self.LEAGUES):
+            setattr(self, attr, entity_data)
+            return
+
+        for league, partition in entity_data.groupby(
+            "competition", sort=False, observed=True
+        ):
+            partitions[league] = partition.reset_index(drop=True)
+        for league in leagues:
+            partitions.setdefault(league, entity_data.iloc[0:0])
+
+        if all(league in partitions for league in self.LEAGUES):
+            frames = [partitions.pop(league) for league in self.LEAGUES]
+            setattr(self, attr, self._compact(concat(frames, ignore_index=True), attr))
+            partitions.clear()
+
+    def _entity_table(self, entity_type: str, leagues: list[str]) -> DataFrame | None:
+        """Returns the loaded data of an entity type for the given leagues
+
+        Args:
+            entity_type (str): type of data
+            leagues (list[str]): league abbreviations
+
+        Returns:
+            DataFrame | None: the data, or None if some of the leagues have not been loaded
+        """
+        entity_all = getattr(self, self.ENTITY_TYPES[entity_type][0])
+        if entity_all is not None:
+            return entity_all
+        partitions = self._entity_partitions[entity_type]
+        if any(league not in partitions for league in leagues):
+            return None
+        if len(leagues) == 1:
+            return partitions[leagues[0]]
+        from pandas import concat
+
+        return concat([partitions[league] for league in leagues], ignore_index=True)
+
+    def _name_index(
+        self, entity_type: str, leagues: str | list[str] | None = None
+    ) -> _NameIndex:
+        """Returns the name index of an entity type, building it the first time
+        it is needed and again whenever the entity table is replaced.
+
+        Args:
+            entity_type (str): type of name to convert
+            leagues (str | list[str] | None): leagues to match names in. Defaults to None, for all leagues.
+
+        Returns:
+            _NameIndex
+        """
+        if entity_type not in self.ENTITY_TYPES:
+            raise InvalidEntityTypeError(f"Unknown entity type '{entity_type}'.")
+
+        attr, name_col, id_col = self.ENTITY_TYPES[entity_type]
+        lookup = self._entity_lookup(entity_type, leagues)
+        if lookup is getattr(self, attr):
+            key: tuple[str, ...] = (entity_type,)
+        else:
+            key = (entity_type, *self._entity_leagues(leagues))
+        index = self._name_indexes.get(key)
+        if index is None or index.source is not lookup:
+            index = _NameIndex(lookup, name_col, id_col)
+            self._name_indexes[key] = index
+        return index
+
+    def _convert_name_to_id(
+        self, entity_type: str, name: str, leagues: str | list[str] | None = None
+    ) -> str:
         """Converts the name of a player, manager, stadium, referee or team
         to their corresponding id.
 
         Args:
             entity_type (str): type of name to convert
             name (str): name
+            leagues (str | list[str] | None): leagues to match names in. Defaults to None, for all leagues.
 
         Returns:
           str: the matched id
         """
-        min_score = 70
+        return self._match_names(entity_type, [name], leagues)[0]
 
-        TYPE_MAP = {
-            "player": ("players", "player_name", "player_id"),
-            "manager": ("managers", "manager_name", "manager_id"),
-            "stadium": ("stadia", "stadium_name", "stadium_id"),
-            "referee": ("referees", "referee_name", "referee_id"),
-            "team": ("teams", "team_name", "team_id"),
-        }
+    def _match_names(
+        self,
+        entity_type: str,
+        names: list[str],
+        leagues: str | list[str] | None = None,
+    ) -> list[str]:
+        """Matches a list of names against an entity type in one batched pass.
 
-        if entity_type not in TYPE_MAP:
-            raise InvalidEntityTypeError(f"Unknown entity type '{entity_type}'.")
+        Names found verbatim are resolved through the name index, the others are
+        fuzzy matched: with `process.cdist` spread over every CPU when more than one
+        is available, or one `process.extractOne` call at a time otherwise.
 
-        attr, name_col, id_col = TYPE_MAP[entity_type]
-        lookup = getattr(self, attr)
-        if lookup is None:
-            lookup = self._get_entity(entity_type)
-            setattr(self, attr, lookup)
-        names = lookup[name_col].to_list()
-
-        matches = process.extractOne(name, names, scorer=fuzz.partial_ratio)
-        if matches:
-            if matches[1] >= min_score:
-                name = matches[0]
-            else:
-                self.logger.info(f"No match found for {name} due to score")
-                return ""
-        else:
-            self.logger.info(f"No match found for {name}")
-            return ""
+        Args:
+            entity_type (str): type of name to convert
+            names (list[str]): names to convert
+            leagues (str | list[str] | None): leagues to match names in. Defaults to None, for all leagues.
+
+        Returns:
+            list[str]: the matched ids, or an empty string for names without a match
+        """
+        min_score = 70
 
-        matched_id = lookup.loc[lookup[name_col] == name, id_col].iloc[0]
+        index = self._name_index(entity_type, leagues)
+        matched: dict[str, str] = {}
+        unmatched = []
+        for name in dict.fromkeys(names):
+            if name in index.ids:
+                matched[name] = index.ids[name]
+            else:
+                unmatched.append(name)
+
+        if unmatched and index.names:
+            from rapidfuzz import fuzz, process
+
+            if len(unmatched) > 1 and (os.cpu_count() or 1) > 1:
+                # Bound the size of the score matrix for very long lists of names
+                block_size = max(1, self.MAX_SCORE_CELLS // len(index.names))
+                for start in range(0, len(unmatched), block_size):
+                    block = unmatched[start : start + block_size]
+                    scores = process.cdist(
+                        block,
+                        index.names,
+                        scorer=fuzz.partial_ratio,
+                        score_cutoff=min_score,
+                        workers=-1,
+                    )
+                    best = scores.argmax(axis=1)
+                    for row, name in enumerate(block):
+                        if scores[row, best[row]] >= min_score:
+                            matched[name] = index.ids[index.names[best[row]]]
+            else:
+                for name in unmatched:
+                    match = process.extractOne(
+                        name,
+                        index.names,
+                        scorer=fuzz.partial_ratio,
+                        score_cutoff=min_score,
+                    )
+                    if match:
+                        matched[name] = index.ids[match[0]]
 
-        return matched_id
+        for name in unmatched:
+            if name not in matched:
+                self.logger.info(f"No match found for {name}")
+        return [matched.get(name, "") for name in names]
 
     def _convert_names_to_ids(
-        self, entity_type: str, names: str | list[str]
+        self,
+        entity_type: str,
+        names: str | list[str],
+        leagues: str | list[str] | None = None,
     ) -> str | list[str] | None:
         """Converts a name or list of names to an id or list of ids
 
         Args:
             entity_type (str): type of name
             names (str | list[str]): a name or list of names
+            leagues (str | list[str] | None): leagues to match names in. Defaults to None, for all leagues.
 
         Returns:
             str | list[str]: the matched ids
         """
-        ids: list[str] = []
         if names is None:
             return None
         if isinstance(names, str):
-            return self._convert_name_to_id(entity_type, names)
+            return self._convert_name_to_id(entity_type, names, leagues)
         else:
-            for n in names:
-                ids.append(self._convert_name_to_id(entity_type, n))
-            return ids
+            return self._match_names(entity_type, list(names), leagues)
 
     def _check_leagues(self, leagues: str | list[str] | None) -> None:
         """Validates the leagues parameter
@@ -246,6 +865,17 @@ class AmericanSoccerAnalysis:
                     "Names must be passed as a string or list of names."
                 )
 
+    def _check_flatten(self, flatten: str | None) -> None:
+        """Validates the flatten argument of the goals added methods
+
+        Args:
+            flatten (str | None): "long", "wide" or None
+        """
+        if flatten not in (None, "long", "wide"):
+            raise InvalidParameterFormatError(
+                f"flatten must be 'long' or 'wide'. Received: {flatten}"
+            )
+
     def _check_season_name(self, season_name: str | list[str] | None) -> None:
         """Validates the season_name parameter to ensure data is available (2013 onward).
 
@@ -277,39 +907,681 @@ class AmericanSoccerAnalysis:
         ids: str | list[str] | None = None,
         names: str | list[str] | None = None,
     ) -> DataFrame:
-        """Filters a DataFrame based on the arguments given.
+        """Filters a DataFrame based on the arguments given.
+
+        Args:
+            entity_all (DataFrame): a DataFrame containing the complete set of data
+            entity_type (str): the type of data
+            leagues (str | list[str] | None): league abbreviation or list of league abbreviations
+            ids (str | list[str] | None): a single id or list of ids
+            names (str | list[str] | None): a single name or list of names
+        Returns:
+            DataFrame
+        """
+        self._check_leagues(leagues)
+        self._check_ids_names(ids, names)
+
+        entity = entity_all
+
+        if names:
+            converted_ids = self._convert_names_to_ids(entity_type, names, leagues)
+        else:
+            converted_ids = ids
+
+        if isinstance(leagues, str):
+            leagues = [leagues]
+        if isinstance(converted_ids, str):
+            converted_ids = [converted_ids]
+
+        if leagues:
+            entity = entity[entity["competition"].isin(leagues)]
+
+        if converted_ids:
+            entity = entity[entity[f"{entity_type}_id"].isin(converted_ids)]
+
+        if self.entity_store is not None:
+            entity = self.entity_store.decode(entity_type, entity)
+
+        if self.partial_results:
+            if entity is entity_all:
+                entity = entity.copy(deep=False)
+            entity.attrs["errors"] = list(entity_all.attrs.get("errors", []))
+        return entity
+
+    def _build_stats_query(
+        self, leagues: str | list[str], stat_type: str, entity: str, kwargs: dict
+    ) -> dict[str, str | list[str] | None]:
+        """Validates the arguments of a stats query and converts them to URL query strings
+
+        Args:
+            leagues (str | list[str]): league abbreviation or list of league abbreviations
+            stat_type (str): the type of stats requested
+            entity (str): the type of entity the stats are about
+            kwargs (dict): the keyword arguments given to the stats method
+
+        Returns:
+            dict[str, str | list[str] | None]: URL query strings
+        """
+        kwargs = dict(kwargs)
+        if stat_type == "salaries":
+            self._check_leagues_salaries(leagues)
+            if (
+                entity == "teams"
+                and not kwargs.get("split_by_teams", False)
+                and not kwargs.get("split_by_seasons", False)
+                and not kwargs.get("split_by_positions", False)
+            ):
+                kwargs["split_by_teams"] = True
+        else:
+            self._check_leagues(leagues)
+        self._check_season_name(kwargs.get("season_name", None))
+
+        PLAYER_KEYS = {"player_ids", "player_names"}
+        TEAM_KEYS = {"team_ids", "team_names"}
+        keys_dict = kwargs.keys()
+
+        if PLAYER_KEYS & keys_dict:
+            self._check_ids_names(
+                kwargs.get("player_ids", None), kwargs.get("player_names", None)
+            )
+
+            if kwargs.get("player_names", None):
+                kwargs["player_id"] = self._convert_names_to_ids(
+                    "player", kwargs["player_names"], leagues
+                )
+                kwargs.pop("player_names")
+            else:
+                kwargs["player_id"] = kwargs["player_ids"]
+                kwargs.pop("player_ids")
+
+        if TEAM_KEYS & keys_dict:
+            self._check_ids_names(
+                kwargs.get("team_ids", None), kwargs.get("team_names", None)
+            )
+
+            if kwargs.get("team_names", None):
+                kwargs["team_id"] = self._convert_names_to_ids(
+                    "team", kwargs["team_names"], leagues
+                )
+                kwargs.pop("team_names")
+            else:
+                kwargs["team_id"] = kwargs["team_ids"]
+                kwargs.pop("team_ids")
+
+        if kwargs.get("game_ids", None):
+            kwargs["game_id"] = kwargs["game_ids"]
+            kwargs.pop("game_ids")
+        return kwargs
+
+    def _build_games_query(
+        self,
+        leagues: str | list[str] | None,
+        game_ids: str | list[str] | None,
+        team_ids: str | list[str] | None,
+        team_names: str | list[str] | None,
+        season_name: str | list[str] | None,
+        stages: str | list[str] | None,
+        status: str | list[str] | None,
+    ) -> dict[str, str | list[str] | None]:
+        """Validates the arguments of a games query and converts them to URL query strings
+
+        Args:
+            leagues (str | list[str] | None): league abbreviation or a list of league abbreviations
+            game_ids (str | list[str] | None): a single game id or a list of game ids
+            team_ids (str | list[str] | None): a single team id or a list of team ids
+            team_names (str | list[str] | None): a single team name or a list of team names
+            season_name (str | list[str] | None): a single year of a league season or a list of years
+            stages (str | list[str] | None): a single stage of competition or a list of stages
+            status (str | list[str] | None): a single game status or a list of statuses
+
+        Returns:
+            dict[str, str | list[str] | None]: URL query strings
+        """
+        self._check_leagues(leagues)
+        self._check_ids_names(team_ids, team_names)
+        self._check_season_name(season_name)
+
+        query: dict[str, str | list[str] | None] = {}
+
+        if game_ids:
+            query["game_id"] = game_ids
+        if team_names:
+            query["team_id"] = self._convert_names_to_ids("team", team_names, leagues)
+        if team_ids:
+            query["team_id"] = team_ids
+        if season_name:
+            query["season_name"] = season_name
+        if stages:
+            query["stage_name"] = stages
+        if status:
+            query["status"] = status
+        return query
+
+    def _parse_fetch_specs(
+        self, queries: list[str | dict]
+    ) -> list[tuple[str, str, inspect.BoundArguments]]:
+        """Validates the queries given to `fetch_many` and binds them to the arguments of their method
+
+        Args:
+            queries (list[str | dict]): method names, or dicts holding a method name, an optional result name and the method arguments
+
+        Returns:
+            list[tuple[str, str, inspect.BoundArguments]]: the result name, method name and arguments of each query, defaults included
+        """
+        specs = []
+        for query in queries:
+            kwargs = {"method": query} if isinstance(query, str) else dict(query)
+            method = kwargs.pop("method", None)
+            name = kwargs.pop("name", method)
+            if method != "get_games" and method not in self.STATS_METHODS:
+                raise InvalidParameterFormatError(
+                    f"fetch_many does not support {method!r}, use get_games or one of "
+                    f"{', '.join(self.STATS_METHODS)}"
+                )
+            if any(name == spec[0] for spec in specs):
+                raise ConflictingParametersError(
+                    f"Several queries are named {name!r}, give each one a distinct name"
+                )
+            arguments = inspect.signature(getattr(self, method)).bind(**kwargs)
+            arguments.apply_defaults()
+            specs.append((name, method, arguments))
+        return specs
+
+    def _finish_stats(
+        self, stats: DataFrame, endpoint: str, flatten: str | None
+    ) -> DataFrame:
+        """Flattens and compacts the combined result of a stats query, as requested
+
+        Args:
+            stats (DataFrame): results of every league
+            endpoint (str): the endpoint queried, such as "players/xgoals"
+            flatten (str | None): "long", "wide" or None
+
+        Returns:
+            DataFrame
+        """
+        if flatten:
+            stats = _flatten_goals_added(stats, flatten)
+        return self._compact(stats, endpoint)
+
+    def _finish_games(self, games: DataFrame) -> DataFrame:
+        """Compacts the combined result of a games query and sorts it, most recent games
+        first and games kicking off at the same time by id, so that the same games are
+        always returned in the same order
+
+        Args:
+            games (DataFrame): games of every league
+
+        Returns:
+            DataFrame
+        """
+        if games.empty:
+            return games
+        games = self._compact(games, "games")
+        return games.sort_values(
+            by=["date_time_utc", "game_id"],
+            ascending=[False, True],
+            kind="stable",
+            ignore_index=True,
+        )
+
+
+class AmericanSoccerAnalysis(_ClientBase):
+    """Wrapper around the ASA Shiny API
+
+    A single instance can be shared by several threads: entity data is loaded under
+    one lock per entity type, arguments are never modified, and the caches are
+    thread-safe.
+    """
+
+    def __init__(
+        self,
+        proxies: dict | None = None,
+        logging_level: str | None = "WARNING",
+        lazy_load: bool | None = True,
+        request_timeout: int = 30,
+        max_workers: int = 4,
+        page_window: int = 1,
+        cache: BaseCache | str | os.PathLike | None = None,
+        compact: bool = False,
+        result_cache_bytes: int = 128 * 1024**2,
+        pool_connections: int = 10,
+        pool_maxsize: int | None = None,
+        pool_block: bool = False,
+        keep_alive: bool = True,
+        keep_alive_idle: int = 60,
+        rate_limit: float | RateLimiter | None = None,
+        partial_results: bool = False,
+        checkpoint_dir: str | os.PathLike | None = None,
+        snapshot: str | os.PathLike | None = None,
+        entity_store: str | os.PathLike | EntityStore | None = None,
+        transport: Transport | None = None,
+        shard_seasons: bool = False,
+    ) -> None:
+        """Class constructor
+
+        Args:
+            proxies (dict | None): A dictionary containing proxy mappings, see https://docs.python-requests.org/en/latest/user/advanced/#proxies. Defaults to None.
+            logging_level (str | None): A string representing the logging level of the logger. Defaults to "WARNING".
+            lazy_load (bool | None): A boolean indicating whether to lazy load all entity data on initialization. Defaults to True.
+            request_timeout (int): Number of seconds to wait for a response from the API. Defaults to 30.
+            max_workers (int): Maximum number of leagues queried concurrently. Use 1 to query leagues one after another. Defaults to 4.
+            page_window (int): Number of result pages requested ahead of time, per league, when a query spans several pages. Use 1 to request pages one after another. Defaults to 1.
+            cache (BaseCache | str | os.PathLike | None): Where HTTP responses are cached. A directory path stores them in a persistent `SQLiteCache` shared by every process using that directory, any CacheControl cache can also be given. Defaults to None, an in-memory cache.
+            compact (bool): Whether to store results and entity tables with memory-compact dtypes: categorical low-cardinality strings, downcast numbers and interned ids. Defaults to False.
+            result_cache_bytes (int): Memory budget of the in-process cache of parsed query results, in bytes. Results are evicted least recently used first. Use 0 to disable it. Defaults to 128 MiB.
+            pool_connections (int): Number of hosts whose connection pools are kept. Defaults to 10.
+            pool_maxsize (int | None): Maximum number of connections kept open per host. Defaults to None, enough for `max_workers` leagues each requesting `page_window` pages at once, and at least 10.
+            pool_block (bool): Whether requests wait for a free connection once `pool_maxsize` connections are in use, instead of opening extra connections that are closed afterwards. Defaults to False.
+            keep_alive (bool): Whether connections are kept open and reused between requests. Defaults to True.
+            keep_alive_idle (int): Number of idle seconds before TCP keep-alive probes are sent on open connections, where the platform supports it. Defaults to 60.
+            rate_limit (float | RateLimiter | None): Maximum number of requests per second sent by all threads of the client, or a `RateLimiter`, for example one shared by several processes. Throttled requests are then sent again once the limiter allows, honoring Retry-After. Defaults to None, no limit.
+            partial_results (bool): Whether queries over several leagues return the leagues that succeeded when others fail, instead of raising. The failures are then reported in the `errors` entry of the result's `attrs`. Defaults to False.
+            checkpoint_dir (str | os.PathLike | None): Directory the downloaded result pages of a call are saved in until all of its queries succeed, so running a failed call again within a day only requests the pages that are missing. Defaults to None, no checkpoints.
+            snapshot (str | os.PathLike | None): Directory of a snapshot written by `snapshot`. Every query is then answered from its files, without sending requests to the API. Defaults to None.
+            entity_store (str | os.PathLike | EntityStore | None): Directory, or `EntityStore`, of entity tables shared read-only by several processes, as written by `publish_entities`. Entity types it holds are read from it instead of the API. Defaults to None.
+            transport (Transport | None): Transport sending the requests of the client, such as a `MemoryTransport` answering them from fixture files. Defaults to None, a `RequestsTransport` over `session`, which caches and retries requests.
+            shard_seasons (bool): Whether queries split by seasons over several seasons are sent as one query per season, run concurrently and cached on their own, so adding a season only requests that season. Results of completed seasons never expire from the result cache, and their HTTP responses are cached for a year. Defaults to False.
+        """
+        if rate_limit is not None and not isinstance(rate_limit, RateLimiter):
+            rate_limit = RateLimiter(rate_limit)
+        if pool_maxsize is None:
+            pool_maxsize = max(10, max(1, max_workers) * max(1, page_window))
+
+        super().__init__(
+            logging_level,
+            request_timeout,
+            max_workers,
+            page_window,
+            compact,
+            result_cache_bytes,
+            shard_seasons,
+        )
+
+        self.proxies = proxies
+        self.rate_limiter = rate_limit
+        self._cache = cache
+        self._pool_options = {
+            "pool_connections": pool_connections,
+            "pool_maxsize": pool_maxsize,
+            "pool_block": pool_block,
+            "keep_alive": keep_alive,
+            "keep_alive_idle": keep_alive_idle,
+        }
+        # The HTTP session is created on first use, see `session`
+        self._session: requests.Session | None = None
+        self._adapter: PooledCacheAdapter | None = None
+        self._session_lock = Lock()
+        self._transport = transport
+        self.lazy_load = lazy_load
+        self.partial_results = partial_results
+        self.checkpoint = (
+            PageCheckpoint(checkpoint_dir) if checkpoint_dir is not None else None
+        )
+        # Checkpointed queries completed by the call running in each thread
+        self._checkpoint_calls = local()
+        self.snapshot_store = Snapshot(snapshot) if snapshot is not None else None
+        if entity_store is not None and not isinstance(entity_store, EntityStore):
+            entity_store = EntityStore(entity_store)
+        self.entity_store = entity_store
+        self._in_flight = _SingleFlight()
+        self._entity_locks = {entity_type: Lock() for entity_type in self.ENTITY_TYPES}
+
+        if self.lazy_load:
+            self.logger.info(
+                "Lazy loading enabled. Initializing client without entity data."
+            )
+        elif self.entity_store is not None:
+            self.logger.info(
+                "Lazy loading disabled. Initializing client with shared entity data."
+            )
+            for entity_type in self.ENTITY_TYPES:
+                self._entity_lookup(entity_type)
+        else:
+            self.logger.info(
+                "Lazy loading disabled. Initializing client with entity data."
+            )
+            self.players = self._get_entity("player")
+            self.teams = self._get_entity("team")
+            self.stadia = self._get_entity("stadium")
+            self.managers = self._get_entity("manager")
+            self.referees = self._get_entity("referee")
+        self.logger.info("Finished initializing client")
+
+    def _ensure_session(self) -> requests.Session:
+        """Returns the HTTP session, creating it with its adapter and cache on first use
+
+        Returns:
+            requests.Session
+        """
+        if self._session is None:
+            with self._session_lock:
+                if self._session is None:
+                    self._session = self._create_session()
+        return self._session
+
+    @property
+    def session(self) -> requests.Session:
+        """HTTP session sending the requests of the client, created on first use"""
+        return self._ensure_session()
+
+    @session.setter
+    def session(self, session: requests.Session) -> None:
+        """Replaces the HTTP session. The adapter and cache of the client become those
+        mounted on the session for the API, and the default transport sends its
+        requests over it."""
+        from cachecontrol.adapter import CacheControlAdapter
+
+        from itscalledsoccer.adapter import PooledCacheAdapter
+
+        adapter = session.get_adapter(self.base_url)
+        with self._session_lock:
+            if (
+                isinstance(self._transport, RequestsTransport)
+                and self._transport.session is self._session
+            ):
+                self._transport = None
+            self._session = session
+            self._adapter = adapter if isinstance(adapter, PooledCacheAdapter) else None
+            self._cache = (
+                adapter.cache if isinstance(adapter, CacheControlAdapter) else None
+            )
+
+    @property
+    def transport(self) -> Transport:
+        """Transport sending the requests of the client, by default over `session`"""
+        if self._transport is None:
+            session = self._ensure_session()
+            with self._session_lock:
+                if self._transport is None:
+                    self._transport = RequestsTransport(session)
+        return self._transport
+
+    @property
+    def adapter(self) -> PooledCacheAdapter | None:
+        """HTTP adapter of the session, caching and retrying requests. None if the
+        session was replaced by one without a `PooledCacheAdapter`"""
+        self._ensure_session()
+        return self._adapter
+
+    @property
+    def cache(self) -> BaseCache | None:
+        """Cache of the HTTP responses. None if the session was replaced by one that
+        does not cache them"""
+        self._ensure_session()
+        return self._cache
+
+    def _create_session(self) -> requests.Session:
+        """Creates the HTTP session, mounting an adapter that caches responses and retries failed requests
+
+        Returns:
+            requests.Session
+        """
+        import requests
+        from urllib3.util.retry import Retry
+
+        from itscalledsoccer.adapter import PooledCacheAdapter
+
+        session = requests.session()
+        if self.proxies:
+            session.proxies.update(self.proxies)
+
+        status_forcelist = [429, 500, 502, 503, 504]  # HTTP codes to retry
+        if self.rate_limiter is not None:
+            # Throttled requests are retried by the rate limiter instead
+            status_forcelist = [500, 502, 504]
+        retry_strategy = Retry(
+            total=3,  # Total number of retries
+            backoff_factor=0.5,  # Exponential backoff: 0.5s, 1s, 2s
+            status_forcelist=status_forcelist,
+            allowed_methods=["GET"],  # Only retry GET requests
+            raise_on_status=False,  # Raise HTTPError once retries run out
+            respect_retry_after_header=self.rate_limiter is None,
+        )
+
+        # The adapter both caches responses and retries failed requests
+        self._adapter = PooledCacheAdapter(
+            self._open_http_cache(),
+            heuristic=self._cache_heuristic(),
+            max_retries=retry_strategy,
+            rate_limiter=self.rate_limiter,
+            **self._pool_options,
+        )
+        session.mount("https://", self._adapter)
+        session.mount("http://", self._adapter)
+        return session
+
+    def pool_stats(self) -> dict[str, int]:
+        """Reports how the HTTP connection pool has been used, to help size `pool_maxsize`
+
+        Returns:
+            dict[str, int]: the size of each host pool, connections opened, requests served by a reused connection, requests that waited for a free connection, and connections closed because the pool was full. Empty if the session has no `PooledCacheAdapter`
+        """
+        adapter = self.adapter
+        return adapter.stats() if adapter is not None else {}
+
+    def _map_concurrently(self, func: Callable[[T], R], items: Iterable[T]) -> list[R]:
+        """Applies a function to every item using a bounded pool of worker threads.
+
+        Args:
+            func (Callable[[T], R]): function to apply
+            items (Iterable[T]): items to apply the function to
+
+        Returns:
+            list[R]: the results, in the same order as the items
+        """
+        items = list(items)
+        workers = min(self.max_workers, len(items))
+        if workers <= 1:
+            return [func(item) for item in items]
+        # Workers complete checkpointed queries on behalf of the calling thread's call
+        completed = getattr(self._checkpoint_calls, "completed", None)
+
+        def run(item: T) -> R:
+            with self._checkpoint_call(completed):
+                return func(item)
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(run, items))
+
+    def _map_leagues(
+        self, func: Callable[[str], DataFrame], leagues: list[str]
+    ) -> tuple[list[DataFrame], list[dict]]:
+        """Queries every league concurrently. With `partial_results`, the leagues
+        whose requests fail are left out and reported instead of raising.
+
+        Args:
+            func (Callable[[str], DataFrame]): function querying one league
+            leagues (list[str]): league abbreviations
+
+        Returns:
+            tuple[list[DataFrame], list[dict]]: the results of the leagues that succeeded, in order, and a report of each failure
+        """
+        completed: set[str] = set()
+        if not self.partial_results:
+            with self._checkpoint_call(completed):
+                frames = self._map_concurrently(func, leagues)
+            self._discard_checkpoint(completed, [])
+            return frames, []
+        from requests import RequestException
+
+        def attempt(league: str) -> tuple[DataFrame | None, dict | None]:
+            try:
+                return func(league), None
+            except RequestException as error:
+                self.logger.warning(f"Query failed for {league}: {error}")
+                return None, self._error_report(league, error)
+
+        with self._checkpoint_call(completed):
+            outcomes = self._map_concurrently(attempt, leagues)
+        frames = [frame for frame, error in outcomes if error is None]
+        errors = [error for _, error in outcomes if error is not None]
+        self._discard_checkpoint(completed, errors)
+        return frames, errors
+
+    @contextmanager
+    def _checkpoint_call(self, completed: set[str] | None) -> Iterator[None]:
+        """Collects the checkpointed queries the current thread completes into the set of
+        the call it runs for
+
+        Args:
+            completed (set[str] | None): names of the queries completed by the call, or None outside of a call
+        """
+        previous = getattr(self._checkpoint_calls, "completed", None)
+        self._checkpoint_calls.completed = completed
+        try:
+            yield
+        finally:
+            self._checkpoint_calls.completed = previous
+
+    def _complete_checkpoint(
+        self, url: str, params: dict[str, str], completed: set[str] | None = None
+    ) -> None:
+        """Records that every page of a query has been downloaded, if the checkpoint saved any
+
+        Args:
+            url (str): the API endpoint called
+            params (dict[str, str]): normalized URL query strings
+            completed (set[str] | None): names of the queries completed by the call. Defaults to None, the call of the current thread.
+        """
+        if self.checkpoint is None:
+            return
+        if completed is None:
+            completed = getattr(self._checkpoint_calls, "completed", None)
+        name = self.checkpoint.complete(url, params)
+        if name is not None and completed is not None:
+            completed.add(name)
+
+    def _discard_checkpoint(self, completed: set[str], errors: list) -> None:
+        """Removes the checkpointed pages of the queries of a call, once all of them
+        succeeded. Pages of other calls are kept, so a failed call can still resume.
+
+        Args:
+            completed (set[str]): names of the queries completed by the call
+            errors (list): the failures of the call, with `partial_results`
+        """
+        if self.checkpoint is not None and completed and not errors:
+            self.checkpoint.discard_completed(completed)
+
+    @staticmethod
+    def _error_report(league: str, error: requests.RequestException) -> dict:
+        """Describes a failed request
+
+        Args:
+            league (str): league abbreviation
+            error (requests.RequestException): the error raised
+
+        Returns:
+            dict: the league, URL, result page offset and HTTP status of the failed request, and the error message
+        """
+        request = getattr(error, "request", None)
+        url = getattr(request, "url", None)
+        query = parse_qs(urlsplit(url).query) if url else {}
+        response = getattr(error, "response", None)
+        return {
+            "league": league,
+            "url": url,
+            "offset": int(query.get("offset", ["0"])[0]),
+            "status": response.status_code if response is not None else None,
+            "error": str(error),
+        }
+
+    def _with_errors(self, result: DataFrame, errors: list[dict]) -> DataFrame:
+        """Attaches the report of failed requests to a result, with `partial_results`
+
+        Args:
+            result (DataFrame): the result of the leagues that succeeded
+            errors (list[dict]): a report of each failure
+
+        Returns:
+            DataFrame
+        """
+        if self.partial_results:
+            result.attrs["errors"] = errors
+        return result
+
+    def _get_entity(
+        self, entity_type: str, leagues: list[str] | None = None
+    ) -> DataFrame:
+        """Gets all the data for a specific type and
+        stores it in a DataFrame.
 
         Args:
-            entity_all (DataFrame): a DataFrame containing the complete set of data
-            entity_type (str): the type of data
-            leagues (str | list[str] | None): league abbreviation or list of league abbreviations
-            ids (str | list[str] | None): a single id or list of ids
-            names (str | list[str] | None): a single name or list of names
+            entity_type (str): type of data to get
+            leagues (list[str] | None): leagues to get the data of. Defaults to None, for all leagues.
+
         Returns:
-            DataFrame
+            DataFrame: All records for the given entity type across the leagues,
+          with a "competition" column indicating the source league.
         """
-        self._check_leagues(leagues)
-        self._check_ids_names(ids, names)
+        from pandas import DataFrame, concat
 
-        entity = entity_all
+        plural_type = self.ENTITY_TYPES[entity_type][0]
+        self.logger.info(f"Gathering all {plural_type}")
 
-        if names:
-            converted_ids = self._convert_names_to_ids(entity_type, names)
-        else:
-            converted_ids = ids
+        def fetch(league: str) -> DataFrame:
+            url = f"{self.base_url}{league}/{plural_type}"
+            return self._execute_query(url, {}).assign(competition=league)
 
-        if isinstance(leagues, str):
-            leagues = [leagues]
-        if isinstance(converted_ids, str):
-            converted_ids = [converted_ids]
+        frames, errors = self._map_leagues(fetch, leagues or self.LEAGUES)
+        entity_data = concat(frames, ignore_index=True) if frames else DataFrame([])
+        return self._with_errors(self._compact(entity_data, plural_type), errors)
 
-        if leagues:
-            entity = entity[entity["competition"].isin(leagues)]
+    def _entity_lookup(
+        self, entity_type: str, leagues: str | list[str] | None = None
+    ) -> DataFrame:
+        """Returns the data of an entity type for the given leagues, loading
+        the leagues that are missing from the API the first time they are needed.
 
-        if converted_ids:
-            entity = entity[entity[f"{entity_type}_id"].isin(converted_ids)]
+        Args:
+            entity_type (str): type of data
+            leagues (str | list[str] | None): leagues the table must cover. Defaults to None, for all leagues.
 
-        return entity
+        Returns:
+            DataFrame: with `partial_results`, the leagues that failed to load are left out, and reported in the `errors` entry of its `attrs`
+        """
+        from pandas import DataFrame
+
+        leagues = self._entity_leagues(leagues)
+        attr = self.ENTITY_TYPES[entity_type][0]
+        if self.entity_store is not None:
+            shared = self.entity_store.get(entity_type)
+            if shared is not None:
+                # Follows the version published last
+                setattr(self, attr, shared)
+                return shared
+
+        entity_all = getattr(self, attr)
+        if entity_all is not None:
+            return entity_all
+
+        with self._entity_locks[entity_type]:
+            missing = self._missing_entity_leagues(entity_type, leagues)
+            if not missing:
+                return self._entity_table(entity_type, leagues)
+            if set(missing) >= set(self.LEAGUES):
+                entity_data = self._get_entity(entity_type)
+            else:
+                entity_data = self._get_entity(entity_type, missing)
+            errors = entity_data.attrs.pop("errors", [])
+            if not errors:
+                self._store_entity(entity_type, missing, entity_data)
+                return self._entity_table(entity_type, leagues)
+
+            # Failed leagues stay missing, so they are requested again next time
+            failed = {error["league"] for error in errors}
+            succeeded = [league for league in missing if league not in failed]
+            if succeeded:
+                self._store_entity(entity_type, succeeded, entity_data)
+            loaded = [league for league in leagues if league not in failed]
+            _, name_col, id_col = self.ENTITY_TYPES[entity_type]
+            table = (
+                self._entity_table(entity_type, loaded).copy(deep=False)
+                if loaded
+                else DataFrame(columns=[id_col, name_col, "competition"])
+            )
+            table.attrs["errors"] = errors
+            return table
 
     def _execute_query(
         self, url: str, params: dict[str, str | list[str] | None]
@@ -323,28 +1595,166 @@ class AmericanSoccerAnalysis:
         Returns:
             DataFrame
         """
-        for k, v in params.items():
-            if isinstance(v, list):
-                params[k] = ",".join(v)
+        # Work on a copy, the same params are shared by concurrent league queries
+        params = self._canonical_params(params)
+        parts = self._split_query(url, params)
+        if parts is not None:
+            self.logger.info(f"Splitting a query to {url} into {len(parts)} parts")
+            return self._merge_chunks(
+                self._map_concurrently(
+                    lambda part: self._execute_query(url, part), parts
+                )
+            )
+        key = (url, tuple(params.items()))
+        if self.result_cache is not None:
+            cached = self.result_cache.get(key)
+            if cached is not None:
+                return cached
+
+        # Concurrent callers of the same query wait for one set of requests
+        response, shared = self._in_flight.do(
+            key, lambda: self._run_query(url, params, key)
+        )
+        return response.copy() if shared else response
+
+    def _run_query(self, url: str, params: dict[str, str], key: Hashable) -> DataFrame:
+        """Requests every page of a query and caches the result
 
-        temp_response = self._single_request(url, params)
-        response = temp_response
+        Args:
+            url (str): the API endpoint to call
+            params (dict[str, str]): normalized URL query strings
+            key (Hashable): the result cache key of the query
+
+        Returns:
+            DataFrame
+        """
+        from pandas import DataFrame, concat
 
-        if isinstance(response, DataFrame):
-            offset = self.MAX_API_LIMIT
+        response = self._single_request(url, params)
 
-            frames = []
-            while len(temp_response.index) == self.MAX_API_LIMIT:
-                params["offset"] = str(offset)
-                temp_response = self._single_request(url, params)
-                frames.append(temp_response)
-                offset = offset + self.MAX_API_LIMIT
+        if (
+            isinstance(response, DataFrame)
+            and len(response.index) == self.MAX_API_LIMIT
+        ):
+            frames = [page for _, page in self._iter_next_pages(url, params)]
             response = (
                 concat([response] + frames, ignore_index=True) if frames else response
             )
 
+        self._complete_checkpoint(url, params)
+        if self.result_cache is not None and isinstance(response, DataFrame):
+            self.result_cache.set(key, response, self._result_max_age(url, params))
         return response
 
+    def _iter_pages(
+        self,
+        url: str,
+        params: dict[str, str | list[str] | None],
+        completed: set[str],
+    ) -> Iterator[tuple[int, DataFrame]]:
+        """Requests the pages of a query one after the other, as they are consumed
+
+        Args:
+            url (str): the API endpoint to call
+            params (dict[str, str | list[str] | None): URL query strings
+            completed (set[str]): names of the checkpointed queries completed by the call, which the query is added to once its last page is downloaded
+
+        Yields:
+            tuple[int, DataFrame]: the offset and rows of each non-empty page, in offset order
+        """
+        params = self._canonical_params(params)
+
+        response = self._single_request(url, params)
+        if len(response.index) > 0:
+            yield 0, response
+        if len(response.index) == self.MAX_API_LIMIT:
+            yield from self._iter_next_pages(url, params)
+        self._complete_checkpoint(url, params, completed)
+
+    def _iter_next_pages(
+        self, url: str, params: dict[str, str | None]
+    ) -> Iterator[tuple[int, DataFrame]]:
+        """Requests the pages following the first one, in a sliding window if `page_window` allows it
+
+        Args:
+            url (str): the API endpoint to call
+            params (dict[str, str | None]): URL query strings
+
+        Yields:
+            tuple[int, DataFrame]: the offset and rows of each non-empty page, in offset order
+        """
+        if self.page_window > 1:
+            return self._iter_pages_windowed(url, params)
+        return self._iter_pages_sequential(url, params)
+
+    def _iter_pages_sequential(
+        self, url: str, params: dict[str, str | None]
+    ) -> Iterator[tuple[int, DataFrame]]:
+        """Requests the pages following the first one, one at a time, until a short page is returned
+
+        Args:
+            url (str): the API endpoint to call
+            params (dict[str, str | None]): URL query strings
+
+        Yields:
+            tuple[int, DataFrame]: the offset and rows of each non-empty page, in offset order
+        """
+        offset = self.MAX_API_LIMIT
+        while True:
+            page = self._single_request(url, {**params, "offset": str(offset)})
+            if len(page.index) > 0:
+                yield offset, page
+            if len(page.index) < self.MAX_API_LIMIT:
+                return
+            offset = offset + self.MAX_API_LIMIT
+
+    def _iter_pages_windowed(
+        self, url: str, params: dict[str, str | None]
+    ) -> Iterator[tuple[int, DataFrame]]:
+        """Requests the pages following the first one in a sliding window of concurrent offsets.
+
+        Pages are consumed in offset order and the window slides forward each time a
+        full page is consumed. Once a short page is found, or the consumer stops
+        iterating, pages still queued are cancelled and pages already in flight are
+        discarded.
+
+        Args:
+            url (str): the API endpoint to call
+            params (dict[str, str | None]): URL query strings
+
+        Yields:
+            tuple[int, DataFrame]: the offset and rows of each non-empty page, in offset order
+        """
+        offset = self.MAX_API_LIMIT
+        executor = ThreadPoolExecutor(max_workers=self.page_window)
+        pending: deque[tuple[int, Future[DataFrame]]] = deque()
+
+        def submit() -> None:
+            nonlocal offset
+            pending.append(
+                (
+                    offset,
+                    executor.submit(
+                        self._single_request, url, {**params, "offset": str(offset)}
+                    ),
+                )
+            )
+            offset = offset + self.MAX_API_LIMIT
+
+        try:
+            for _ in range(self.page_window):
+                submit()
+            while pending:
+                page_offset, future = pending.popleft()
+                page = future.result()
+                if len(page.index) > 0:
+                    yield page_offset, page
+                if len(page.index) < self.MAX_API_LIMIT:
+                    break
+                submit()
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
     def _single_request(
         self, url: str, params: dict[str, str | list[str] | None]
     ) -> DataFrame:
@@ -357,12 +1767,72 @@ class AmericanSoccerAnalysis:
         Returns:
             DataFrame
         """
-        response = self.session.get(
-            url=url, params=params, timeout=self.request_timeout
+        from pandas import DataFrame
+
+        if self.snapshot_store is not None:
+            league, _, endpoint = url.removeprefix(self.base_url).partition("/")
+            query = self._canonical_params(params)
+            offset = int(query.pop("offset", 0))
+            result = self.snapshot_store.query(league, endpoint, query)
+            return result.iloc[offset : offset + self.MAX_API_LIMIT].reset_index(
+                drop=True
+            )
+        if self.checkpoint is None:
+            return self._get_result(url, params, DataFrame)
+
+        records = self.checkpoint.get(url, params)
+        if records is not None:
+            return DataFrame(records)
+
+        def build(records: list) -> DataFrame:
+            self.checkpoint.set(url, params, records)
+            return DataFrame(records)
+
+        return self._get_result(url, params, build)
+
+    def _get_result(
+        self,
+        url: str,
+        params: dict[str, str | list[str] | None],
+        build: Callable[[list], R],
+        headers: dict[str, str] | None = None,
+    ) -> R:
+        """Sends a GET request through the transport and builds the result from the
+        decoded records, measuring each step when an `on_request_end` listener is registered
+
+        Args:
+            url (str): the API endpoint to call
+            params (dict[str, str | list[str] | None]): URL query strings
+            build (Callable[[list], R]): builds the result from the decoded records
+            headers (dict[str, str] | None): extra request headers. Defaults to None.
+
+        Returns:
+            R: the result
+        """
+        response = self.transport.get(
+            url, params, timeout=self.request_timeout, headers=headers
         )
-        response.raise_for_status()
-        resp_df = DataFrame(response.json())
-        return resp_df
+        if not self._listeners:
+            if response.error is not None:
+                raise response.error
+            return build(response.records)
+
+        measures = {
+            "status": response.status,
+            "latency": response.latency,
+            "bytes_received": response.bytes_received,
+            "cache_hit": response.cache_hit,
+            "retries": response.retries,
+            "decode_time": response.decode_time,
+        }
+        if response.error is not None:
+            self._notify(url, params, **measures, build_time=0.0)
+            raise response.error
+
+        start = perf_counter()
+        result = build(response.records)
+        self._notify(url, params, **measures, build_time=perf_counter() - start)
+        return result
 
     def _get_stats(
         self, leagues: str | list[str], stat_type: str, entity: str, **kwargs
@@ -383,75 +1853,36 @@ class AmericanSoccerAnalysis:
             team_ids (str | list[str]): Team IDs on which to filter. Cannot be combined with team_names. Accepts a string or list of strings.
             team_names (str | list[str]): Team names on which to filter. Partial matches and abbreviations are accepted. Cannot be combined with team_ids. Accepts a string or list of strings.
             game_ids (str | list[str]): Game IDs on which to filter. Accepts a string or list of strings.
+            flatten (str): "long" or "wide", to unnest the per-action records of goals added results.
 
         Returns:
             DataFrame
         """
-        self.logger.info(f"get_stats called with {locals()}")
-        if stat_type == "salaries":
-            self._check_leagues_salaries(leagues)
-            if (
-                entity == "teams"
-                and not kwargs.get("split_by_teams", False)
-                and not kwargs.get("split_by_seasons", False)
-                and not kwargs.get("split_by_positions", False)
-            ):
-                kwargs["split_by_teams"] = True
-        else:
-            self._check_leagues(leagues)
-
-        PLAYER_KEYS = {"player_ids", "player_names"}
-        TEAM_KEYS = {"team_ids", "team_names"}
-        keys_dict = kwargs.keys()
-
-        if PLAYER_KEYS & keys_dict:
-            self._check_ids_names(
-                kwargs.get("player_ids", None), kwargs.get("player_names", None)
-            )
-
-            if kwargs.get("player_names", None):
-                kwargs["player_id"] = self._convert_names_to_ids(
-                    "player", kwargs["player_names"]
-                )
-                kwargs.pop("player_names")
-            else:
-                kwargs["player_id"] = kwargs["player_ids"]
-                kwargs.pop("player_ids")
-
-        if TEAM_KEYS & keys_dict:
-            self._check_ids_names(
-                kwargs.get("team_ids", None), kwargs.get("team_names", None)
-            )
-
-            if kwargs.get("team_names", None):
-                kwargs["team_id"] = self._convert_names_to_ids(
-                    "team", kwargs["team_names"]
-                )
-                kwargs.pop("team_names")
-            else:
-                kwargs["team_id"] = kwargs["team_ids"]
-                kwargs.pop("team_ids")
+        from pandas import DataFrame, concat
 
-        if kwargs.get("game_ids", None):
-            kwargs["game_id"] = kwargs["game_ids"]
-            kwargs.pop("game_ids")
+        self.logger.info("Getting %s %s for %s", entity, stat_type, leagues)
+        flatten = kwargs.pop("flatten", None)
+        self._check_flatten(flatten)
+        kwargs = self._build_stats_query(leagues, stat_type, entity, kwargs)
 
-        if isinstance(leagues, str):
+        errors: list[dict] = []
+        if isinstance(leagues, str) and not self.partial_results:
             stats = DataFrame([])
             url = f"{self.base_url}{leagues}/{entity}/{stat_type}"
             response = self._execute_query(url, kwargs)
 
             stats = response
-        elif isinstance(leagues, list):
-            frames = []
-            for league in leagues:
-                url = f"{self.base_url}{league}/{entity}/{stat_type}"
-
-                response = self._execute_query(url, kwargs)
-
-                frames.append(response)
+        elif isinstance(leagues, (str, list)):
+            frames, errors = self._map_leagues(
+                lambda league: self._execute_query(
+                    f"{self.base_url}{league}/{entity}/{stat_type}", kwargs
+                ),
+                [leagues] if isinstance(leagues, str) else leagues,
+            )
             stats = concat(frames, ignore_index=True) if frames else DataFrame([])
-        return stats
+        return self._with_errors(
+            self._finish_stats(stats, f"{entity}/{stat_type}", flatten), errors
+        )
 
     def get_stadia(
         self,
@@ -469,9 +1900,9 @@ class AmericanSoccerAnalysis:
         Returns:
             DataFrame
         """
-        if self.stadia is None:
-            self.stadia = self._get_entity("stadia")
-        stadia = self._filter_entity(self.stadia, "stadia", leagues, ids, names)
+        stadia = self._filter_entity(
+            self._entity_lookup("stadium", leagues), "stadium", leagues, ids, names
+        )
         return stadia
 
     def get_referees(
@@ -490,9 +1921,9 @@ class AmericanSoccerAnalysis:
         Returns:
             DataFrame
         """
-        if self.referees is None:
-            self.referees = self._get_entity("referee")
-        referees = self._filter_entity(self.referees, "referee", leagues, ids, names)
+        referees = self._filter_entity(
+            self._entity_lookup("referee", leagues), "referee", leagues, ids, names
+        )
         return referees
 
     def get_managers(
@@ -511,9 +1942,9 @@ class AmericanSoccerAnalysis:
         Returns:
             DataFrame
         """
-        if self.managers is None:
-            self.managers = self._get_entity("manager")
-        managers = self._filter_entity(self.managers, "manager", leagues, ids, names)
+        managers = self._filter_entity(
+            self._entity_lookup("manager", leagues), "manager", leagues, ids, names
+        )
         return managers
 
     def get_teams(
@@ -532,9 +1963,9 @@ class AmericanSoccerAnalysis:
         Returns:
             DataFrame
         """
-        if self.teams is None:
-            self.teams = self._get_entity("team")
-        teams = self._filter_entity(self.teams, "team", leagues, ids, names)
+        teams = self._filter_entity(
+            self._entity_lookup("team", leagues), "team", leagues, ids, names
+        )
         return teams
 
     def get_players(
@@ -553,9 +1984,9 @@ class AmericanSoccerAnalysis:
         Returns:
             DataFrame
         """
-        if self.players is None:
-            self.players = self._get_entity("player")
-        players = self._filter_entity(self.players, "player", leagues, ids, names)
+        players = self._filter_entity(
+            self._entity_lookup("player", leagues), "player", leagues, ids, names
+        )
         return players
 
     def get_games(
@@ -582,43 +2013,374 @@ class AmericanSoccerAnalysis:
         Returns:
             DataFrame
         """
-        self._check_leagues(leagues)
-        self._check_ids_names(team_ids, team_names)
-
-        query: dict[str, str | list[str] | None] = {}
+        from pandas import DataFrame, concat
 
-        if game_ids:
-            query["game_id"] = game_ids
-        if team_names:
-            query["team_id"] = self._convert_names_to_ids("team", team_names)
-        if team_ids:
-            query["team_id"] = team_ids
-        if season_name:
-            query["season_name"] = season_name
-        if stages:
-            query["stage_name"] = stages
-        if status:
-            query["status"] = status
+        query = self._build_games_query(
+            leagues, game_ids, team_ids, team_names, season_name, stages, status
+        )
         if not leagues:
             leagues = self.LEAGUES
 
-        if isinstance(leagues, str):
+        errors: list[dict] = []
+        if isinstance(leagues, str) and not self.partial_results:
             games = DataFrame([])
             games_url = f"{self.base_url}{leagues}/games"
             response = self._execute_query(games_url, query)
 
             games = response
-        elif isinstance(leagues, list):
+        elif isinstance(leagues, (str, list)):
+            frames, errors = self._map_leagues(
+                lambda league: self._execute_query(
+                    f"{self.base_url}{league}/games", query
+                ),
+                [leagues] if isinstance(leagues, str) else leagues,
+            )
+            games = concat(frames, ignore_index=True) if frames else DataFrame([])
+        return self._with_errors(self._finish_games(games), errors)
+
+    def fetch_many(self, queries: list[str | dict]) -> dict[str, DataFrame]:
+        """Runs several stats and games queries as one batch.
+
+        Every query is expanded into one request per league, identical requests are
+        sent once, and the pages of every request share one pool of `max_workers`
+        threads, so the requests of different queries overlap instead of running one
+        query after another.
+
+        Args:
+            queries (list[str | dict]): the queries to run. Each one is either the name of a stats method or "get_games", or a dict holding that name under "method", the arguments of the method, and optionally the name of the result under "name", which defaults to the method name.
+
+        Returns:
+            dict[str, DataFrame]: the result of each query by name, the same as calling its method
+        """
+        from pandas import DataFrame, concat
+
+        plans = []
+        for name, method, arguments in self._parse_fetch_specs(queries):
+            args = dict(arguments.arguments)
+            leagues = args.pop("leagues")
+            if method == "get_games":
+                params = self._build_games_query(leagues, **args)
+                endpoint, flatten = "games", None
+            else:
+                entity, stat_type = self.STATS_METHODS[method]
+                kwargs = dict(args["kwargs"])
+                flatten = kwargs.pop("flatten", None)
+                self._check_flatten(flatten)
+                params = self._build_stats_query(leagues, stat_type, entity, kwargs)
+                endpoint = f"{entity}/{stat_type}"
+            leagues = leagues or self.LEAGUES
+            leagues = [leagues] if isinstance(leagues, str) else leagues
+            urls = [f"{self.base_url}{league}/{endpoint}" for league in leagues]
+            plans.append(
+                (name, endpoint, flatten, urls, self._canonical_params(params))
+            )
+
+        # Queries split by seasons or with too long a URL are sent in parts, see _split_query
+        chunk_keys: dict[Hashable, list[Hashable]] = {}
+        queries_by_key: dict[Hashable, tuple[str, dict[str, str]]] = {}
+        for _, _, _, urls, params in plans:
+            for url in urls:
+                chunk_keys[(url, tuple(params.items()))] = []
+                for chunk in self._split_query(url, params) or [params]:
+                    key = (url, tuple(chunk.items()))
+                    queries_by_key[key] = (url, chunk)
+                    chunk_keys[(url, tuple(params.items()))].append(key)
+        self.logger.info(
+            f"Fetching {len(plans)} queries with {len(queries_by_key)} distinct requests"
+        )
+        completed: set[str] = set()
+        with self._checkpoint_call(completed):
+            results, errors = self._run_batch(queries_by_key)
+        self._discard_checkpoint(completed, list(errors.values()))
+
+        output = {}
+        for name, endpoint, flatten, urls, params in plans:
             frames = []
-            for league in leagues:
-                games_url = f"{self.base_url}{league}/games"
-                response = self._execute_query(games_url, query)
+            query_errors = []
+            for url in urls:
+                keys = chunk_keys[(url, tuple(params.items()))]
+                failed = [errors[key] for key in keys if key in errors]
+                if failed:
+                    query_errors.append(failed[0])
+                elif len(keys) == 1:
+                    frames.append(results[keys[0]])
+                else:
+                    frames.append(self._merge_chunks([results[key] for key in keys]))
+            combined = concat(frames, ignore_index=True) if frames else DataFrame([])
+            if endpoint == "games":
+                result = self._finish_games(combined)
+            else:
+                result = self._finish_stats(combined, endpoint, flatten)
+            output[name] = self._with_errors(result, query_errors)
+        return output
 
-                frames.append(response)
-            games = concat(frames, ignore_index=True) if frames else DataFrame([])
-        if games.empty:
-            return games
-        return games.sort_values(by=["date_time_utc"], ascending=False)
+    def _run_batch(
+        self, queries: dict[Hashable, tuple[str, dict[str, str]]]
+    ) -> tuple[dict[Hashable, DataFrame], dict[Hashable, dict]]:
+        """Requests every page of several queries through one pool of `max_workers` threads.
+
+        The first page of every query is requested right away. Once a query returns
+        a full page, up to `page_window` of its following pages are kept in flight,
+        until a short page is found. With `partial_results`, a query stops at its
+        first failed page, and is reported instead of raising.
+
+        Args:
+            queries (dict[Hashable, tuple[str, dict[str, str]]]): the endpoint and normalized URL query strings of each query, by result cache key
+
+        Returns:
+            tuple[dict[Hashable, DataFrame], dict[Hashable, dict]]: the result of each query that succeeded, and a report of the failure of each other query, by result cache key
+        """
+        from pandas import concat
+        from requests import RequestException
+
+        results: dict[Hashable, DataFrame] = {}
+        errors: dict[Hashable, dict] = {}
+        pages: dict[Hashable, dict[int, DataFrame]] = {}
+        next_offsets: dict[Hashable, int] = {}
+        # query -> offset of its first short page, once returned
+        last_offsets: dict[Hashable, int] = {}
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            pending: dict[Future[DataFrame], tuple[Hashable, int]] = {}
+
+            def submit(key: Hashable, offset: int) -> None:
+                url, params = queries[key]
+                page_params = {**params, "offset": str(offset)} if offset else params
+                future = executor.submit(self._single_request, url, page_params)
+                pending[future] = (key, offset)
+
+            for key in queries:
+                cached = self.result_cache.get(key) if self.result_cache else None
+                if cached is not None:
+                    results[key] = cached
+                    continue
+                pages[key] = {}
+                next_offsets[key] = self.MAX_API_LIMIT
+                submit(key, 0)
+
+            try:
+                while pending:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        key, offset = pending.pop(future)
+                        if key in errors:
+                            continue
+                        try:
+                            page = future.result()
+                        except RequestException as error:
+                            if not self.partial_results:
+                                raise
+                            url, _ = queries[key]
+                            league = url.removeprefix(self.base_url).partition("/")[0]
+                            errors[key] = self._error_report(league, error)
+                            continue
+                        pages[key][offset] = page
+                        if len(page.index) < self.MAX_API_LIMIT:
+                            last_offsets[key] = min(
+                                offset, last_offsets.get(key, offset)
+                            )
+                            continue
+                        window_end = offset + self.page_window * self.MAX_API_LIMIT
+                        while (
+                            key not in last_offsets and next_offsets[key] <= window_end
+                        ):
+                            submit(key, next_offsets[key])
+                            next_offsets[key] += self.MAX_API_LIMIT
+            except BaseException:
+                for future in pending:
+                    future.cancel()
+                raise
+
+        for key, query_pages in pages.items():
+            if key in errors:
+                continue
+            # Pages requested past the first short page are empty, and dropped
+            frames = [
+                query_pages[offset]
+                for offset in sorted(query_pages)
+                if offset <= last_offsets[key]
+            ]
+            following = [frame for frame in frames[1:] if len(frame.index) > 0]
+            response = (
+                concat(frames[:1] + following, ignore_index=True)
+                if following
+                else frames[0]
+            )
+            self._complete_checkpoint(*queries[key])
+            if self.result_cache is not None:
+                self.result_cache.set(
+                    key, response, self._result_max_age(*queries[key])
+                )
+            results[key] = response
+        return results, errors
+
+    def publish_entities(
+        self, entity_store: str | os.PathLike | EntityStore | None = None
+    ) -> int:
+        """Loads the entity tables of every league from the API, and publishes them
+        as a new version of an `EntityStore`, shared by the processes attached to it.
+
+        Args:
+            entity_store (str | os.PathLike | EntityStore | None): the store to publish to. Defaults to None, the `entity_store` of the client.
+
+        Returns:
+            int: the version published
+        """
+        if entity_store is None:
+            entity_store = self.entity_store
+        if entity_store is None:
+            raise InvalidParameterFormatError(
+                "No entity store to publish to, pass one or create the client with entity_store."
+            )
+        if not isinstance(entity_store, EntityStore):
+            entity_store = EntityStore(entity_store)
+
+        tables = {}
+        for entity_type in self.ENTITY_TYPES:
+            table = self._get_entity(entity_type)
+            if table.attrs.pop("errors", None):
+                raise ASAError(
+                    f"Could not load every league of the {entity_type} table, nothing was published."
+                )
+            tables[entity_type] = table
+        version = entity_store.publish(tables)
+        self.logger.info(f"Published version {version} of the entity tables")
+        return version
+
+    def snapshot(
+        self,
+        directory: str | os.PathLike,
+        leagues: str | list[str] | None = None,
+        seasons: str | list[str] | None = None,
+    ) -> None:
+        """Saves entity tables, games and the results of every stats endpoint to a
+        directory, so they can be queried offline with `AmericanSoccerAnalysis(snapshot=directory)`.
+
+        Stats are saved both aggregated over the seasons and with `split_by_seasons=True`.
+        Offline, queries filtering by league, season, game, player or team are
+        answered the same as by the API; queries with other arguments, such as
+        `split_by_teams` or `minimum_minutes`, or filtering player stats by team,
+        raise a `SnapshotError`.
+        Requires the `pyarrow` package.
+
+        Args:
+            directory (str | os.PathLike): Directory the snapshot is saved in. Created if missing.
+            leagues (str | list[str] | None): leagues to save. Defaults to None, for all leagues.
+            seasons (str | list[str] | None): seasons to save games and stats of. Defaults to None, for all seasons.
+        """
+        from pandas import concat
+
+        self._check_season_name(seasons)
+        leagues = self._entity_leagues(leagues)
+        store = Snapshot(directory)
+
+        season_query = {"season_name": seasons} if seasons else {}
+        queries: list[tuple[str, list[str], dict]] = [
+            (plural_type, leagues, {})
+            for plural_type, _, _ in self.ENTITY_TYPES.values()
+        ]
+        queries.append(("games", leagues, season_query))
+        for entity, stat_type in dict.fromkeys(self.STATS_METHODS.values()):
+            stat_leagues = leagues
+            if stat_type == "salaries":
+                stat_leagues = [league for league in leagues if league == "mls"]
+            if not stat_leagues:
+                continue
+            # Game results are already one row per game
+            splits = [{}] if entity == "games" else [{}, {"split_by_seasons": True}]
+            for split in splits:
+                kwargs = {**split, **season_query}
+                queries.append(
+                    (
+                        f"{entity}/{stat_type}",
+                        stat_leagues,
+                        self._build_stats_query(
+                            stat_leagues, stat_type, entity, kwargs
+                        ),
+                    )
+                )
+
+        for endpoint, endpoint_leagues, params in queries:
+            self.logger.info(f"Saving {endpoint} to the snapshot")
+            params = self._canonical_params(params)
+            frames = self._map_concurrently(
+                lambda league, endpoint=endpoint, params=params: self._execute_query(
+                    f"{self.base_url}{league}/{endpoint}", params
+                ).assign(competition=league),
+                endpoint_leagues,
+            )
+            store.add(endpoint, params, concat(frames, ignore_index=True))
+        store.save_manifest(leagues)
+
+    def sync_games(
+        self,
+        directory: str | os.PathLike,
+        leagues: str | list[str] | None = None,
+    ) -> DataFrame:
+        """Get every game of the given leagues, keeping them up to date in a local store.
+
+        The first sync of a league downloads all of its games. Later syncs only fetch
+        the games of the latest season stored, games scheduled but not played yet, and
+        games of past seasons whose status could still change, then merge them into the
+        store. The result holds the same games as `get_games(leagues)`.
+
+        Args:
+            directory (str | os.PathLike): Directory the games are stored in.
+            leagues (str | list[str] | None): league abbreviation or a list of league abbreviations. Defaults to None.
+
+        Returns:
+            DataFrame
+        """
+        from pandas import DataFrame, concat
+
+        self._check_leagues(leagues)
+        if not leagues:
+            leagues = self.LEAGUES
+        leagues = [leagues] if isinstance(leagues, str) else leagues
+        store = GameStore(directory)
+
+        def sync(league: str) -> DataFrame:
+            url = f"{self.base_url}{league}/games"
+            watermark, stored = store.load(league)
+            if watermark is None:
+                games = self._fetch_records(url, {})
+            else:
+                refetched_ids = open_game_ids(stored, watermark)
+                updates = self._fetch_records(url, {"season_name": watermark})
+                updates += self._fetch_records(url, {"status": OPEN_GAME_STATUS})
+                for start in range(0, len(refetched_ids), self.MAX_SYNC_IDS):
+                    chunk = refetched_ids[start : start + self.MAX_SYNC_IDS]
+                    updates += self._fetch_records(url, {"game_id": chunk})
+                games = merge_games(stored, watermark, refetched_ids, updates)
+            store.save(league, games)
+            return DataFrame(games)
+
+        frames = self._map_concurrently(sync, leagues)
+        games = concat(frames, ignore_index=True) if frames else DataFrame([])
+        return self._finish_games(games)
+
+    def _fetch_records(
+        self, url: str, params: dict[str, str | list[str] | None]
+    ) -> list[dict]:
+        """Requests every page of a query from the API, bypassing the HTTP and result caches
+
+        Args:
+            url (str): the API endpoint to call
+            params (dict[str, str | list[str] | None]): URL query strings
+
+        Returns:
+            list[dict]: the records, as returned by the API
+        """
+        params = self._canonical_params(params)
+        records: list[dict] = []
+        while True:
+            page_params = {**params, "offset": str(len(records))} if records else params
+            page = self._get_result(
+                url, page_params, list, headers={"Cache-Control": "no-cache"}
+            )
+            records.extend(page)
+            if len(page) < self.MAX_API_LIMIT:
+                return records
 
     def get_player_xgoals(
         self, leagues: str | list[str] = LEAGUES, **kwargs
@@ -711,6 +2473,7 @@ class AmericanSoccerAnalysis:
             action_type (str | list[str]): Describes the goals added (g+) action type. Valid keywords include: 'Dribbling', 'Fouling', 'Interrupting', 'Passing', 'Receiving', and 'Shooting'. Accepts a string or list of strings.
             general_position (str | list[str]): Describes the most common position played by each player over the specified period of time. Valid keywords include: 'GK', 'CB', 'FB', 'DM', 'CM', 'AM', 'W', and 'ST'. Accepts a string or list of strings.
             above_replacement (bool): Logical indicator to compare players against replacement-level values. This will only return aggregated g+ values, rather than disaggregated g+ values by action type.
+            flatten (str): "long" for one row per action type, or "wide" for one column per action type and value, such as `Passing_goals_added_raw`. Defaults to the nested `data` column.
 
         Returns:
             DataFrame
@@ -801,6 +2564,7 @@ class AmericanSoccerAnalysis:
             stage_name (str | list[str]): Describes the stage of competition in which a game took place. Accepts a string or list of strings.
             action_type (str | list[str]): Describes the goals added (g+) action type. Valid keywords include: 'Dribbling', 'Fouling', 'Interrupting', 'Passing', 'Receiving', and 'Shooting'. Accepts a string or list of strings.
             above_replacement (bool): Logical indicator to compare players against replacement-level values. This will only return aggregated g+ values, rather than disaggregated g+ values by action type.
+            flatten (str): "long" for one row per action type, or "wide" for one column per action type and value, such as `Passing_goals_added_raw`. Defaults to the nested `data` column.
 
         Returns:
             DataFrame
@@ -885,6 +2649,7 @@ class AmericanSoccerAnalysis:
             action_type (str | list[str]): Describes the goals added (g+) action type. Valid keywords include: 'Dribbling', 'Fouling', 'Interrupting', 'Passing', 'Receiving', and 'Shooting'. Accepts a string or list of strings.
             zone (int | list[int]): Zone number on pitch. Zones 1-5 are the defensive-most zones, and zones 26-30 are the attacking-most zones. Accepts a number or list of numbers.
             gamestate_trunc (int | list[int]): Integer (score differential) value between -2 and 2, inclusive. Gamestates more extreme than -2 and 2 have been included with -2 and 2, respectively. Accepts a number or list of numbers.
+            flatten (str): "long" for one row per action type, or "wide" for one column per action type and value, such as `Passing_goals_added_for`. Defaults to the nested `data` column.
 
         Returns:
             DataFrame
@@ -940,3 +2705,44 @@ class AmericanSoccerAnalysis:
             leagues, stat_type="xgoals", entity="games", **kwargs
         )
         return game_xgoals
+
+    def iter_stats(
+        self,
+        entity: str,
+        stat_type: str,
+        leagues: str | list[str] = LEAGUES,
+        **kwargs,
+    ) -> Iterator[StatsPage]:
+        """Streams the results of a stats query one page at a time, instead of
+        building a single DataFrame. Leagues are queried one after the other, and
+        each page is requested only once the previous one has been consumed, or up
+        to `page_window` pages ahead.
+
+        Args:
+            entity (str): the type of entity the stats are about: "players", "goalkeepers", "teams" or "games"
+            stat_type (str): the type of stats: "xgoals", "xpass", "goals-added" or "salaries"
+            leagues (str | list[str]): Leagues on which to filter. Accepts a string or list of strings. Defaults to LEAGUES.
+
+        Keyword Args:
+            The keyword arguments of the matching `get_*` method, such as `get_player_xgoals`.
+
+        Returns:
+            Iterator[StatsPage]: the pages, each tagged with its league and offset
+        """
+        flatten = kwargs.pop("flatten", None)
+        self._check_flatten(flatten)
+        query = self._build_stats_query(leagues, stat_type, entity, kwargs)
+        leagues = [leagues] if isinstance(leagues, str) else list(leagues)
+
+        def pages() -> Iterator[StatsPage]:
+            completed: set[str] = set()
+            for league in leagues:
+                url = f"{self.base_url}{league}/{entity}/{stat_type}"
+                for offset, data in self._iter_pages(url, query, completed):
+                    if flatten:
+                        data = _flatten_goals_added(data, flatten)
+                    data = self._compact(data, f"{entity}/{stat_type}")
+                    yield StatsPage(league, offset, data)
+            self._discard_checkpoint(completed, [])
+
+        return pages()
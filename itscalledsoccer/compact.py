@@ -0,0 +1,113 @@
+import sys
+
+from pandas import DataFrame, Series, api, to_numeric
+
+# Low-cardinality columns shared by most endpoints, stored as categoricals
+CATEGORY_COLUMNS = (
+    "competition",
+    "team_id",
+    "general_position",
+    "position",
+    "season_name",
+    "stage_name",
+    "action_type",
+)
+# High-cardinality ids repeated across rows, interned so each id is stored once
+INTERNED_COLUMNS = ("player_id", "game_id")
+
+# endpoint -> extra categorical columns
+COMPACT_RULES: dict[str, tuple[str, ...]] = {
+    "players": ("nationality",),
+    "managers": ("nationality",),
+    "referees": ("nationality",),
+    "stadia": ("city", "province", "country"),
+    "games": (
+        "home_team_id",
+        "away_team_id",
+        "referee_id",
+        "stadium_id",
+        "home_manager_id",
+        "away_manager_id",
+    ),
+    "games/xgoals": ("home_team_id", "away_team_id"),
+    "players/salaries": ("mlspa_release",),
+}
+
+# entity endpoint -> id column holding one distinct value per row, left as is
+KEY_COLUMNS = {
+    "players": "player_id",
+    "teams": "team_id",
+    "managers": "manager_id",
+    "referees": "referee_id",
+    "stadia": "stadium_id",
+}
+
+
+def _downcast(column: Series) -> Series:
+    """Downcasts a numeric column to the smallest dtype holding every value exactly
+
+    Args:
+        column (Series): numeric column
+
+    Returns:
+        Series
+    """
+    if api.types.is_bool_dtype(column):
+        return column
+    if api.types.is_integer_dtype(column):
+        return to_numeric(column, downcast="integer")
+    if api.types.is_float_dtype(column):
+        downcast = column.astype("float32")
+        if downcast.astype(column.dtype).equals(column):
+            return downcast
+    return column
+
+
+def _intern(column: Series) -> Series:
+    """Interns the strings of an object column, so repeated ids share one object
+
+    Args:
+        column (Series): column of ids
+
+    Returns:
+        Series
+    """
+    if column.dtype != object:
+        # Arrow-backed strings are already stored in one buffer
+        return column
+    return column.map(lambda value: sys.intern(value) if type(value) is str else value)
+
+
+def compact_frame(frame: DataFrame, endpoint: str) -> DataFrame:
+    """Converts the columns of an API result to memory-compact dtypes.
+
+    Low-cardinality string columns become categoricals, numeric columns are
+    downcast when no value changes, and repeated ids are interned.
+
+    Args:
+        frame (DataFrame): API result
+        endpoint (str): the endpoint the result comes from, such as "players/xgoals"
+
+    Returns:
+        DataFrame
+    """
+    categories = CATEGORY_COLUMNS + COMPACT_RULES.get(endpoint, ())
+    compacted = {}
+    for name, column in frame.items():
+        if name == KEY_COLUMNS.get(endpoint):
+            compacted[name] = column
+        elif name in categories:
+            try:
+                compacted[name] = column.astype("category")
+            except TypeError:
+                # Nested values, such as lists, cannot be categories
+                compacted[name] = column
+        elif name in INTERNED_COLUMNS:
+            compacted[name] = _intern(column)
+        elif api.types.is_numeric_dtype(column):
+            compacted[name] = _downcast(column)
+        else:
+            compacted[name] = column
+    result = DataFrame(compacted, index=frame.index)
+    result.attrs = frame.attrs
+    return result
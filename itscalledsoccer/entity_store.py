@@ -0,0 +1,191 @@
+from __future__ import annotations
+
+import json
+import os
+import threading
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from itscalledsoccer.snapshot import decode_nested_columns, encode_nested_columns
+
+if TYPE_CHECKING:
+    from pandas import DataFrame, StringDtype
+
+
+class EntityStore:
+    """Entity tables shared by several processes through memory-mapped Arrow files.
+
+    One process publishes the tables with `AmericanSoccerAnalysis.publish_entities`,
+    and clients created with the same `entity_store` directory attach to them
+    read-only: the files are memory-mapped, so their pages are shared by every
+    process instead of each one holding its own copy. Every publication gets a new
+    version, made current by atomically replacing a small manifest, so readers
+    switch to a refreshed table on their next lookup. The files of the previous
+    version are kept for readers still using them.
+
+    String columns are read as Arrow-backed strings and numeric columns without
+    missing values as read-only arrays, both pointing into the mapped file. Columns
+    of nested records, such as the seasons of a player, stay JSON text in the shared
+    table, and are only decoded by `decode` for the rows a query returns. Requires
+    the `pyarrow` package.
+    """
+
+    MANIFEST = "entities.json"
+
+    def __init__(self, directory: str | os.PathLike) -> None:
+        """Class constructor
+
+        Args:
+            directory (str | os.PathLike): Directory the tables are stored in. Created if missing.
+        """
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            raise ImportError(
+                "EntityStore requires pyarrow, install it with "
+                'pip install "itscalledsoccer[arrow]"'
+            )
+        self.directory = Path(directory).expanduser()
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._version: int | None = None
+        self._tables: dict[str, DataFrame] = {}
+        self._json_columns: dict[str, list[str]] = {}
+
+    def _read_manifest(self) -> dict | None:
+        """Reads the manifest of the current version
+
+        Returns:
+            dict | None: the version and the file of each table, or None if nothing was published
+        """
+        try:
+            return json.loads((self.directory / self.MANIFEST).read_text())
+        except FileNotFoundError:
+            return None
+
+    def version(self) -> int | None:
+        """Returns the current version of the tables
+
+        Returns:
+            int | None: the version, or None if nothing was published
+        """
+        manifest = self._read_manifest()
+        return manifest["version"] if manifest else None
+
+    def publish(self, tables: dict[str, DataFrame]) -> int:
+        """Writes a new version of the tables and makes it current
+
+        Args:
+            tables (dict[str, DataFrame]): the table of each entity type, such as "player"
+
+        Returns:
+            int: the new version
+        """
+        import pyarrow
+        import pyarrow.ipc
+
+        manifest = self._read_manifest()
+        version = manifest["version"] + 1 if manifest else 1
+        entries = {}
+        for entity_type, table in tables.items():
+            encoded, json_columns = encode_nested_columns(table)
+            arrow_table = pyarrow.Table.from_pandas(encoded, preserve_index=False)
+            # Arrow-backed pandas strings use 64-bit offsets, so readers can map
+            # large strings without converting them
+            arrow_table = arrow_table.cast(
+                pyarrow.schema(
+                    [
+                        field.with_type(pyarrow.large_string())
+                        if pyarrow.types.is_string(field.type)
+                        else field
+                        for field in arrow_table.schema
+                    ]
+                )
+            )
+            filename = f"{entity_type}-{version}.arrow"
+            tmp = self.directory / f"{filename}.{os.getpid()}.tmp"
+            # Uncompressed, so readers can map the buffers without copying them
+            with (
+                pyarrow.OSFile(str(tmp), "wb") as sink,
+                pyarrow.ipc.new_file(sink, arrow_table.schema) as writer,
+            ):
+                writer.write_table(arrow_table)
+            os.replace(tmp, self.directory / filename)
+            entries[entity_type] = {"file": filename, "json_columns": json_columns}
+
+        path = self.directory / self.MANIFEST
+        tmp = path.with_suffix(f".{os.getpid()}.tmp")
+        tmp.write_text(json.dumps({"version": version, "tables": entries}))
+        os.replace(tmp, path)
+
+        for old in self.directory.glob("*.arrow"):
+            if int(old.stem.rpartition("-")[2]) < version - 1:
+                old.unlink(missing_ok=True)
+        return version
+
+    def get(self, entity_type: str) -> DataFrame | None:
+        """Returns the current table of an entity type, mapping its file on first use
+
+        Args:
+            entity_type (str): type of data, such as "player"
+
+        Returns:
+            DataFrame | None: the read-only table, or None if it was never published
+        """
+        manifest = self._read_manifest()
+        if manifest is None or entity_type not in manifest["tables"]:
+            return None
+        with self._lock:
+            if manifest["version"] != self._version:
+                self._version = manifest["version"]
+                self._tables = {}
+            table = self._tables.get(entity_type)
+            if table is None:
+                import pyarrow
+                import pyarrow.ipc
+
+                entry = manifest["tables"][entity_type]
+                source = pyarrow.memory_map(str(self.directory / entry["file"]), "r")
+                arrow_table = pyarrow.ipc.open_file(source).read_all()
+                strings = _arrow_string_dtype()
+                table = arrow_table.to_pandas(
+                    split_blocks=True,
+                    types_mapper={pyarrow.large_string(): strings}.get,
+                )
+                self._tables[entity_type] = table
+                self._json_columns[entity_type] = entry["json_columns"]
+            return table
+
+    def decode(self, entity_type: str, frame: DataFrame) -> DataFrame:
+        """Decodes the nested columns of rows of a table returned by `get`
+
+        Args:
+            entity_type (str): type of data, such as "player"
+            frame (DataFrame): rows of the table, such as those a query returns
+
+        Returns:
+            DataFrame: the rows, with lists and dicts in their nested columns
+        """
+        with self._lock:
+            json_columns = self._json_columns.get(entity_type, [])
+        # Columns that are no longer JSON text were decoded already
+        columns = [
+            column
+            for column in json_columns
+            if column in frame and frame[column].dtype != object
+        ]
+        return decode_nested_columns(frame, columns) if columns else frame
+
+
+def _arrow_string_dtype() -> StringDtype:
+    """Returns the pandas dtype of strings backed by Arrow arrays
+
+    Returns:
+        StringDtype: the default string dtype of pandas 3, where missing values are NaN, or the nullable string dtype of older versions
+    """
+    from pandas import StringDtype
+
+    try:
+        return StringDtype("pyarrow", na_value=float("nan"))
+    except TypeError:
+        return StringDtype("pyarrow")
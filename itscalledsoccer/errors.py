@@ -41,3 +41,7 @@ class InvalidSeasonError(ASAError):
     """Raised when a season is before 2013"""
 
     pass
+
+
+class SnapshotError(ASAError):
+    """Raised when a query cannot be answered from a local snapshot."""
@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+import threading
+from collections import Counter, deque
+from collections.abc import Callable
+from typing import TYPE_CHECKING, NamedTuple
+
+if TYPE_CHECKING:
+    from pandas import DataFrame
+
+
+class RequestEvent(NamedTuple):
+    """Measurements of a single HTTP call to the API, passed to `on_request_end` listeners
+
+    Attributes:
+        url_template (str): the endpoint called, with the league as a placeholder, such as "{league}/players/xgoals"
+        league (str): league abbreviation
+        offset (int): offset of the result page requested
+        status (int): HTTP status of the response
+        latency (float): number of seconds until the response was received
+        bytes_received (int): size of the decoded response body, in bytes
+        cache_hit (bool): whether the response was served by the HTTP cache
+        retries (int): number of times the request was retried
+        decode_time (float): number of seconds spent decoding the JSON body
+        build_time (float): number of seconds spent building the DataFrame from the decoded records
+    """
+
+    url_template: str
+    league: str
+    offset: int
+    status: int
+    latency: float
+    bytes_received: int
+    cache_hit: bool
+    retries: int
+    decode_time: float
+    build_time: float
+
+
+RequestListener = Callable[[RequestEvent], None]
+
+
+class MetricsAggregator:
+    """In-memory listener summarizing the HTTP calls made by a client.
+
+    Attach it with `on_request_end`, then call `summary` to get latency and timing
+    percentiles for each endpoint. Counts and totals cover every event, while only
+    the most recent events are kept, so that a long-running client does not grow
+    without bound: `max_events` overall in `events`, and as many per endpoint for
+    the percentiles.
+    """
+
+    PERCENTILES = (0.5, 0.9, 0.99)
+    TOTALS = ("requests", "errors", "cache_hits", "retries", "bytes_received")
+    TIMINGS = ("latency", "decode_time", "build_time")
+
+    def __init__(self, max_events: int = 10_000) -> None:
+        """Class constructor
+
+        Args:
+            max_events (int): Number of recent events kept, overall and per endpoint. Defaults to 10000.
+
+        Raises:
+            ValueError: if max_events is less than 1
+        """
+        if max_events < 1:
+            raise ValueError(f"max_events must be at least 1, got {max_events}")
+        self.max_events = max_events
+        self.events: deque[RequestEvent] = deque(maxlen=max_events)
+        self._totals: dict[str, Counter[str]] = {}
+        self._timings: dict[str, deque[tuple[float, float, float]]] = {}
+        self._lock = threading.Lock()
+
+    def __call__(self, event: RequestEvent) -> None:
+        """Records an event
+
+        Args:
+            event (RequestEvent): a finished HTTP call
+        """
+        with self._lock:
+            self.events.append(event)
+            totals = self._totals.setdefault(event.url_template, Counter())
+            totals.update(
+                requests=1,
+                errors=int(event.status >= 400),
+                cache_hits=int(event.cache_hit),
+                retries=event.retries,
+                bytes_received=event.bytes_received,
+            )
+            timings = self._timings.setdefault(
+                event.url_template, deque(maxlen=self.max_events)
+            )
+            timings.append((event.latency, event.decode_time, event.build_time))
+
+    def clear(self) -> None:
+        """Removes every recorded event"""
+        with self._lock:
+            self.events.clear()
+            self._totals.clear()
+            self._timings.clear()
+
+    def summary(self) -> DataFrame:
+        """Summarizes the recorded events for each endpoint
+
+        Returns:
+            DataFrame: one row per URL template, with the number of requests, errors, cache hits, retries and bytes received, and percentiles of the latency, JSON decode time and result build time of its most recent requests
+        """
+        from pandas import DataFrame
+
+        with self._lock:
+            totals = {
+                template: dict(counts) for template, counts in self._totals.items()
+            }
+            timings = [
+                (template, *timing)
+                for template, recent in self._timings.items()
+                for timing in recent
+            ]
+        summary = DataFrame.from_dict(
+            totals, orient="index", columns=list(self.TOTALS), dtype="int64"
+        ).sort_index()
+        summary.index.name = "url_template"
+        samples = DataFrame(timings, columns=["url_template", *self.TIMINGS])
+        grouped = samples.astype(dict.fromkeys(self.TIMINGS, "float64")).groupby(
+            "url_template", sort=True
+        )
+        for column in self.TIMINGS:
+            for q in self.PERCENTILES:
+                summary[f"{column}_p{round(q * 100)}"] = grouped[column].quantile(q)
+        return summary
@@ -0,0 +1,270 @@
+import math
+import os
+import sqlite3
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+
+# Statuses telling the client to slow down
+THROTTLE_STATUSES = (429, 503)
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """Converts a Retry-After header to a number of seconds
+
+    Args:
+        value (str | None): the header, either a number of seconds or an HTTP date
+
+    Returns:
+        float | None: seconds to wait, or None if the header is missing or invalid
+    """
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class _SQLiteBucket:
+    """Token bucket stored in a SQLite database, shared by every process using it"""
+
+    FILENAME = "itscalledsoccer-ratelimit.sqlite"
+
+    def __init__(self, directory: str | os.PathLike, rate: float, burst: int) -> None:
+        self.directory = Path(directory).expanduser()
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.path = self.directory / self.FILENAME
+        self.rate = rate
+        self.burst = burst
+        self._local = threading.local()
+        with self._transaction() as connection:
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS bucket ("
+                "id INTEGER PRIMARY KEY CHECK (id = 0), tokens REAL NOT NULL, "
+                "updated REAL NOT NULL, paused_until REAL NOT NULL)"
+            )
+            connection.execute(
+                "INSERT OR IGNORE INTO bucket VALUES (0, ?, ?, 0)", (burst, time.time())
+            )
+
+    def _connection(self) -> sqlite3.Connection:
+        """Returns the connection of the current thread, opening it on first use"""
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            # Transactions are opened explicitly, see _transaction
+            connection = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            self._local.connection = connection
+        return connection
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        """Opens a transaction holding the write lock from the start, so that reading
+        and updating the bucket cannot interleave with another process"""
+        connection = self._connection()
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            yield connection
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+        connection.execute("COMMIT")
+
+    def take(self) -> float:
+        """Takes a token if one is available
+
+        Returns:
+            float: 0 if a token was taken, else the number of seconds until one is available
+        """
+        with self._transaction() as connection:
+            tokens, updated, paused_until = connection.execute(
+                "SELECT tokens, updated, paused_until FROM bucket"
+            ).fetchone()
+            now = time.time()
+            if now < paused_until:
+                return paused_until - now
+            tokens = min(self.burst, tokens + (now - updated) * self.rate)
+            delay = 0.0 if tokens >= 1 else (1 - tokens) / self.rate
+            if not delay:
+                tokens -= 1
+            connection.execute(
+                "UPDATE bucket SET tokens = ?, updated = ?", (tokens, now)
+            )
+            return delay
+
+    def pause(self, seconds: float) -> None:
+        """Stops handing out tokens for a number of seconds
+
+        Args:
+            seconds (float): length of the pause
+        """
+        with self._transaction() as connection:
+            connection.execute(
+                "UPDATE bucket SET paused_until = MAX(paused_until, ?), tokens = 0",
+                (time.time() + seconds,),
+            )
+
+
+class RateLimiter:
+    """Client-side rate limiter shared by every request of a client.
+
+    Requests take a token from a bucket refilled at `rate` tokens per second, up to
+    `burst` tokens. The number of requests in flight is capped by an adaptive limit,
+    halved each time the API answers 429 or 503 and grown back by one for every
+    limit's worth of successful requests. A Retry-After header pauses every request
+    for the time it asks for.
+
+    Given a directory, the bucket and pauses are stored in a SQLite database there,
+    and shared by every process using that directory.
+    """
+
+    def __init__(
+        self,
+        rate: float = 10.0,
+        burst: int | None = None,
+        max_concurrency: int = 16,
+        min_concurrency: int = 1,
+        max_retries: int = 5,
+        directory: str | os.PathLike | None = None,
+    ) -> None:
+        """Class constructor
+
+        Args:
+            rate (float): Requests allowed per second, on average. Defaults to 10.
+            burst (int | None): Requests allowed at once after an idle period. Defaults to None, the rate rounded up.
+            max_concurrency (int): Maximum number of requests in flight. Defaults to 16.
+            min_concurrency (int): Number of requests in flight the adaptive limit never goes below. Defaults to 1.
+            max_retries (int): Number of times a throttled request is sent again. Defaults to 5.
+            directory (str | os.PathLike | None): Directory of a database sharing the bucket between processes. Defaults to None, shared by the threads of this process only.
+
+        Raises:
+            ValueError: if rate is not positive, burst is less than 1, or the concurrency limits leave no request in flight
+        """
+        # Any of these would make every request wait forever
+        if not rate > 0:
+            raise ValueError(f"rate must be positive, got {rate}")
+        if burst is not None and burst < 1:
+            raise ValueError(f"burst must be at least 1, got {burst}")
+        if not 1 <= min_concurrency <= max_concurrency:
+            raise ValueError(
+                "min_concurrency and max_concurrency must satisfy "
+                f"1 <= min_concurrency <= max_concurrency, got {min_concurrency} and {max_concurrency}"
+            )
+        self.rate = rate
+        self.burst = burst if burst is not None else max(1, math.ceil(rate))
+        self.max_concurrency = max_concurrency
+        self.min_concurrency = min_concurrency
+        self.max_retries = max_retries
+        self.concurrency = float(max_concurrency)
+        self.requests = 0
+        self.throttled = 0
+        self.waited = 0
+        self.wait_seconds = 0.0
+        self._in_flight = 0
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._condition = threading.Condition()
+        self._store = (
+            _SQLiteBucket(directory, rate, self.burst)
+            if directory is not None
+            else None
+        )
+
+    def acquire(self) -> None:
+        """Waits until a request can be sent, then counts it as in flight"""
+        start = time.monotonic()
+        blocked = False
+        with self._condition:
+            while self._in_flight >= int(self.concurrency):
+                blocked = True
+                self._condition.wait()
+            self._in_flight += 1
+        try:
+            while (delay := self._take()) > 0:
+                blocked = True
+                time.sleep(delay)
+        except BaseException:
+            self.release(None)
+            raise
+        with self._condition:
+            self.requests += 1
+            if blocked:
+                self.waited += 1
+                self.wait_seconds += time.monotonic() - start
+
+    def _take(self) -> float:
+        """Takes a token if one is available
+
+        Returns:
+            float: 0 if a token was taken, else the number of seconds until one is available
+        """
+        if self._store is not None:
+            return self._store.take()
+        with self._condition:
+            now = time.monotonic()
+            if now < self._paused_until:
+                return self._paused_until - now
+            self._tokens = min(
+                self.burst, self._tokens + (now - self._updated) * self.rate
+            )
+            self._updated = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return 0.0
+            return (1 - self._tokens) / self.rate
+
+    def release(self, status: int | None, retry_after: float | None = None) -> None:
+        """Marks a request as finished, and adapts the limits to its response
+
+        Args:
+            status (int | None): HTTP status of the response, or None if the request failed
+            retry_after (float | None): seconds asked for by a Retry-After header. Defaults to None.
+        """
+        with self._condition:
+            self._in_flight -= 1
+            if status in THROTTLE_STATUSES:
+                self.throttled += 1
+                self.concurrency = max(self.min_concurrency, self.concurrency / 2)
+            elif status is not None and status < 400:
+                self.concurrency = min(
+                    self.max_concurrency, self.concurrency + 1 / self.concurrency
+                )
+            self._condition.notify_all()
+        if status in THROTTLE_STATUSES:
+            self.pause(retry_after if retry_after is not None else 1 / self.rate)
+
+    def pause(self, seconds: float) -> None:
+        """Stops every request from being sent for a number of seconds
+
+        Args:
+            seconds (float): length of the pause
+        """
+        if self._store is not None:
+            self._store.pause(seconds)
+            return
+        with self._condition:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+            self._tokens = 0.0
+
+    def stats(self) -> dict[str, float]:
+        """Reports the limiter usage
+
+        Returns:
+            dict[str, float]: requests sent, throttled responses, requests that waited and the total seconds spent waiting, and the current concurrency limit
+        """
+        with self._condition:
+            return {
+                "requests": self.requests,
+                "throttled": self.throttled,
+                "waited": self.waited,
+                "wait_seconds": self.wait_seconds,
+                "concurrency_limit": int(self.concurrency),
+            }
@@ -0,0 +1,289 @@
+from __future__ import annotations
+
+import json
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from itscalledsoccer.errors import SnapshotError
+
+if TYPE_CHECKING:
+    from pandas import DataFrame, Series
+
+# URL query strings applied to the stored rows, and the columns each one matches
+ROW_FILTERS = {
+    "game_id": ("game_id",),
+    "player_id": ("player_id",),
+    "team_id": ("team_id", "home_team_id", "away_team_id"),
+    "season_name": ("season_name",),
+    "stage_name": ("stage_name",),
+    "status": ("status",),
+}
+
+# Endpoints whose rows each belong to one team, or to the two teams of a game
+TEAM_ROW_ENDPOINTS = ("teams", "games", "players/salaries")
+
+
+def _rows_split_by_team(endpoint: str, params: dict[str, str]) -> bool:
+    """Tells whether each row of an endpoint belongs to one team, so that filtering
+    the rows by team returns what the API returns for that team. Other stats are
+    totaled over every team of a player, unless split by teams.
+
+    Args:
+        endpoint (str): the endpoint queried, such as "players/xgoals"
+        params (dict[str, str]): normalized URL query strings
+
+    Returns:
+        bool
+    """
+    return (
+        any(
+            endpoint == prefix or endpoint.startswith(f"{prefix}/")
+            for prefix in TEAM_ROW_ENDPOINTS
+        )
+        or params.get("split_by_teams", "").lower() == "true"
+    )
+
+
+def _matches(column: Series, values: set[str]) -> Series:
+    """Flags the cells equal to one of the values, or holding one of them when the cell is a list
+
+    Args:
+        column (Series): the column to match
+        values (set[str]): the values to look for
+
+    Returns:
+        Series: a boolean mask
+    """
+    if column.dtype == object:
+        return column.map(
+            lambda cell: (
+                any(str(item) in values for item in cell)
+                if isinstance(cell, list)
+                else str(cell) in values
+            )
+        ).astype(bool)
+    return column.astype(str).isin(values)
+
+
+def encode_nested_columns(frame: DataFrame) -> tuple[DataFrame, list[str]]:
+    """Converts the columns holding lists or dicts to JSON text, so they can be stored as Arrow strings
+
+    Args:
+        frame (DataFrame): API results
+
+    Returns:
+        tuple[DataFrame, list[str]]: the converted results, and the names of the converted columns
+    """
+    columns = [
+        column
+        for column in frame.columns
+        if frame[column].dtype == object
+        and any(isinstance(cell, (list, dict)) for cell in frame[column])
+    ]
+    encoded = frame.assign(
+        **{
+            column: [
+                None if cell is None else json.dumps(cell) for cell in frame[column]
+            ]
+            for column in columns
+        }
+    )
+    return encoded, columns
+
+
+def decode_nested_columns(frame: DataFrame, columns: list[str]) -> DataFrame:
+    """Converts columns written by `encode_nested_columns` back to lists and dicts
+
+    Args:
+        frame (DataFrame): stored results
+        columns (list[str]): the names of the converted columns
+
+    Returns:
+        DataFrame
+    """
+    return frame.assign(
+        **{
+            column: [
+                json.loads(cell) if isinstance(cell, str) else None
+                for cell in frame[column]
+            ]
+            for column in columns
+        }
+    )
+
+
+class Snapshot:
+    """Local copy of API results, written by `AmericanSoccerAnalysis.snapshot`.
+
+    Each stored query is a Parquet file holding the results of every league, with a
+    `competition` column, and a manifest lists the queries stored for each endpoint.
+    A query is answered from a stored one with the same URL query strings, apart
+    from those in `ROW_FILTERS`, which are applied to the stored rows instead.
+    Columns of nested records are stored as JSON text, so results read back the
+    same as the API returned them.
+    """
+
+    MANIFEST = "manifest.json"
+
+    def __init__(self, directory: str | os.PathLike, max_results: int = 32) -> None:
+        """Class constructor
+
+        Args:
+            directory (str | os.PathLike): Directory the snapshot is stored in.
+            max_results (int): Number of filtered results kept in memory, so the pages of a result are filtered once. Defaults to 32.
+        """
+        self.directory = Path(directory).expanduser()
+        self.max_results = max_results
+        self._entries: dict[str, list[dict]] = {}
+        self._manifest: dict | None = None
+        self._tables: dict[str, DataFrame] = {}
+        self._results: OrderedDict[tuple, DataFrame] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def add(self, endpoint: str, params: dict[str, str], results: DataFrame) -> None:
+        """Stores the results of a query
+
+        Args:
+            endpoint (str): the endpoint queried, such as "players/xgoals"
+            params (dict[str, str]): normalized URL query strings of the query
+            results (DataFrame): results of every league, with a `competition` column
+        """
+        self.directory.mkdir(parents=True, exist_ok=True)
+        entries = self._entries.setdefault(endpoint, [])
+        filename = f"{endpoint.replace('/', '-')}-{len(entries)}.parquet"
+        stored, json_columns = encode_nested_columns(results)
+        stored.to_parquet(self.directory / filename, index=False)
+
+        season_name = params.get("season_name")
+        entries.append(
+            {
+                "file": filename,
+                "query": {k: v for k, v in params.items() if k not in ROW_FILTERS},
+                "seasons": season_name.split(",") if season_name else None,
+                "json_columns": json_columns,
+            }
+        )
+
+    def save_manifest(self, leagues: list[str]) -> None:
+        """Writes the manifest of the stored queries, completing the snapshot
+
+        Args:
+            leagues (list[str]): the leagues stored
+        """
+        manifest = {"leagues": leagues, "endpoints": self._entries}
+        path = self.directory / self.MANIFEST
+        tmp = path.with_suffix(f".{os.getpid()}.tmp")
+        tmp.write_text(json.dumps(manifest, indent=2))
+        os.replace(tmp, path)
+        with self._lock:
+            self._manifest = manifest
+
+    def manifest(self) -> dict:
+        """Reads the manifest of the snapshot
+
+        Returns:
+            dict: the leagues stored, and the queries stored for each endpoint
+        """
+        with self._lock:
+            if self._manifest is None:
+                path = self.directory / self.MANIFEST
+                if not path.exists():
+                    raise SnapshotError(f"No snapshot found in {self.directory}.")
+                self._manifest = json.loads(path.read_text())
+            return self._manifest
+
+    def _table(self, entry: dict) -> DataFrame:
+        """Reads a stored query, once
+
+        Args:
+            entry (dict): the manifest entry of the query
+
+        Returns:
+            DataFrame
+        """
+        with self._lock:
+            table = self._tables.get(entry["file"])
+            if table is None:
+                from pandas import read_parquet
+
+                table = decode_nested_columns(
+                    read_parquet(self.directory / entry["file"]),
+                    entry["json_columns"],
+                )
+                self._tables[entry["file"]] = table
+            return table
+
+    def query(self, league: str, endpoint: str, params: dict[str, str]) -> DataFrame:
+        """Answers a query from the stored results
+
+        Args:
+            league (str): league abbreviation
+            endpoint (str): the endpoint queried, such as "players/xgoals"
+            params (dict[str, str]): normalized URL query strings, without the offset
+
+        Returns:
+            DataFrame: the results of the league matching the query, as returned by the API
+        """
+        key = (league, endpoint, tuple(params.items()))
+        with self._lock:
+            if key in self._results:
+                self._results.move_to_end(key)
+                return self._results[key]
+
+        manifest = self.manifest()
+        if league not in manifest["leagues"]:
+            raise SnapshotError(f"The snapshot does not include {league}.")
+        options = {k: v for k, v in params.items() if k not in ROW_FILTERS}
+        entry = next(
+            (
+                entry
+                for entry in manifest["endpoints"].get(endpoint, [])
+                if entry["query"] == options
+            ),
+            None,
+        )
+        if entry is None:
+            raise SnapshotError(
+                f"The snapshot has no {endpoint} results for the query {options}."
+            )
+
+        filters = {k: set(v.split(",")) for k, v in params.items() if k in ROW_FILTERS}
+        if "team_id" in filters and not _rows_split_by_team(endpoint, params):
+            raise SnapshotError(
+                f"The {endpoint} results of the snapshot are totaled over every team "
+                "of a player, so they cannot be filtered by team_id."
+            )
+        seasons = filters.pop("season_name", None)
+        stored_seasons = set(entry["seasons"]) if entry["seasons"] else None
+        if seasons != stored_seasons:
+            if seasons is None or (
+                stored_seasons is not None and not seasons <= stored_seasons
+            ):
+                raise SnapshotError(
+                    f"The snapshot only includes the {', '.join(sorted(stored_seasons or []))} "
+                    f"seasons of {endpoint}, select some of them with season_name."
+                )
+            filters["season_name"] = seasons
+
+        table = self._table(entry)
+        mask = table["competition"] == league
+        for name, values in filters.items():
+            columns = [column for column in ROW_FILTERS[name] if column in table]
+            if not columns:
+                raise SnapshotError(
+                    f"The {endpoint} results of the snapshot cannot be filtered by {name}."
+                )
+            matched = _matches(table[columns[0]], values)
+            for column in columns[1:]:
+                matched |= _matches(table[column], values)
+            mask &= matched
+        result = table[mask].drop(columns="competition").reset_index(drop=True)
+
+        with self._lock:
+            self._results[key] = result
+            if len(self._results) > self.max_results:
+                self._results.popitem(last=False)
+        return result
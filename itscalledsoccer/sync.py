@@ -0,0 +1,120 @@
+import json
+import os
+from pathlib import Path
+
+# Game statuses that can no longer change
+FINAL_GAME_STATUSES = ("FullTime", "Abandoned")
+# Status of scheduled games, under which new games first appear
+OPEN_GAME_STATUS = "PreMatch"
+
+
+class GameStore:
+    """Local copy of the games of each league, as returned by the API.
+
+    Each league is stored in its own JSON file, together with its watermark: the
+    latest season stored, whose games are fetched again on every sync.
+    """
+
+    def __init__(self, directory: str | os.PathLike) -> None:
+        """Class constructor
+
+        Args:
+            directory (str | os.PathLike): Directory the games are stored in. Created if missing.
+        """
+        self.directory = Path(directory).expanduser()
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def path(self, league: str) -> Path:
+        """Returns the file the games of a league are stored in
+
+        Args:
+            league (str): league abbreviation
+
+        Returns:
+            Path
+        """
+        return self.directory / f"games-{league}.json"
+
+    def load(self, league: str) -> tuple[str | None, list[dict]]:
+        """Reads the stored games of a league
+
+        Args:
+            league (str): league abbreviation
+
+        Returns:
+            tuple[str | None, list[dict]]: the watermark and the games, or None and no games if nothing is stored
+        """
+        path = self.path(league)
+        if not path.exists():
+            return None, []
+        state = json.loads(path.read_text())
+        return state["watermark"], state["games"]
+
+    def save(self, league: str, games: list[dict]) -> str | None:
+        """Replaces the stored games of a league, and moves its watermark to their latest season
+
+        Args:
+            league (str): league abbreviation
+            games (list[dict]): the games, as returned by the API
+
+        Returns:
+            str | None: the new watermark
+        """
+        seasons = [str(g["season_name"]) for g in games if g.get("season_name")]
+        watermark = max(seasons) if seasons else None
+        path = self.path(league)
+        # Write to a temporary file first, so readers never see a partial file
+        tmp = path.with_suffix(f".{os.getpid()}.tmp")
+        tmp.write_text(json.dumps({"watermark": watermark, "games": games}))
+        os.replace(tmp, path)
+        return watermark
+
+
+def open_game_ids(games: list[dict], watermark: str | None) -> list[str]:
+    """Lists the stored games of past seasons whose status can still change
+
+    Args:
+        games (list[dict]): stored games
+        watermark (str | None): the latest season stored
+
+    Returns:
+        list[str]: game ids
+    """
+    return [
+        g["game_id"]
+        for g in games
+        if g.get("status") not in FINAL_GAME_STATUSES
+        and str(g.get("season_name")) != watermark
+    ]
+
+
+def merge_games(
+    stored: list[dict],
+    watermark: str | None,
+    refetched_ids: list[str],
+    updates: list[dict],
+) -> list[dict]:
+    """Merges freshly fetched games into the stored ones.
+
+    The games of the watermark season are replaced as a whole, refetched games
+    missing from the updates are dropped, and the other updates are added or replace
+    the stored game with the same id.
+
+    Args:
+        stored (list[dict]): stored games
+        watermark (str | None): the latest season stored, fetched again in full
+        refetched_ids (list[str]): ids of the stored games that were fetched again
+        updates (list[dict]): the fetched games
+
+    Returns:
+        list[dict]: the merged games, ordered by id
+    """
+    dropped = set(refetched_ids)
+    games = {
+        g["game_id"]: g
+        for g in stored
+        if str(g.get("season_name")) != watermark and g["game_id"] not in dropped
+    }
+    for game in updates:
+        games[game["game_id"]] = game
+    return [games[game_id] for game_id in sorted(games)]
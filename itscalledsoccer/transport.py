@@ -0,0 +1,287 @@
+from __future__ import annotations
+
+import abc
+import json
+import os
+import threading
+from collections import deque
+from http import HTTPStatus
+from pathlib import Path
+from time import perf_counter
+from typing import TYPE_CHECKING, NamedTuple
+from urllib.parse import urlsplit
+
+from itscalledsoccer.snapshot import ROW_FILTERS
+
+if TYPE_CHECKING:
+    import requests
+
+
+class TransportResponse(NamedTuple):
+    """Decoded response to a GET request sent by a `Transport`
+
+    Attributes:
+        status (int): HTTP status of the response
+        records (list | dict | None): the decoded JSON body, or None if the request failed
+        error (Exception | None): the error the client raises for a failed request, such as a `requests.HTTPError`
+        latency (float): number of seconds until the response was received
+        bytes_received (int): size of the response body, in bytes
+        cache_hit (bool): whether the response was served by an HTTP cache
+        retries (int): number of times the request was retried
+        decode_time (float): number of seconds spent decoding the JSON body
+    """
+
+    status: int
+    records: list | dict | None
+    error: Exception | None
+    latency: float
+    bytes_received: int
+    cache_hit: bool = False
+    retries: int = 0
+    decode_time: float = 0.0
+
+
+class Transport(abc.ABC):
+    """Sends the GET requests of a client and decodes their responses.
+
+    Subclasses implement `get`. A client calls it from several threads at once when
+    it queries leagues or result pages concurrently, so it must be thread-safe.
+    """
+
+    @abc.abstractmethod
+    def get(
+        self,
+        url: str,
+        params: dict[str, str | list[str] | None],
+        timeout: float,
+        headers: dict[str, str] | None = None,
+    ) -> TransportResponse:
+        """Sends a GET request and decodes its JSON response
+
+        Args:
+            url (str): the API endpoint to call
+            params (dict[str, str | list[str] | None]): URL query strings
+            timeout (float): number of seconds to wait for a response
+            headers (dict[str, str] | None): extra request headers. Defaults to None.
+
+        Returns:
+            TransportResponse
+        """
+
+
+class RequestsTransport(Transport):
+    """Sends requests through a `requests` session, the default transport of a client"""
+
+    def __init__(self, session: requests.Session) -> None:
+        """Class constructor
+
+        Args:
+            session (requests.Session): the session sending the requests, with its caching and retrying adapters
+        """
+        self.session = session
+
+    def get(
+        self,
+        url: str,
+        params: dict[str, str | list[str] | None],
+        timeout: float,
+        headers: dict[str, str] | None = None,
+    ) -> TransportResponse:
+        from requests import HTTPError
+
+        start = perf_counter()
+        response = self.session.get(
+            url=url, params=params, timeout=timeout, headers=headers
+        )
+        latency = perf_counter() - start
+        retry = getattr(response.raw, "retries", None)
+        measures = {
+            "status": response.status_code,
+            "latency": latency,
+            "bytes_received": len(response.content),
+            "cache_hit": getattr(response, "from_cache", False),
+            "retries": len(retry.history) if retry is not None else 0,
+        }
+        try:
+            response.raise_for_status()
+        except HTTPError as error:
+            return TransportResponse(records=None, error=error, **measures)
+
+        start = perf_counter()
+        records = response.json()
+        return TransportResponse(
+            records=records,
+            error=None,
+            decode_time=perf_counter() - start,
+            **measures,
+        )
+
+
+class MemoryTransport(Transport):
+    """Answers requests in-process from fixture records, without a network.
+
+    Fixtures are the records the API returns for an endpoint, either a dict keyed by
+    endpoint, such as "players/xgoals", or a directory of JSON files named after the
+    endpoint, such as `players_xgoals_payload.json` in `tests/mocks`. Records keyed
+    by league and endpoint, such as "mls/players", or stored in a subdirectory named
+    after a league, are served for that league only. Endpoints without records
+    answer 404.
+
+    Results are paged by `page_size` rows with the `offset` query string, and rows
+    are filtered by the query strings the API filters them by, such as `game_id`.
+    Every page is encoded to JSON and decoded again, so that decoding is still
+    measured when benchmarking the client without network latency. The path and
+    query strings of the latest `max_requests` requests are kept in `requests`.
+    """
+
+    API_PATH = "/api/v1/"
+
+    def __init__(
+        self,
+        fixtures: str | os.PathLike | dict[str, list],
+        page_size: int = 1000,
+        max_requests: int | None = 10_000,
+    ) -> None:
+        """Class constructor
+
+        Args:
+            fixtures (str | os.PathLike | dict[str, list]): Directory of fixture files, or the records of each endpoint.
+            page_size (int): Number of rows per result page, as `MAX_API_LIMIT` of the client. Defaults to 1000.
+            max_requests (int | None): Number of recent requests kept in `requests`. Use None to keep every request. Defaults to 10000.
+        """
+        if isinstance(fixtures, dict):
+            self.directory = None
+            self._records = dict(fixtures)
+        else:
+            self.directory = Path(fixtures).expanduser()
+            self._records = {}
+        self.page_size = page_size
+        self.requests: deque[tuple[str, dict[str, str]]] = deque(maxlen=max_requests)
+        self._lock = threading.Lock()
+
+    def clear_requests(self) -> None:
+        """Forgets the requests recorded so far"""
+        with self._lock:
+            self.requests.clear()
+
+    def records(self, league: str, endpoint: str) -> list | None:
+        """Returns the records served for an endpoint of a league
+
+        Args:
+            league (str): league abbreviation
+            endpoint (str): the endpoint, such as "players/xgoals"
+
+        Returns:
+            list | None: the records, or None if the endpoint has none
+        """
+        filename = f"{endpoint.replace('/', '_').replace('-', '_')}_payload.json"
+        with self._lock:
+            for key, path in (
+                (f"{league}/{endpoint}", Path(league, filename)),
+                (endpoint, Path(filename)),
+            ):
+                if key not in self._records and self.directory is not None:
+                    path = self.directory / path
+                    self._records[key] = (
+                        json.loads(path.read_text()) if path.exists() else None
+                    )
+                if self._records.get(key) is not None:
+                    return self._records[key]
+        return None
+
+    def get(
+        self,
+        url: str,
+        params: dict[str, str | list[str] | None],
+        timeout: float,
+        headers: dict[str, str] | None = None,
+    ) -> TransportResponse:
+        start = perf_counter()
+        query = {
+            key: ",".join(map(str, value)) if isinstance(value, list) else str(value)
+            for key, value in params.items()
+            if value is not None
+        }
+        _, _, path = urlsplit(url).path.partition(self.API_PATH)
+        league, _, endpoint = path.partition("/")
+        with self._lock:
+            self.requests.append((path, query))
+
+        records = self.records(league, endpoint) if endpoint else None
+        if records is None:
+            return TransportResponse(
+                status=404,
+                records=None,
+                error=_http_error(url, query, 404),
+                latency=perf_counter() - start,
+                bytes_received=0,
+            )
+
+        filters = {
+            key: set(value.split(","))
+            for key, value in query.items()
+            if key in ROW_FILTERS
+        }
+        if filters:
+            records = [record for record in records if _matches(record, filters)]
+        offset = int(query.get("offset", 0))
+        body = json.dumps(records[offset : offset + self.page_size]).encode()
+        latency = perf_counter() - start
+
+        start = perf_counter()
+        decoded = json.loads(body)
+        return TransportResponse(
+            status=200,
+            records=decoded,
+            error=None,
+            latency=latency,
+            bytes_received=len(body),
+            decode_time=perf_counter() - start,
+        )
+
+
+def _matches(record: dict, filters: dict[str, set[str]]) -> bool:
+    """Checks a record against the row filters of a query. Records without any of
+    the fields a filter matches are kept, the way the API ignores filters that do
+    not apply to an endpoint.
+
+    Args:
+        record (dict): a record returned by the API
+        filters (dict[str, set[str]]): the values allowed by each filter
+
+    Returns:
+        bool
+    """
+    for key, values in filters.items():
+        cells = [record[field] for field in ROW_FILTERS[key] if field in record]
+        if cells and not any(
+            str(item) in values
+            for cell in cells
+            for item in (cell if isinstance(cell, list) else [cell])
+        ):
+            return False
+    return True
+
+
+def _http_error(url: str, params: dict[str, str], status: int) -> requests.HTTPError:
+    """Builds the error `requests` raises for a failed request
+
+    Args:
+        url (str): the API endpoint called
+        params (dict[str, str]): URL query strings
+        status (int): HTTP status of the response
+
+    Returns:
+        requests.HTTPError
+    """
+    from requests import HTTPError, Request, Response
+
+    response = Response()
+    response.status_code = status
+    response.reason = HTTPStatus(status).phrase
+    response.request = Request("GET", url, params=params).prepare()
+    response.url = response.request.url
+    try:
+        response.raise_for_status()
+    except HTTPError as error:
+        return error
@@ -0,0 +1,163 @@
+"""Local stand-in for the ASA API serving the payloads in tests/mocks, built on the stdlib."""
+
+from __future__ import annotations
+
+import gzip
+import json
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from threading import Lock, Thread
+from typing import TYPE_CHECKING
+from urllib.parse import parse_qs, urlsplit
+
+if TYPE_CHECKING:
+    from typing_extensions import Self
+
+MOCKS_DIR = Path(__file__).parent / "mocks"
+
+
+class ReplayServer:
+    """Serves `/api/v1/{league}/{endpoint}` from `tests/mocks/{endpoint}_payload.json`.
+
+    Results are paginated with the `offset` query string, `page_size` rows at a time,
+    the same way the real API pages results by `MAX_API_LIMIT`. Query strings named in
+    `FILTERS` filter the records holding that field, like the API filters games.
+    `latency` seconds are waited before each response, to stand in for the network.
+    Status overrides are keyed by path, or by path and query string to fail a single
+    page. An override given as a list is used for that many requests, one status each,
+    and `retry_after` is sent as the Retry-After header of 429 and 503 responses.
+    """
+
+    FILTERS = ("game_id", "team_id", "season_name", "status")
+
+    def __init__(self, page_size: int = 1000, latency: float = 0.0) -> None:
+        self.page_size = page_size
+        self.latency = latency
+        self.gzip = False
+        self.chunked = False
+        self.status_overrides: dict[str, int | list[int]] = {}
+        self.retry_after: str | None = None
+        self.requests: list[tuple[str, dict[str, str]]] = []
+        self._lock = Lock()
+        self._payloads: dict[str, list] = {}
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread = Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/api/v1/"
+
+    def start(self) -> Self:
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> Self:
+        return self.start()
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.stop()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.requests.clear()
+        self.page_size = 1000
+        self.latency = 0.0
+        self.gzip = False
+        self.chunked = False
+        self.status_overrides.clear()
+        self.retry_after = None
+
+    def payload(self, endpoint: str) -> list | None:
+        """Returns the mock records for an endpoint such as `players` or `players/xgoals`"""
+        if endpoint not in self._payloads:
+            path = (
+                MOCKS_DIR
+                / f"{endpoint.replace('/', '_').replace('-', '_')}_payload.json"
+            )
+            if not path.exists():
+                return None
+            self._payloads[endpoint] = json.loads(path.read_text())
+        return self._payloads[endpoint]
+
+    def set_payload(self, endpoint: str, records: list) -> None:
+        """Replaces the records served for an endpoint"""
+        self._payloads[endpoint] = records
+
+    def _filter(self, records: list, query: dict[str, str]) -> list:
+        for key in self.FILTERS:
+            if key in query:
+                values = query[key].split(",")
+                records = [r for r in records if key not in r or str(r[key]) in values]
+        return records
+
+    def _handler_class(self) -> type[BaseHTTPRequestHandler]:
+        replay = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, format: str, *args: object) -> None:
+                pass
+
+            def do_GET(self) -> None:
+                parts = urlsplit(self.path)
+                query = {k: v[-1] for k, v in parse_qs(parts.query).items()}
+                with replay._lock:
+                    replay.requests.append((parts.path, query))
+                if replay.latency:
+                    time.sleep(replay.latency)
+
+                with replay._lock:
+                    status = replay.status_overrides.get(
+                        f"{parts.path}?{parts.query}",
+                        replay.status_overrides.get(parts.path),
+                    )
+                    if isinstance(status, list):
+                        status = status.pop(0) if status else None
+                segments = parts.path.strip("/").split("/")
+                records = (
+                    replay.payload("/".join(segments[3:]))
+                    if len(segments) > 3 and segments[:2] == ["api", "v1"]
+                    else None
+                )
+                if status is None and records is None:
+                    status = 404
+                if status is not None:
+                    self._send(status, json.dumps({"error": status}).encode())
+                    return
+
+                offset = int(query.get("offset", 0))
+                records = replay._filter(records or [], query)
+                page = records[offset : offset + replay.page_size]
+                self._send(200, json.dumps(page).encode())
+
+            def _send(self, status: int, body: bytes) -> None:
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                if replay.retry_after is not None and status in (429, 503):
+                    self.send_header("Retry-After", replay.retry_after)
+                if replay.gzip and "gzip" in self.headers.get("Accept-Encoding", ""):
+                    body = gzip.compress(body)
+                    self.send_header("Content-Encoding", "gzip")
+                if replay.chunked:
+                    self.send_header("Transfer-Encoding", "chunked")
+                    self.end_headers()
+                    for start in range(0, len(body), 512):
+                        chunk = body[start : start + 512]
+                        self.wfile.write(
+                            f"{len(chunk):x}\r\n".encode() + chunk + b"\r\n"
+                        )
+                    self.wfile.write(b"0\r\n\r\n")
+                else:
+                    self.send_header("Content-Length", str(len(body)))
+                    self.end_headers()
+                    self.wfile.write(body)
+
+        return Handler
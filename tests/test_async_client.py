@@ -0,0 +1,402 @@
+import asyncio
+import threading
+from time import perf_counter
+
+import pytest
+from cachecontrol.cache import DictCache
+from pandas import DataFrame
+from pytest import fixture
+from requests import HTTPError
+
+from itscalledsoccer import AmericanSoccerAnalysis, AsyncAmericanSoccerAnalysis
+from itscalledsoccer.errors import InvalidLeagueError, SalaryDataError
+from tests.replay_server import ReplayServer
+
+
+@fixture(scope="module")
+def server():
+    with ReplayServer() as replay:
+        yield replay
+
+
+@fixture
+def replay(server):
+    server.reset()
+    return server
+
+
+def run(replay, method: str, *args, **kwargs):
+    async def main():
+        async with AsyncAmericanSoccerAnalysis() as client:
+            client.base_url = replay.base_url
+            return await getattr(client, method)(*args, **kwargs)
+
+    return asyncio.run(main())
+
+
+class TestAsyncClient:
+    def test_get_player_xgoals(self, replay):
+        data = run(replay, "get_player_xgoals")
+        expected = replay.payload("players/xgoals")
+
+        assert isinstance(data, DataFrame)
+        assert len(data) == len(expected) * 7
+        assert {path for path, _ in replay.requests} == {
+            f"/api/v1/{league}/players/xgoals"
+            for league in AsyncAmericanSoccerAnalysis.LEAGUES
+        }
+
+    def test_get_team_goals_added_single_league(self, replay):
+        data = run(replay, "get_team_goals_added", leagues="mls", split_by_seasons=True)
+
+        assert len(data) == len(replay.payload("teams/goals-added"))
+        assert replay.requests == [
+            ("/api/v1/mls/teams/goals-added", {"split_by_seasons": "True"})
+        ]
+
+    def test_get_goalkeeper_goals_added_flatten_wide(self, replay):
+        data = run(replay, "get_goalkeeper_goals_added", leagues="mls", flatten="wide")
+
+        assert len(data) == len(replay.payload("goalkeepers/goals-added"))
+        assert "Claiming_goals_added_raw" in data.columns
+        assert replay.requests == [("/api/v1/mls/goalkeepers/goals-added", {})]
+
+    def test_get_stats_resolves_player_names(self, replay):
+        player = replay.payload("players")[0]
+
+        run(
+            replay,
+            "get_player_xgoals",
+            leagues="mls",
+            player_names=player["player_name"],
+        )
+
+        _, query = replay.requests[-1]
+        assert query["player_id"] == player["player_id"]
+
+    def test_get_games_sorted_by_date(self, replay):
+        games = run(replay, "get_games", leagues=["mls", "nwsl"], season_name="2020")
+
+        assert len(games) == 2 * len(replay.payload("games"))
+        assert list(games["date_time_utc"]) == sorted(
+            games["date_time_utc"], reverse=True
+        )
+        assert all(query == {"season_name": "2020"} for _, query in replay.requests)
+
+    def test_get_players_filters_by_league_and_ids(self, replay):
+        player_id = replay.payload("players")[0]["player_id"]
+
+        players = run(replay, "get_players", leagues="nwsl", ids=player_id)
+
+        assert list(players["player_id"]) == [player_id]
+        assert list(players["competition"]) == ["nwsl"]
+
+    def test_entities_loaded_only_for_requested_leagues(self, replay):
+        async def main():
+            async with AsyncAmericanSoccerAnalysis() as client:
+                client.base_url = replay.base_url
+                await client.get_players(leagues="nwsl")
+                await client.get_players(leagues=["nwsl", "mls"])
+                return client.players
+
+        assert asyncio.run(main()) is None
+        assert [path for path, _ in replay.requests] == [
+            "/api/v1/nwsl/players",
+            "/api/v1/mls/players",
+        ]
+
+    def test_get_stadia(self, replay):
+        stadia = run(replay, "get_stadia", leagues="mls")
+
+        assert len(stadia) == len(replay.payload("stadia"))
+
+    def test_pagination_keeps_order(self, replay):
+        replay.page_size = 10
+
+        async def main():
+            async with AsyncAmericanSoccerAnalysis(page_window=3) as client:
+                client.base_url = replay.base_url
+                client.MAX_API_LIMIT = 10
+                return await client.get_players(leagues="mls")
+
+        players = asyncio.run(main())
+        expected = [p["player_id"] for p in replay.payload("players")]
+
+        assert list(players["player_id"]) == expected
+        assert all(int(query.get("offset", 0)) < 100 for _, query in replay.requests)
+
+    def test_gzip_and_chunked_responses(self, replay):
+        replay.gzip = True
+        replay.chunked = True
+
+        data = run(replay, "get_team_xgoals", leagues="mls")
+
+        assert len(data) == len(replay.payload("teams/xgoals"))
+
+    def test_http_error_raised(self, replay):
+        replay.status_overrides["/api/v1/mls/players/xpass"] = 404
+
+        with pytest.raises(HTTPError, match="404"):
+            run(replay, "get_player_xpass", leagues="mls")
+
+    def test_connections_are_reused(self, replay):
+        async def main():
+            async with AsyncAmericanSoccerAnalysis(max_workers=1) as client:
+                client.base_url = replay.base_url
+                await client.get_team_xgoals()
+                return len(client._pool.client._transport._pool.connections)
+
+        assert asyncio.run(main()) == 1
+
+    def test_client_reused_across_event_loops(self, replay):
+        # One worker, so requests wait on the semaphore and bind it to the loop
+        client = AsyncAmericanSoccerAnalysis(max_workers=1, result_cache_bytes=0)
+        client.base_url = replay.base_url
+
+        async def main(leagues):
+            async with client:
+                return await client.get_team_xgoals(leagues=leagues)
+
+        first = asyncio.run(main(["mls", "nwsl"]))
+        second = asyncio.run(main(["uslc", "usl1"]))
+
+        assert len(first) == len(second) == 2 * len(replay.payload("teams/xgoals"))
+        assert len(replay.requests) == 4
+
+    def test_pages_requested_as_pages_finish(self):
+        events = []
+
+        async def single_request(url, params):
+            offset = int(params.get("offset", 0))
+            events.append(("start", offset))
+            # The third page is slow, the pages after it must not wait for it
+            await asyncio.sleep(0.2 if offset == 4 else 0.01)
+            events.append(("end", offset))
+            return DataFrame({"a": range(2 if offset < 8 else 1)})
+
+        async def main():
+            client = AsyncAmericanSoccerAnalysis(page_window=2)
+            client.MAX_API_LIMIT = 2
+            client._single_request = single_request
+            return [offset async for offset, _ in client._iter_pages("url", {})]
+
+        assert asyncio.run(main()) == [0, 2, 4, 6, 8]
+        assert events.index(("start", 6)) < events.index(("end", 4))
+
+    def test_responses_cached(self, replay, tmp_path):
+        events = []
+
+        async def main():
+            async with AsyncAmericanSoccerAnalysis(
+                result_cache_bytes=0, cache=tmp_path
+            ) as client:
+                client.base_url = replay.base_url
+                client.on_request_end(events.append)
+                first = await client.get_team_xgoals(leagues="mls")
+                second = await client.get_team_xgoals(leagues="mls")
+                return first, second
+
+        first, second = asyncio.run(main())
+
+        assert second.equals(first)
+        assert len(replay.requests) == 1
+        assert [event.cache_hit for event in events] == [False, True]
+
+    def test_cache_used_off_the_event_loop(self, replay):
+        threads = set()
+
+        class RecordingCache(DictCache):
+            def get(self, key):
+                threads.add(threading.get_ident())
+                return super().get(key)
+
+            def set(self, key, value, expires=None):
+                threads.add(threading.get_ident())
+                super().set(key, value, expires)
+
+        async def main():
+            async with AsyncAmericanSoccerAnalysis(cache=RecordingCache()) as client:
+                client.base_url = replay.base_url
+                await client.get_team_xgoals(leagues="mls")
+            return threading.get_ident()
+
+        loop_thread = asyncio.run(main())
+        assert threads and loop_thread not in threads
+
+    def test_cache_shared_with_sync_client(self, replay, tmp_path):
+        sync_client = AmericanSoccerAnalysis(result_cache_bytes=0, cache=tmp_path)
+        sync_client.base_url = replay.base_url
+        expected = sync_client.get_team_xgoals(leagues="mls")
+        replay.reset()
+
+        async def main():
+            async with AsyncAmericanSoccerAnalysis(cache=tmp_path) as client:
+                client.base_url = replay.base_url
+                return await client.get_team_xgoals(leagues="mls")
+
+        assert asyncio.run(main()).equals(expected)
+        assert replay.requests == []
+
+    def test_requests_sent_through_proxy(self, replay):
+        proxy = replay.base_url.removesuffix("/api/v1/")
+
+        async def main():
+            async with AsyncAmericanSoccerAnalysis(proxies={"http": proxy}) as client:
+                client.base_url = "http://asa.invalid/api/v1/"
+                return await client.get_team_xgoals(leagues="mls")
+
+        data = asyncio.run(main())
+
+        assert len(data) == len(replay.payload("teams/xgoals"))
+        assert [path for path, _ in replay.requests] == ["/api/v1/mls/teams/xgoals"]
+
+    def test_retry_after_date_honored(self, replay):
+        replay.status_overrides["/api/v1/mls/teams/xgoals"] = [503]
+        replay.retry_after = "Wed, 21 Oct 2015 07:28:00 GMT"
+
+        async def main():
+            async with AsyncAmericanSoccerAnalysis() as client:
+                client.base_url = replay.base_url
+                start = perf_counter()
+                await client.get_team_xgoals(leagues="mls")
+                return perf_counter() - start
+
+        # A date in the past means no wait, instead of the 0.5s backoff
+        assert asyncio.run(main()) < 0.5
+        assert len(replay.requests) == 2
+
+    def test_concurrency_is_bounded(self, replay):
+        in_flight = 0
+        peak = 0
+
+        async def main():
+            async with AsyncAmericanSoccerAnalysis(max_workers=2) as client:
+                client.base_url = replay.base_url
+                get = client._pool.get
+
+                async def tracked_get(url, params):
+                    nonlocal in_flight, peak
+                    in_flight += 1
+                    peak = max(peak, in_flight)
+                    await asyncio.sleep(0.01)
+                    try:
+                        return await get(url, params)
+                    finally:
+                        in_flight -= 1
+
+                client._pool.get = tracked_get
+                await client.get_player_xpass()
+
+        asyncio.run(main())
+        assert peak == 2
+
+    def test_validation_is_shared(self, replay):
+        with pytest.raises(InvalidLeagueError):
+            run(replay, "get_player_xgoals", leagues="epl")
+        with pytest.raises(SalaryDataError):
+            run(replay, "get_player_salaries", leagues="nwsl")
+        assert replay.requests == []
+
+    def test_iter_stats_yields_tagged_pages(self, replay):
+        replay.page_size = 10
+
+        async def main():
+            async with AsyncAmericanSoccerAnalysis(page_window=2) as client:
+                client.base_url = replay.base_url
+                client.MAX_API_LIMIT = 10
+                return [
+                    page
+                    async for page in client.iter_stats(
+                        "players", "xgoals", leagues="mls"
+                    )
+                ]
+
+        pages = asyncio.run(main())
+        expected = [p["player_id"] for p in replay.payload("players/xgoals")]
+
+        assert [page.offset for page in pages] == list(range(0, 60, 10))
+        assert all(page.league == "mls" for page in pages)
+        assert [i for page in pages for i in page.data["player_id"]] == expected
+
+    def test_concurrent_identical_queries_coalesced(self, replay):
+        async def main():
+            async with AsyncAmericanSoccerAnalysis(result_cache_bytes=0) as client:
+                client.base_url = replay.base_url
+                return await asyncio.gather(
+                    *(client.get_team_xgoals(leagues="mls") for _ in range(5))
+                )
+
+        results = asyncio.run(main())
+
+        assert len(replay.requests) == 1
+        assert all(result.equals(results[0]) for result in results)
+        assert len({id(result) for result in results}) == 5
+
+    def test_request_events_reported_to_listeners(self, replay):
+        replay.status_overrides["/api/v1/nwsl/teams/xgoals"] = 404
+        events = []
+
+        async def main():
+            async with AsyncAmericanSoccerAnalysis(max_workers=1) as client:
+                client.base_url = replay.base_url
+                client.on_request_end(events.append)
+                await client.get_team_xgoals(leagues="mls")
+                with pytest.raises(HTTPError):
+                    await client.get_team_xgoals(leagues="nwsl")
+
+        asyncio.run(main())
+
+        assert [(e.url_template, e.league, e.status) for e in events] == [
+            ("{league}/teams/xgoals", "mls", 200),
+            ("{league}/teams/xgoals", "nwsl", 404),
+        ]
+        assert events[0].bytes_received > 0 and events[0].build_time > 0
+
+    def test_fetch_many(self, replay):
+        results = run(
+            replay,
+            "fetch_many",
+            [
+                {"method": "get_team_xgoals", "leagues": ["mls", "nwsl"]},
+                {"name": "mls", "method": "get_team_xgoals", "leagues": "mls"},
+                {"method": "get_games", "leagues": "mls"},
+            ],
+        )
+
+        assert list(results) == ["get_team_xgoals", "mls", "get_games"]
+        assert len(results["mls"]) == len(replay.payload("teams/xgoals"))
+        assert sorted(path for path, _ in replay.requests) == [
+            "/api/v1/mls/games",
+            "/api/v1/mls/teams/xgoals",
+            "/api/v1/nwsl/teams/xgoals",
+        ]
+
+    def test_long_id_lists_split_into_chunks(self, replay):
+        game_ids = [game["game_id"] for game in replay.payload("games")]
+
+        async def main():
+            async with AsyncAmericanSoccerAnalysis() as client:
+                client.base_url = replay.base_url
+                client.MAX_URL_LENGTH = 250
+                client.ID_CHUNK_SIZE = 4
+                return await client.get_games(leagues="mls", game_ids=game_ids)
+
+        games = asyncio.run(main())
+
+        assert sorted(games["game_id"]) == sorted(game_ids)
+        assert len(replay.requests) > 1
+
+    def test_season_queries_sharded(self, replay):
+        async def main():
+            async with AsyncAmericanSoccerAnalysis(shard_seasons=True) as client:
+                client.base_url = replay.base_url
+                return await client.get_team_xgoals(
+                    leagues="mls", season_name=["2020", "2021"], split_by_seasons=True
+                )
+
+        asyncio.run(main())
+
+        assert sorted(query["season_name"] for _, query in replay.requests) == [
+            "2020",
+            "2021",
+        ]
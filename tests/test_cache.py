@@ -0,0 +1,298 @@
+import json
+import math
+import multiprocessing
+import sqlite3
+import time
+from threading import Thread
+from unittest.mock import patch
+
+from pandas import DataFrame
+from pytest import fixture
+
+from itscalledsoccer.cache import PageCheckpoint, ResultCache, SQLiteCache
+from itscalledsoccer.client import AmericanSoccerAnalysis
+from tests.replay_server import ReplayServer
+
+
+def write_entries(directory, worker):
+    cache = SQLiteCache(directory)
+    for i in range(50):
+        cache.set(f"{worker}-{i}", b"x" * 100)
+    cache.close()
+
+
+@fixture
+def cache(tmp_path):
+    cache = SQLiteCache(tmp_path)
+    yield cache
+    cache.close()
+
+
+class TestSQLiteCache:
+    def test_set_get_delete(self, cache):
+        cache.set("key", b"value")
+        assert cache.get("key") == b"value"
+
+        cache.delete("key")
+        assert cache.get("key") is None
+
+    def test_database_created_in_directory(self, tmp_path):
+        SQLiteCache(tmp_path / "nested")
+        assert (tmp_path / "nested" / SQLiteCache.FILENAME).exists()
+
+    def test_wal_mode(self, cache):
+        (mode,) = cache._connection().execute("PRAGMA journal_mode").fetchone()
+        assert mode == "wal"
+
+    def test_hit_miss_counts(self, cache):
+        cache.set("key", b"value")
+        cache.get("key")
+        cache.get("key")
+        cache.get("missing")
+
+        stats = cache.stats()
+        assert stats["hits"] == 2
+        assert stats["misses"] == 1
+        assert stats["entries"] == 1
+        assert stats["size_bytes"] == 5
+
+    def test_lru_eviction(self, tmp_path):
+        cache = SQLiteCache(tmp_path, max_bytes=30)
+        # Every step is past the interval after which reads record their access
+        steps = range(0, 100 * SQLiteCache.ACCESS_INTERVAL, SQLiteCache.ACCESS_INTERVAL)
+        with patch("itscalledsoccer.cache.time.time", side_effect=steps):
+            cache.set("a", b"a" * 10)
+            cache.set("b", b"b" * 10)
+            cache.set("c", b"c" * 10)
+            cache.get("a")
+            cache.set("d", b"d" * 10)
+
+        assert cache.get("b") is None
+        assert cache.get("a") is not None
+        assert cache.get("c") is not None
+        assert cache.get("d") is not None
+        assert cache.stats()["size_bytes"] <= 30
+
+    def test_recent_access_not_recorded_again(self, cache):
+        def accessed():
+            return (
+                cache._connection()
+                .execute("SELECT accessed FROM responses WHERE key = 'key'")
+                .fetchone()[0]
+            )
+
+        cache.set("key", b"value")
+        stored = accessed()
+        cache.get("key")
+        assert accessed() == stored
+
+        with patch(
+            "itscalledsoccer.cache.time.time",
+            return_value=stored + SQLiteCache.ACCESS_INTERVAL,
+        ):
+            cache.get("key")
+        assert accessed() == stored + SQLiteCache.ACCESS_INTERVAL
+
+    def test_total_size_kept_up_to_date(self, cache):
+        cache.set("a", b"a" * 10)
+        cache.set("b", b"b" * 20)
+        cache.set("a", b"a" * 5)
+        cache.delete("b")
+        cache.set("c", b"c" * 7)
+        assert cache.stats()["size_bytes"] == 12
+
+        cache.clear()
+        assert cache.stats()["size_bytes"] == 0
+
+    def test_total_size_of_existing_database(self, tmp_path):
+        # A database written before the total size was kept
+        with sqlite3.connect(tmp_path / SQLiteCache.FILENAME) as connection:
+            connection.execute(
+                "CREATE TABLE responses (key TEXT PRIMARY KEY, value BLOB NOT NULL, "
+                "size INTEGER NOT NULL, accessed REAL NOT NULL)"
+            )
+            connection.execute("INSERT INTO responses VALUES ('a', 'aaa', 3, 0)")
+        connection.close()
+
+        cache = SQLiteCache(tmp_path)
+        cache.set("b", b"bb")
+        assert cache.stats()["size_bytes"] == 5
+
+    def test_shared_between_instances(self, tmp_path):
+        SQLiteCache(tmp_path).set("key", b"value")
+        assert SQLiteCache(tmp_path).get("key") == b"value"
+
+    def test_concurrent_threads(self, cache):
+        threads = [
+            Thread(target=write_entries, args=(cache.directory, worker))
+            for worker in range(8)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert cache.stats()["entries"] == 400
+
+    def test_concurrent_processes(self, cache):
+        context = multiprocessing.get_context("spawn")
+        processes = [
+            context.Process(target=write_entries, args=(cache.directory, worker))
+            for worker in range(4)
+        ]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join()
+
+        assert all(process.exitcode == 0 for process in processes)
+        assert cache.stats()["entries"] == 200
+
+
+class TestResultCache:
+    def test_returns_copies(self):
+        cache = ResultCache()
+        result = DataFrame({"a": [1, 2]})
+        cache.set("key", result)
+        result.loc[0, "a"] = 10
+
+        cached = cache.get("key")
+        cached.loc[1, "a"] = 20
+
+        assert cache.get("key")["a"].tolist() == [1, 2]
+
+    def test_lru_eviction(self):
+        frame = DataFrame({"a": range(100)})
+        size = int(frame.memory_usage(index=True, deep=True).sum())
+        cache = ResultCache(max_bytes=2 * size)
+        cache.set("a", frame)
+        cache.set("b", frame)
+        cache.get("a")
+        cache.set("c", frame)
+
+        assert cache.get("b") is None
+        assert cache.get("a") is not None
+        assert cache.get("c") is not None
+        assert cache.stats()["size_bytes"] == 2 * size
+
+    def test_oversized_results_not_stored(self):
+        cache = ResultCache(max_bytes=10)
+        cache.set("key", DataFrame({"a": range(100)}))
+
+        assert cache.stats()["entries"] == 0
+
+    def test_expired_results_dropped(self):
+        cache = ResultCache(max_age=60)
+        with patch("itscalledsoccer.cache.time.monotonic", side_effect=[0, 30, 61]):
+            cache.set("key", DataFrame({"a": [1]}))
+            assert cache.get("key") is not None
+            assert cache.get("key") is None
+
+        assert cache.stats() == {"hits": 1, "misses": 1, "entries": 0, "size_bytes": 0}
+
+    def test_results_without_expiry_kept(self):
+        cache = ResultCache(max_age=60)
+        with patch("itscalledsoccer.cache.time.monotonic", side_effect=[0, 0, 10**9]):
+            cache.set("key", DataFrame({"a": [1]}), max_age=math.inf)
+            cache.set("other", DataFrame({"a": [1]}))
+            assert cache.get("key") is not None
+
+
+class TestPageCheckpoint:
+    def test_pages_saved_by_query(self, tmp_path):
+        checkpoint = PageCheckpoint(tmp_path)
+        records = [{"a": 1, "b": [1.5, None]}, {"a": 2}]
+        checkpoint.set("https://example.com/mls/games", {"offset": "10"}, records)
+
+        assert checkpoint.get("https://example.com/mls/games", {"offset": "10"}) == (
+            records
+        )
+        assert checkpoint.get("https://example.com/mls/games", {}) is None
+        assert (
+            PageCheckpoint(tmp_path).get(
+                "https://example.com/mls/games", {"offset": "10"}
+            )
+            == records
+        )
+        path = checkpoint.path("https://example.com/mls/games", {"offset": "10"})
+        assert json.loads(path.read_text()) == records
+
+    def test_completed_queries_discarded(self, tmp_path):
+        checkpoint = PageCheckpoint(tmp_path)
+        checkpoint.set("url", {"season_name": "2024"}, [{"a": 1}])
+        checkpoint.set("url", {"season_name": "2024", "offset": "1000"}, [{"a": 2}])
+        checkpoint.set("url", {"season_name": "2025"}, [{"a": 3}])
+
+        name = checkpoint.complete("url", {"season_name": "2024", "offset": "1000"})
+        assert checkpoint.complete("url", {"season_name": "2026"}) is None
+        assert checkpoint.get("url", {"season_name": "2024"}) == [{"a": 1}]
+        checkpoint.discard_completed({name})
+
+        assert checkpoint.get("url", {"season_name": "2024"}) is None
+        assert checkpoint.get("url", {"season_name": "2025"}) == [{"a": 3}]
+        assert len(list(tmp_path.iterdir())) == 1
+
+    def test_expired_pages_ignored(self, tmp_path):
+        checkpoint = PageCheckpoint(tmp_path, max_age=60)
+        checkpoint.set("url", {}, [{"a": 1}])
+
+        with patch("itscalledsoccer.cache.time.time", return_value=time.time() + 61):
+            assert checkpoint.get("url", {}) is None
+        assert checkpoint.get("url", {}) == [{"a": 1}]
+
+    def test_clear(self, tmp_path):
+        checkpoint = PageCheckpoint(tmp_path)
+        checkpoint.set("url", {}, [{"a": 1}])
+        checkpoint.clear()
+
+        assert checkpoint.get("url", {}) is None
+        assert list(tmp_path.iterdir()) == []
+
+
+class TestClientCache:
+    @patch("itscalledsoccer.client.AmericanSoccerAnalysis._get_entity")
+    def test_default_cache_in_memory(self, mock_entity):
+        client = AmericanSoccerAnalysis()
+        assert not isinstance(client.cache, SQLiteCache)
+
+    @patch("itscalledsoccer.client.AmericanSoccerAnalysis._get_entity")
+    def test_cache_directory(self, mock_entity, tmp_path):
+        client = AmericanSoccerAnalysis(cache=tmp_path)
+        assert isinstance(client.cache, SQLiteCache)
+        assert client.cache.directory == tmp_path
+
+    def test_responses_cached_across_clients(self, tmp_path):
+        with ReplayServer() as replay:
+            for _ in range(2):
+                client = AmericanSoccerAnalysis(cache=str(tmp_path))
+                client.base_url = replay.base_url
+                data = client.get_team_xgoals(leagues="mls")
+                assert len(data) == len(replay.payload("teams/xgoals"))
+
+        assert len(replay.requests) == 1
+        assert client.cache.stats()["hits"] == 1
+
+    def test_equivalent_queries_share_results(self):
+        with ReplayServer() as replay:
+            client = AmericanSoccerAnalysis()
+            client.base_url = replay.base_url
+            first = client.get_player_xgoals(
+                leagues="mls", season_name=["2024", "2023"], split_by_seasons=True
+            )
+            first.loc[0, "goals"] = -1
+            second = client.get_player_xgoals(
+                leagues="mls", split_by_seasons=True, season_name=["2023", "2024"]
+            )
+
+        assert replay.requests == [
+            (
+                "/api/v1/mls/players/xgoals",
+                {"season_name": "2023,2024", "split_by_seasons": "True"},
+            )
+        ]
+        assert second.loc[0, "goals"] != -1
+        assert client.result_cache.stats()["hits"] == 1
+
+    def test_result_cache_disabled(self):
+        client = AmericanSoccerAnalysis(result_cache_bytes=0)
+        assert client.result_cache is None
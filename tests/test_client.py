@@ -1,11 +1,24 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+from email.utils import parsedate_to_datetime
 from pathlib import Path
-from unittest.mock import patch
+from threading import Barrier, Lock, current_thread
+from unittest.mock import ANY, Mock, patch
+from urllib.parse import urlencode
 
 import pytest
-from pandas import DataFrame, read_json
+from pandas import DataFrame, concat, read_json
 from pytest import fixture
-
-from itscalledsoccer.client import AmericanSoccerAnalysis
+from rapidfuzz import fuzz, process
+from requests import HTTPError, Session
+
+from itscalledsoccer.client import (
+    AmericanSoccerAnalysis,
+    StatsPage,
+    _flatten_goals_added,
+    _NameIndex,
+)
 from itscalledsoccer import AmericanSoccerAnalysis as ASAFromPackage
 from itscalledsoccer.errors import (
     ConflictingParametersError,
@@ -14,6 +27,9 @@ from itscalledsoccer.errors import (
     InvalidSeasonError,
     SalaryDataError,
 )
+from itscalledsoccer.events import MetricsAggregator, RequestEvent
+from itscalledsoccer.transport import MemoryTransport, Transport, TransportResponse
+from tests.replay_server import MOCKS_DIR, ReplayServer
 
 
 @fixture(scope="session")
@@ -85,13 +101,15 @@ class TestClient:
         assert client2.logger.getEffectiveLevel() == 40
         assert client3.logger.getEffectiveLevel() == 20
 
-    @patch("itscalledsoccer.client.HTTPAdapter")
+    @patch("itscalledsoccer.adapter.PooledCacheAdapter")
     @patch("itscalledsoccer.client.AmericanSoccerAnalysis._get_entity")
     def test_retry_strategy_configuration(self, mock_entity, mock_http_adapter_class):
-        with patch("itscalledsoccer.client.Retry") as mock_retry_class:
+        with patch("urllib3.util.retry.Retry") as mock_retry_class:
             mock_retry_instance = mock_retry_class.return_value
             
             self.client = AmericanSoccerAnalysis()
+            # The session is created on first use
+            _ = self.client.session
             
             # Verify Retry was instantiated with correct parameters
             mock_retry_class.assert_called_once_with(
@@ -99,10 +117,93 @@ class TestClient:
                 backoff_factor=0.5,
                 status_forcelist=[429, 500, 502, 503, 504],
                 allowed_methods=["GET"],
+                raise_on_status=False,
+                respect_retry_after_header=True,
             )
             
-            # Verify HTTPAdapter was instantiated with the retry strategy
-            mock_http_adapter_class.assert_called_once_with(max_retries=mock_retry_instance)
+            # Verify the adapter was instantiated with the retry strategy
+            mock_http_adapter_class.assert_called_once_with(
+                self.client.cache,
+                heuristic=ANY,
+                max_retries=mock_retry_instance,
+                pool_connections=10,
+                pool_maxsize=10,
+                pool_block=False,
+                keep_alive=True,
+                keep_alive_idle=60,
+                rate_limiter=None,
+            )
+
+    @patch("itscalledsoccer.client.AmericanSoccerAnalysis._get_entity")
+    def test_retry_strategy_mounted(self, mock_entity):
+        self.client = AmericanSoccerAnalysis()
+
+        adapter = self.client.session.get_adapter(
+            "https://app.americansocceranalysis.com"
+        )
+        assert adapter.max_retries.total == 3
+
+    @patch("itscalledsoccer.client.AmericanSoccerAnalysis._get_entity")
+    def test_session_replaced(self, mock_entity):
+        self.client = AmericanSoccerAnalysis()
+        default = self.client.session
+        _ = self.client.transport
+
+        # A session without a caching adapter, such as one set up by the application
+        session = Session()
+        self.client.session = session
+
+        assert self.client.session is session
+        assert self.client.transport.session is session
+        assert self.client.adapter is None
+        assert self.client.cache is None
+        assert self.client.pool_stats() == {}
+
+        self.client.session = default
+        assert self.client.adapter is default.get_adapter(self.client.base_url)
+        assert self.client.cache is self.client.adapter.cache
+
+    @patch("itscalledsoccer.client.AmericanSoccerAnalysis._get_entity")
+    def test_pool_sized_for_fan_out(self, mock_entity):
+        self.client = AmericanSoccerAnalysis(max_workers=7, page_window=4)
+        assert self.client.pool_stats()["pool_maxsize"] == 28
+
+        self.client = AmericanSoccerAnalysis(pool_maxsize=3, pool_block=True)
+        assert self.client.adapter.poolmanager.connection_pool_kw["maxsize"] == 3
+        assert self.client.adapter.poolmanager.connection_pool_kw["block"]
+
+    def test_pool_stats_count_reused_connections(self):
+        with ReplayServer() as replay:
+            self.client = AmericanSoccerAnalysis(max_workers=1)
+            self.client.base_url = replay.base_url
+            self.client.get_team_xgoals(leagues=["mls", "nwsl", "uslc"])
+
+        stats = self.client.pool_stats()
+        assert stats["opened"] == 1
+        assert stats["reused"] == 2
+        assert stats["waited"] == stats["discarded"] == 0
+
+    def test_pool_stats_without_keep_alive(self):
+        with ReplayServer() as replay:
+            self.client = AmericanSoccerAnalysis(max_workers=1, keep_alive=False)
+            self.client.base_url = replay.base_url
+            self.client.get_team_xgoals(leagues=["mls", "nwsl"])
+
+        assert self.client.pool_stats()["opened"] == 2
+        assert self.client.pool_stats()["reused"] == 0
+
+    def test_blocking_pool_never_opens_extra_connections(self):
+        with ReplayServer() as replay:
+            self.client = AmericanSoccerAnalysis(
+                max_workers=4, pool_maxsize=1, pool_block=True
+            )
+            self.client.base_url = replay.base_url
+            data = self.client.get_team_xgoals(leagues=["mls", "nwsl", "uslc", "usls"])
+
+        stats = self.client.pool_stats()
+        assert len(data) == 4 * len(replay.payload("teams/xgoals"))
+        assert stats["opened"] == 1
+        assert stats["discarded"] == 0
 
     @patch("itscalledsoccer.client.AmericanSoccerAnalysis._get_entity")
     def test_retry_strategy_defaults(self, mock_entity):
@@ -462,7 +563,7 @@ class TestClient:
             )
             self.client.get_games(leagues="mls", team_names="LAFC")
 
-        mock_convert.assert_called_once_with("team", "LAFC")
+        mock_convert.assert_called_once_with("team", "LAFC", "mls")
         args, _ = mock_execute.call_args
         assert args[1]["team_id"] == ["t1"]
 
@@ -656,3 +757,1007 @@ class TestClient:
             assert data is not None
             assert isinstance(data, DataFrame)
             assert len(data) >= 2
+
+    @patch("itscalledsoccer.client.AmericanSoccerAnalysis._get_entity")
+    def test_max_workers_default(self, mock_entity):
+        self.client = AmericanSoccerAnalysis()
+        assert self.client.max_workers == 4
+
+    @patch("itscalledsoccer.client.AmericanSoccerAnalysis._get_entity")
+    def test_max_workers_custom(self, mock_entity):
+        self.client = AmericanSoccerAnalysis(max_workers=8)
+        assert self.client.max_workers == 8
+
+    def test_get_stats_queries_leagues_concurrently_in_order(self):
+        self.client = AmericanSoccerAnalysis(max_workers=7)
+        barrier = Barrier(len(self.client.LEAGUES), timeout=5)
+
+        def side_effect(url, params):
+            # Every league has to be in flight at the same time to pass the barrier
+            barrier.wait()
+            league = url.split("/")[-3]
+            time.sleep(0.01 * (len(self.client.LEAGUES) - self.client.LEAGUES.index(league)))
+            return DataFrame([{"league": league}])
+
+        with patch.object(self.client, "_execute_query", side_effect=side_effect):
+            result = self.client.get_player_xgoals()
+
+        assert list(result["league"]) == self.client.LEAGUES
+
+    def test_get_games_sequential_with_single_worker(self):
+        self.client = AmericanSoccerAnalysis(max_workers=1)
+        calls = []
+
+        def side_effect(url, params):
+            calls.append((url, current_thread().name))
+            return DataFrame(
+                [{"game_id": url, "date_time_utc": "2024-01-01 00:00:00 UTC"}]
+            )
+
+        with patch.object(self.client, "_execute_query", side_effect=side_effect):
+            games = self.client.get_games(leagues=["mls", "nwsl"])
+
+        assert [url for url, _ in calls] == [
+            f"{self.client.base_url}mls/games",
+            f"{self.client.base_url}nwsl/games",
+        ]
+        assert {thread for _, thread in calls} == {current_thread().name}
+        assert len(games) == 2
+
+    def test_execute_query_does_not_mutate_params(self):
+        self.client = AmericanSoccerAnalysis()
+        params = {"ids": ["a", "b"]}
+
+        with patch.object(
+            self.client, "_single_request", return_value=DataFrame([{"value": 1}])
+        ):
+            self.client._execute_query("http://example.com/api", params)
+
+        assert params == {"ids": ["a", "b"]}
+
+    @patch("itscalledsoccer.client.AmericanSoccerAnalysis._get_entity")
+    def test_page_window_default(self, mock_entity):
+        self.client = AmericanSoccerAnalysis()
+        assert self.client.page_window == 1
+
+    def test_execute_query_windowed_pagination_keeps_order(self):
+        self.client = AmericanSoccerAnalysis(page_window=4)
+        self.client.MAX_API_LIMIT = 2
+        requested = []
+
+        def side_effect(url, params):
+            offset = int(params.get("offset", 0))
+            requested.append(offset)
+            # Later pages come back first to make sure the order is restored
+            time.sleep(0.02 if offset == 2 else 0)
+            if offset >= 8:
+                return DataFrame([{"value": offset}])
+            return DataFrame([{"value": offset}, {"value": offset + 1}])
+
+        with patch.object(self.client, "_single_request", side_effect=side_effect):
+            result = self.client._execute_query("http://example.com/api", {})
+
+        assert list(result["value"]) == [0, 1, 2, 3, 4, 5, 6, 7, 8]
+        assert sorted(requested)[:5] == [0, 2, 4, 6, 8]
+
+    def test_execute_query_windowed_pagination_exact_multiple(self):
+        self.client = AmericanSoccerAnalysis(page_window=3)
+        self.client.MAX_API_LIMIT = 2
+
+        def side_effect(url, params):
+            offset = int(params.get("offset", 0))
+            if offset >= 4:
+                return DataFrame([])
+            return DataFrame([{"value": offset}, {"value": offset + 1}])
+
+        with patch.object(self.client, "_single_request", side_effect=side_effect):
+            result = self.client._execute_query("http://example.com/api", {})
+
+        assert list(result["value"]) == [0, 1, 2, 3]
+
+    def test_execute_query_sequential_pagination_exact_multiple(self):
+        self.client = AmericanSoccerAnalysis()
+        self.client.MAX_API_LIMIT = 2
+
+        def side_effect(url, params):
+            offset = int(params.get("offset", 0))
+            if offset >= 4:
+                return DataFrame([])
+            return DataFrame([{"value": offset}, {"value": offset + 1}])
+
+        with patch.object(
+            self.client, "_single_request", side_effect=side_effect
+        ) as mock_single:
+            result = self.client._execute_query("http://example.com/api", {})
+
+        assert list(result["value"]) == [0, 1, 2, 3]
+        assert mock_single.call_count == 3
+
+    def test_name_index_built_once_per_entity_table(self):
+        self.client = AmericanSoccerAnalysis()
+        self.client.players = self.load_mock_data("players")
+        names = self.client.players["player_name"].tolist()
+
+        with patch("itscalledsoccer.client._NameIndex", wraps=_NameIndex) as mock_index:
+            self.client._convert_names_to_ids("player", names[:5])
+            self.client._convert_names_to_ids("player", names[5])
+            assert mock_index.call_count == 1
+
+            self.client.players = self.client.players.copy()
+            self.client._convert_names_to_ids("player", names[0])
+            assert mock_index.call_count == 2
+
+    def test_batched_name_matching_matches_extract_one(self):
+        self.client = AmericanSoccerAnalysis()
+        players = self.load_mock_data("players")
+        self.client.players = players
+        choices = players["player_name"].tolist()
+        queries = [name.split(" ")[-1] for name in choices] + ["zzzzqqq"]
+
+        expected = []
+        for query in queries:
+            match = process.extractOne(query, choices, scorer=fuzz.partial_ratio)
+            expected.append(
+                players.loc[players["player_name"] == match[0], "player_id"].iloc[0]
+                if match[1] >= 70
+                else ""
+            )
+
+        assert self.client._convert_names_to_ids("player", queries) == expected
+
+    def test_batched_name_matching_in_blocks(self):
+        self.client = AmericanSoccerAnalysis()
+        self.client.players = self.load_mock_data("players")
+        names = self.client.players["player_name"].tolist()
+        self.client.MAX_SCORE_CELLS = 2 * len(names)
+        surnames = [name.split()[-1] for name in names[:6]]
+        expected = [
+            process.extractOne(n, names, scorer=fuzz.partial_ratio)[0] for n in surnames
+        ]
+
+        with (
+            patch("itscalledsoccer.client.os.cpu_count", return_value=4),
+            patch("rapidfuzz.process.cdist", wraps=process.cdist) as mock_cdist,
+        ):
+            ids = self.client._convert_names_to_ids("player", surnames)
+
+        assert ids == [self.client._name_index("player").ids[n] for n in expected]
+        assert mock_cdist.call_count == 3
+
+    def test_exact_names_skip_fuzzy_matching(self):
+        self.client = AmericanSoccerAnalysis()
+        self.client.players = self.load_mock_data("players")
+        names = self.client.players["player_name"].tolist()[:5]
+
+        with (
+            patch("rapidfuzz.process.cdist") as mock_cdist,
+            patch("rapidfuzz.process.extractOne") as mock_extract,
+        ):
+            ids = self.client._convert_names_to_ids("player", names)
+
+        assert ids == self.client.players["player_id"].tolist()[:5]
+        mock_cdist.assert_not_called()
+        mock_extract.assert_not_called()
+
+    def test_name_index_duplicate_names_map_to_first_id(self):
+        self.client = AmericanSoccerAnalysis()
+        self.client.teams = DataFrame(
+            [
+                {"team_id": "t1", "team_name": "Dynamo", "competition": "mls"},
+                {"team_id": "t2", "team_name": None, "competition": "mls"},
+                {"team_id": "t3", "team_name": "Dynamo", "competition": "nwsl"},
+            ]
+        )
+
+        assert self.client._convert_names_to_ids("team", ["Dynamo"]) == ["t1"]
+
+    def fake_teams(self, entity_type, leagues=None):
+        return DataFrame(
+            [
+                {
+                    "team_id": f"{league}-t1",
+                    "team_name": f"{league.upper()} United",
+                    "competition": league,
+                }
+                for league in leagues or AmericanSoccerAnalysis.LEAGUES
+            ]
+        )
+
+    def test_entity_loaded_only_for_requested_leagues(self):
+        self.client = AmericanSoccerAnalysis()
+        with patch.object(
+            self.client, "_get_entity", side_effect=self.fake_teams
+        ) as mock_get_entity:
+            teams = self.client.get_teams(leagues="mls")
+
+        mock_get_entity.assert_called_once_with("team", ["mls"])
+        assert list(teams["team_id"]) == ["mls-t1"]
+        assert self.client.teams is None
+
+    def test_entity_partitions_filled_incrementally(self):
+        self.client = AmericanSoccerAnalysis()
+        with patch.object(
+            self.client, "_get_entity", side_effect=self.fake_teams
+        ) as mock_get_entity:
+            self.client.get_teams(leagues="mls")
+            self.client.get_teams(leagues=["mls", "nwsl"])
+            self.client.get_teams(leagues="nwsl")
+            teams = self.client.get_teams()
+
+        assert [c.args for c in mock_get_entity.call_args_list] == [
+            ("team", ["mls"]),
+            ("team", ["nwsl"]),
+            ("team", ["uslc", "usl1", "usls", "nasl", "mlsnp"]),
+        ]
+        assert self.client.teams is teams
+        assert list(teams["competition"]) == AmericanSoccerAnalysis.LEAGUES
+        assert self.client._entity_partitions["team"] == {}
+
+    def test_names_matched_within_requested_leagues(self):
+        self.client = AmericanSoccerAnalysis()
+        with patch.object(
+            self.client, "_get_entity", side_effect=self.fake_teams
+        ) as mock_get_entity:
+            teams = self.client.get_teams(leagues="nwsl", names="United")
+
+        mock_get_entity.assert_called_once_with("team", ["nwsl"])
+        assert list(teams["team_id"]) == ["nwsl-t1"]
+
+    def test_iter_stats_yields_tagged_pages(self):
+        with ReplayServer(page_size=10) as replay:
+            self.client = AmericanSoccerAnalysis()
+            self.client.base_url = replay.base_url
+            self.client.MAX_API_LIMIT = 10
+            pages = list(
+                self.client.iter_stats("games", "xgoals", leagues=["mls", "nwsl"])
+            )
+            expected = self.client.get_game_xgoals(leagues=["mls", "nwsl"])
+
+        assert all(isinstance(page, StatsPage) for page in pages)
+        assert [(page.league, page.offset) for page in pages] == [
+            (league, offset)
+            for league in ["mls", "nwsl"]
+            for offset in range(0, 60, 10)
+        ]
+        streamed = concat([page.data for page in pages], ignore_index=True)
+        assert streamed.equals(expected)
+
+    def test_iter_stats_requests_pages_as_consumed(self):
+        with ReplayServer(page_size=10) as replay:
+            self.client = AmericanSoccerAnalysis()
+            self.client.base_url = replay.base_url
+            self.client.MAX_API_LIMIT = 10
+            pages = self.client.iter_stats("players", "xgoals", leagues="mls")
+            assert replay.requests == []
+
+            next(pages)
+            next(pages)
+            pages.close()
+
+        assert [query.get("offset") for _, query in replay.requests] == [None, "10"]
+
+    def test_iter_stats_validates_eagerly(self):
+        self.client = AmericanSoccerAnalysis()
+        with pytest.raises(InvalidLeagueError):
+            self.client.iter_stats("players", "xgoals", leagues="epl")
+
+    def test_get_player_goals_added_flatten_long(self):
+        with ReplayServer() as replay:
+            self.client = AmericanSoccerAnalysis()
+            self.client.base_url = replay.base_url
+            data = self.client.get_player_goals_added(leagues="mls", flatten="long")
+            payload = replay.payload("players/goals-added")
+
+        assert replay.requests == [("/api/v1/mls/players/goals-added", {})]
+        assert "data" not in data.columns
+        assert len(data) == sum(len(row["data"]) for row in payload)
+        first = payload[0]["data"][0]
+        assert data.iloc[0]["player_id"] == payload[0]["player_id"]
+        assert data.iloc[0]["action_type"] == first["action_type"]
+        assert data.iloc[0]["goals_added_raw"] == first["goals_added_raw"]
+
+    def test_get_team_goals_added_flatten_wide(self):
+        with ReplayServer() as replay:
+            self.client = AmericanSoccerAnalysis()
+            self.client.base_url = replay.base_url
+            data = self.client.get_team_goals_added(leagues="mls", flatten="wide")
+            payload = replay.payload("teams/goals-added")
+
+        assert len(data) == len(payload)
+        assert list(data.columns[:6]) == [
+            "team_id",
+            "minutes",
+            "Dribbling_num_actions_for",
+            "Dribbling_goals_added_for",
+            "Dribbling_num_actions_against",
+            "Dribbling_goals_added_against",
+        ]
+        passing = next(a for a in payload[0]["data"] if a["action_type"] == "Passing")
+        assert data.iloc[0]["Passing_goals_added_for"] == passing["goals_added_for"]
+
+    def test_flatten_keeps_rows_without_actions(self):
+        stats = DataFrame(
+            {
+                "player_id": ["p1", "p2"],
+                "data": [
+                    [
+                        {"action_type": "Passing", "goals_added_raw": 0.5},
+                        {"action_type": "Shooting", "goals_added_raw": 0.25},
+                    ],
+                    [],
+                ],
+            }
+        )
+
+        long = _flatten_goals_added(stats, "long")
+        wide = _flatten_goals_added(stats, "wide")
+
+        assert list(long["player_id"]) == ["p1", "p1", "p2"]
+        assert long["action_type"].isna().tolist() == [False, False, True]
+        assert list(wide.columns) == [
+            "player_id",
+            "Passing_goals_added_raw",
+            "Shooting_goals_added_raw",
+        ]
+        assert wide["Passing_goals_added_raw"].isna().tolist() == [False, True]
+
+    def test_flatten_records_without_action_type(self):
+        stats = DataFrame(
+            {
+                "player_id": ["p1", "p2"],
+                "data": [[{"goals_added_above_replacement": 1.0}], []],
+            }
+        )
+
+        long = _flatten_goals_added(stats, "long")
+        wide = _flatten_goals_added(stats, "wide")
+
+        assert wide.equals(long)
+        assert list(wide.columns) == ["player_id", "goals_added_above_replacement"]
+        assert wide["goals_added_above_replacement"].tolist()[0] == 1.0
+        assert wide["goals_added_above_replacement"].isna().tolist() == [False, True]
+
+    def test_flatten_invalid_value(self, init_client):
+        self.client = init_client
+        with pytest.raises(InvalidParameterFormatError):
+            self.client.get_player_goals_added(flatten="tall")
+
+    def run_concurrently(self, func, count):
+        barrier = Barrier(count)
+
+        def worker():
+            barrier.wait()
+            return func()
+
+        with ThreadPoolExecutor(max_workers=count) as executor:
+            futures = [executor.submit(worker) for _ in range(count)]
+        return [future.exception() or future.result() for future in futures]
+
+    def test_concurrent_identical_queries_coalesced(self):
+        self.client = AmericanSoccerAnalysis(result_cache_bytes=0)
+        calls = []
+
+        def slow_request(url, params):
+            calls.append(params)
+            time.sleep(0.2)
+            return DataFrame({"team_id": ["t1", "t2"]})
+
+        with patch.object(self.client, "_single_request", side_effect=slow_request):
+            results = self.run_concurrently(
+                lambda: self.client._execute_query(
+                    "http://example.com/api", {"season_name": ["2024", "2023"]}
+                ),
+                8,
+            )
+
+        assert calls == [{"season_name": "2023,2024"}]
+        assert all(result.equals(results[0]) for result in results)
+        assert len({id(result) for result in results}) == 8
+
+    def test_concurrent_identical_queries_share_errors(self):
+        self.client = AmericanSoccerAnalysis(result_cache_bytes=0)
+        calls = []
+
+        def failing_request(url, params):
+            calls.append(params)
+            time.sleep(0.2)
+            raise HTTPError("503 Server Error")
+
+        with patch.object(self.client, "_single_request", side_effect=failing_request):
+            results = self.run_concurrently(
+                lambda: self.client._execute_query("http://example.com/api", {}), 4
+            )
+
+        assert len(calls) == 1
+        assert all(isinstance(result, HTTPError) for result in results)
+
+    def test_different_queries_not_coalesced(self):
+        self.client = AmericanSoccerAnalysis(result_cache_bytes=0)
+
+        with patch.object(
+            self.client, "_single_request", return_value=DataFrame([])
+        ) as mock_single:
+            self.run_concurrently(
+                lambda: self.client._execute_query(
+                    "http://example.com/api", {"team_id": current_thread().name}
+                ),
+                4,
+            )
+
+        assert mock_single.call_count == 4
+
+    def test_shared_client_under_many_threads(self):
+        with ReplayServer() as replay:
+            player = replay.payload("players")[0]
+            leagues = ["mls", "nwsl"]
+            calls = [
+                lambda: self.client.get_players(leagues="mls"),
+                lambda: self.client.get_teams(leagues=leagues),
+                lambda: self.client.get_player_xgoals(
+                    leagues=leagues, player_names=player["player_name"]
+                ),
+                lambda: self.client.get_managers(leagues=leagues, names="x"),
+            ]
+            self.client = AmericanSoccerAnalysis(result_cache_bytes=0)
+            self.client.base_url = replay.base_url
+            get_entity = self.client._get_entity
+            fetched = []
+
+            def slow_get_entity(entity_type, leagues=None):
+                fetched.extend(
+                    (entity_type, league) for league in leagues or self.client.LEAGUES
+                )
+                # Widens the window between checking and storing entity data
+                time.sleep(0.05)
+                return get_entity(entity_type, leagues)
+
+            with patch.object(self.client, "_get_entity", side_effect=slow_get_entity):
+                results = self.run_concurrently(lambda: [call() for call in calls], 32)
+
+            self.client = AmericanSoccerAnalysis(result_cache_bytes=0)
+            self.client.base_url = replay.base_url
+            expected = [call() for call in calls]
+
+        assert leagues == ["mls", "nwsl"]
+        assert sorted(fetched) == sorted(set(fetched))
+        assert set(fetched) == {
+            (entity_type, league)
+            for entity_type in ("player", "team", "manager")
+            for league in leagues
+        }
+        for result in results:
+            assert not isinstance(result, Exception), result
+            assert all(a.equals(b) for a, b in zip(result, expected))
+
+    def test_request_events_reported_to_listeners(self):
+        events = []
+        with ReplayServer(page_size=40) as replay:
+            self.client = AmericanSoccerAnalysis(max_workers=1)
+            self.client.base_url = replay.base_url
+            self.client.MAX_API_LIMIT = 40
+            self.client.on_request_end(events.append)
+            self.client.get_player_xgoals(leagues="mls")
+            self.client.result_cache.clear()
+            self.client.get_player_xgoals(leagues="mls")
+
+        assert [(e.url_template, e.league, e.offset) for e in events] == [
+            ("{league}/players/xgoals", "mls", 0),
+            ("{league}/players/xgoals", "mls", 40),
+        ] * 2
+        assert [e.cache_hit for e in events] == [False, False, True, True]
+        assert all(e.status == 200 and e.retries == 0 for e in events)
+        assert all(e.bytes_received > 0 and e.latency > 0 for e in events)
+        assert all(e.decode_time > 0 and e.build_time > 0 for e in events)
+
+    def test_request_events_report_errors(self):
+        events = []
+        with ReplayServer() as replay:
+            replay.status_overrides["/api/v1/mls/teams/xpass"] = 404
+            self.client = AmericanSoccerAnalysis()
+            self.client.base_url = replay.base_url
+            self.client.on_request_end(events.append)
+            with pytest.raises(HTTPError):
+                self.client.get_team_xpass(leagues="mls")
+
+        assert [(e.url_template, e.status) for e in events] == [
+            ("{league}/teams/xpass", 404)
+        ]
+
+    def test_failing_listener_does_not_fail_query(self):
+        with ReplayServer() as replay:
+            self.client = AmericanSoccerAnalysis()
+            self.client.base_url = replay.base_url
+            listener = self.client.on_request_end(Mock(side_effect=ValueError))
+            data = self.client.get_team_xgoals(leagues="mls")
+            self.client.remove_listener(listener)
+
+        assert len(data) == len(replay.payload("teams/xgoals"))
+        assert listener.call_count == 1
+        assert self.client._listeners == []
+
+    def test_metrics_aggregator_summary(self):
+        metrics = MetricsAggregator()
+        with ReplayServer() as replay:
+            self.client = AmericanSoccerAnalysis(max_workers=1)
+            self.client.base_url = replay.base_url
+            self.client.on_request_end(metrics)
+            self.client.get_team_xgoals(leagues=["mls", "nwsl"])
+            self.client.get_player_xpass(leagues="mls")
+
+        summary = metrics.summary()
+        assert list(summary.index) == [
+            "{league}/players/xpass",
+            "{league}/teams/xgoals",
+        ]
+        assert list(summary["requests"]) == [1, 2]
+        assert list(summary["errors"]) == [0, 0]
+        assert {"latency_p50", "latency_p99", "decode_time_p90"} <= set(summary.columns)
+
+    def test_metrics_aggregator_keeps_recent_events(self):
+        metrics = MetricsAggregator(max_events=2)
+        event = RequestEvent("{league}/teams/xgoals", "mls", 0, 500, 0, 10, True, 1, 0, 0)
+        for latency in (1.0, 2.0, 3.0):
+            metrics(event._replace(latency=latency))
+
+        summary = metrics.summary()
+        assert [event.latency for event in metrics.events] == [2.0, 3.0]
+        # Totals cover every event, percentiles the most recent ones
+        row = summary.loc["{league}/teams/xgoals"]
+        assert list(row[["requests", "errors", "cache_hits", "retries"]]) == [3] * 4
+        assert row["bytes_received"] == 30
+        assert row["latency_p50"] == 2.5
+
+    def test_fetch_many_matches_individual_queries(self):
+        queries = [
+            "get_games",
+            {"method": "get_player_xgoals", "leagues": ["mls", "nwsl"]},
+            {
+                "name": "goals_added",
+                "method": "get_team_goals_added",
+                "leagues": "mls",
+                "flatten": "wide",
+            },
+            "get_team_salaries",
+        ]
+        with ReplayServer() as replay:
+            self.client = AmericanSoccerAnalysis()
+            self.client.base_url = replay.base_url
+            results = self.client.fetch_many(queries)
+
+            self.client = AmericanSoccerAnalysis()
+            self.client.base_url = replay.base_url
+            expected = {
+                "get_games": self.client.get_games(),
+                "get_player_xgoals": self.client.get_player_xgoals(
+                    leagues=["mls", "nwsl"]
+                ),
+                "goals_added": self.client.get_team_goals_added(
+                    leagues="mls", flatten="wide"
+                ),
+                "get_team_salaries": self.client.get_team_salaries(),
+            }
+
+        assert list(results) == list(expected)
+        for name, result in results.items():
+            assert result.equals(expected[name]), name
+
+    def test_fetch_many_deduplicates_requests(self):
+        with ReplayServer() as replay:
+            self.client = AmericanSoccerAnalysis()
+            self.client.base_url = replay.base_url
+            results = self.client.fetch_many(
+                [
+                    {"method": "get_team_xgoals", "leagues": ["mls", "nwsl"]},
+                    {"name": "mls", "method": "get_team_xgoals", "leagues": "mls"},
+                ]
+            )
+
+        assert sorted(path for path, _ in replay.requests) == [
+            "/api/v1/mls/teams/xgoals",
+            "/api/v1/nwsl/teams/xgoals",
+        ]
+        assert len(results["mls"]) == len(replay.payload("teams/xgoals"))
+
+    def test_fetch_many_pages_in_order(self):
+        with ReplayServer(page_size=10) as replay:
+            self.client = AmericanSoccerAnalysis(max_workers=3, page_window=2)
+            self.client.base_url = replay.base_url
+            self.client.MAX_API_LIMIT = 10
+            results = self.client.fetch_many(
+                [
+                    {"method": "get_player_xgoals", "leagues": "mls"},
+                    {"method": "get_team_xgoals", "leagues": ["mls", "nwsl"]},
+                ]
+            )
+
+        players = [p["player_id"] for p in replay.payload("players/xgoals")]
+        assert list(results["get_player_xgoals"]["player_id"]) == players
+        assert len(results["get_team_xgoals"]) == 2 * len(
+            replay.payload("teams/xgoals")
+        )
+        offsets = [
+            int(query.get("offset", 0))
+            for path, query in replay.requests
+            if path == "/api/v1/mls/players/xgoals"
+        ]
+        # Every page is requested once, at most page_window pages past the last one
+        assert sorted(offsets) == sorted(set(offsets))
+        assert set(range(0, len(players), 10)) <= set(offsets)
+        assert max(offsets) <= (len(players) // 10 + 2) * 10
+
+    def test_fetch_many_bounds_concurrency(self):
+        self.client = AmericanSoccerAnalysis(max_workers=2, result_cache_bytes=0)
+        in_flight = 0
+        peak = 0
+        lock = Lock()
+
+        def slow_request(url, params):
+            nonlocal in_flight, peak
+            with lock:
+                in_flight += 1
+                peak = max(peak, in_flight)
+            time.sleep(0.02)
+            with lock:
+                in_flight -= 1
+            return DataFrame({"team_id": [url]})
+
+        with patch.object(self.client, "_single_request", side_effect=slow_request):
+            results = self.client.fetch_many(["get_team_xgoals", "get_team_xpass"])
+
+        assert peak == 2
+        assert len(results["get_team_xgoals"]) == len(self.client.LEAGUES)
+
+    def test_fetch_many_validates_queries(self):
+        self.client = AmericanSoccerAnalysis()
+
+        with pytest.raises(InvalidParameterFormatError):
+            self.client.fetch_many(["get_players"])
+        with pytest.raises(ConflictingParametersError):
+            self.client.fetch_many(["get_team_xgoals", "get_team_xgoals"])
+        with pytest.raises(SalaryDataError):
+            self.client.fetch_many(
+                [{"method": "get_player_salaries", "leagues": "nwsl"}]
+            )
+
+    def test_partial_results_report_failed_leagues(self):
+        with ReplayServer() as replay:
+            replay.status_overrides["/api/v1/nwsl/teams/xgoals"] = 404
+            self.client = AmericanSoccerAnalysis(partial_results=True)
+            self.client.base_url = replay.base_url
+            data = self.client.get_team_xgoals(leagues=["mls", "nwsl"])
+            complete = self.client.get_team_xgoals(leagues="mls")
+
+        assert len(data) == len(replay.payload("teams/xgoals"))
+        [error] = data.attrs["errors"]
+        assert error["league"] == "nwsl"
+        assert error["offset"] == 0
+        assert error["status"] == 404
+        assert error["url"].endswith("/api/v1/nwsl/teams/xgoals")
+        assert complete.attrs["errors"] == []
+
+    def test_failures_raise_without_partial_results(self):
+        with ReplayServer() as replay:
+            replay.status_overrides["/api/v1/nwsl/games"] = 404
+            self.client = AmericanSoccerAnalysis()
+            self.client.base_url = replay.base_url
+
+            with pytest.raises(HTTPError, match="404"):
+                self.client.get_games(leagues=["mls", "nwsl"])
+
+    def test_checkpoint_resumes_failed_pages(self, tmp_path):
+        with ReplayServer(page_size=10) as replay:
+            replay.status_overrides["/api/v1/mls/players/xgoals?offset=30"] = 404
+            self.client = AmericanSoccerAnalysis(
+                partial_results=True, checkpoint_dir=tmp_path
+            )
+            self.client.base_url = replay.base_url
+            self.client.MAX_API_LIMIT = 10
+            failed = self.client.get_player_xgoals(leagues=["mls", "nwsl"])
+
+            [error] = failed.attrs["errors"]
+            assert (error["league"], error["offset"]) == ("mls", 30)
+
+            replay.status_overrides.clear()
+            replay.requests.clear()
+            self.client = AmericanSoccerAnalysis(checkpoint_dir=tmp_path)
+            self.client.base_url = replay.base_url
+            self.client.MAX_API_LIMIT = 10
+            data = self.client.get_player_xgoals(leagues=["mls", "nwsl"])
+
+        assert len(data) == 2 * len(replay.payload("players/xgoals"))
+        assert [query.get("offset") for _, query in replay.requests] == [
+            "30",
+            "40",
+            "50",
+        ]
+        # Pages of completed queries are removed
+        assert list(tmp_path.iterdir()) == []
+
+    def test_checkpoint_kept_across_other_calls(self, tmp_path):
+        with ReplayServer(page_size=10) as replay:
+            replay.status_overrides["/api/v1/mls/players/xgoals?offset=30"] = 404
+            self.client = AmericanSoccerAnalysis(
+                partial_results=True, checkpoint_dir=tmp_path
+            )
+            self.client.base_url = replay.base_url
+            self.client.MAX_API_LIMIT = 10
+            failed = self.client.get_player_xgoals(leagues=["mls", "nwsl"])
+            assert len(failed.attrs["errors"]) == 1
+
+            # Another call succeeding in between keeps the pages of the failed one
+            teams = self.client.get_team_xgoals(leagues=["mls", "nwsl"])
+            assert teams.attrs["errors"] == []
+
+            replay.status_overrides.clear()
+            replay.requests.clear()
+            # A new client, so that no page is served by the HTTP cache
+            self.client = AmericanSoccerAnalysis(checkpoint_dir=tmp_path)
+            self.client.base_url = replay.base_url
+            self.client.MAX_API_LIMIT = 10
+            data = self.client.get_player_xgoals(leagues=["mls", "nwsl"])
+
+        assert len(data) == 2 * len(replay.payload("players/xgoals"))
+        assert [
+            (path.split("/")[3], query.get("offset"))
+            for path, query in replay.requests
+        ] == [("mls", "30"), ("mls", "40"), ("mls", "50")]
+        assert list(tmp_path.iterdir()) == []
+
+    def test_partial_entity_load_retries_failed_leagues(self):
+        with ReplayServer() as replay:
+            replay.status_overrides["/api/v1/nwsl/players"] = [404]
+            self.client = AmericanSoccerAnalysis(partial_results=True)
+            self.client.base_url = replay.base_url
+            partial = self.client.get_players(leagues=["mls", "nwsl"])
+            replay.requests.clear()
+            players = self.client.get_players(leagues=["mls", "nwsl"])
+
+        assert set(partial["competition"]) == {"mls"}
+        assert [error["league"] for error in partial.attrs["errors"]] == ["nwsl"]
+        assert replay.requests == [("/api/v1/nwsl/players", {})]
+        assert set(players["competition"]) == {"mls", "nwsl"}
+        assert players.attrs["errors"] == []
+
+    def test_fetch_many_partial_results(self):
+        with ReplayServer() as replay:
+            replay.status_overrides["/api/v1/nwsl/teams/xgoals"] = 404
+            self.client = AmericanSoccerAnalysis(partial_results=True)
+            self.client.base_url = replay.base_url
+            results = self.client.fetch_many(
+                [
+                    {"method": "get_team_xgoals", "leagues": ["mls", "nwsl"]},
+                    {"method": "get_games", "leagues": "nwsl"},
+                ]
+            )
+
+        assert len(results["get_team_xgoals"]) == len(replay.payload("teams/xgoals"))
+        assert [e["league"] for e in results["get_team_xgoals"].attrs["errors"]] == [
+            "nwsl"
+        ]
+        assert results["get_games"].attrs["errors"] == []
+
+    def chunking_client(self, transport, **kwargs):
+        client = AmericanSoccerAnalysis(transport=transport, **kwargs)
+        client.MAX_URL_LENGTH = 250
+        client.ID_CHUNK_SIZE = 4
+        return client
+
+    def test_long_id_lists_split_into_chunks(self):
+        transport = MemoryTransport(MOCKS_DIR)
+        game_ids = [game["game_id"] for game in transport.records("mls", "games")]
+        self.client = self.chunking_client(transport)
+
+        games = self.client.get_games(leagues="mls", game_ids=game_ids)
+
+        assert sorted(games["game_id"]) == sorted(game_ids)
+        assert len(transport.requests) > 1
+        requested = [
+            game_id
+            for _, query in transport.requests
+            for game_id in query["game_id"].split(",")
+        ]
+        assert sorted(requested) == sorted(game_ids)
+        assert all(
+            len(self.client.base_url) + len(path) + 1 + len(urlencode(query)) <= 250
+            for path, query in transport.requests
+        )
+
+    def test_chunk_results_deduplicated(self):
+        transport = MemoryTransport(MOCKS_DIR)
+        games = transport.records("mls", "games")
+        team_ids = sorted({game["home_team_id"] for game in games})
+        self.client = self.chunking_client(transport)
+
+        result = self.client.get_games(leagues="mls", team_ids=team_ids)
+
+        expected = {
+            game["game_id"]
+            for game in games
+            if game["home_team_id"] in team_ids or game["away_team_id"] in team_ids
+        }
+        assert len(transport.requests) > 1
+        assert sorted(result["game_id"]) == sorted(expected)
+
+    def test_overlapping_id_lists_reuse_chunks(self):
+        transport = MemoryTransport(MOCKS_DIR)
+        player_ids = sorted(
+            {p["player_id"] for p in transport.records("mls", "players/xgoals")}
+        )
+        self.client = self.chunking_client(transport)
+
+        self.client.get_player_xgoals(leagues="mls", player_ids=player_ids[1:])
+        first = len(transport.requests)
+        data = self.client.get_player_xgoals(leagues="mls", player_ids=player_ids)
+
+        assert sorted(set(data["player_id"])) == player_ids
+        # Only the chunk holding the new id is requested again
+        assert len(transport.requests) - first == 1
+
+    def totaling_transport(self):
+        """Totals the xgoals of each player over the requested games, like the API"""
+        games = [f"game{g:03d}" for g in range(60)]
+        players = [f"player{p:03d}" for p in range(60)]
+        records = [
+            {"player_id": p, "game_id": g, "minutes": 10, "xgoals": (i * j) % 7 / 10}
+            for i, p in enumerate(players)
+            for j, g in enumerate(games)
+            if (i + j) % 3 == 0
+        ]
+
+        class TotalingTransport(Transport):
+            def __init__(self):
+                self.requests = []
+
+            def get(self, url, params, timeout, headers=None):
+                self.requests.append(params)
+                allowed = {
+                    key: set(params[key].split(","))
+                    for key in ("game_id", "player_id")
+                    if key in params
+                }
+                totals = {}
+                for record in records:
+                    if all(record[key] in ids for key, ids in allowed.items()):
+                        total = totals.setdefault(
+                            record["player_id"],
+                            {
+                                "player_id": record["player_id"],
+                                "minutes": 0,
+                                "xgoals": 0.0,
+                            },
+                        )
+                        total["minutes"] += record["minutes"]
+                        total["xgoals"] += record["xgoals"]
+                minimum = int(params.get("minimum_minutes", 0))
+                rows = [row for row in totals.values() if row["minutes"] >= minimum]
+                return TransportResponse(
+                    status=200, records=rows, error=None, latency=0.0, bytes_received=0
+                )
+
+        return TotalingTransport(), games, players
+
+    def test_chunked_totals_match_unchunked(self):
+        transport, _, players = self.totaling_transport()
+        self.client = AmericanSoccerAnalysis(transport=transport, result_cache_bytes=0)
+        expected = self.client.get_player_xgoals(
+            leagues="mls", player_ids=players, minimum_minutes=150
+        )
+
+        self.client.MAX_URL_LENGTH = 250
+        self.client.ID_CHUNK_SIZE = 4
+        transport.requests.clear()
+        chunked = self.client.get_player_xgoals(
+            leagues="mls", player_ids=players, minimum_minutes=150
+        )
+
+        assert len(transport.requests) > 1
+        assert chunked.sort_values("player_id", ignore_index=True).equals(
+            expected.sort_values("player_id", ignore_index=True)
+        )
+
+    def test_totaled_id_lists_not_chunked(self):
+        transport, games, _ = self.totaling_transport()
+        self.client = AmericanSoccerAnalysis(transport=transport, result_cache_bytes=0)
+        self.client.MAX_URL_LENGTH = 250
+
+        with pytest.raises(InvalidParameterFormatError, match="game_id"):
+            self.client.get_player_xgoals(leagues="mls", game_ids=games)
+
+        assert transport.requests == []
+
+    def test_fetch_many_splits_long_id_lists(self):
+        transport = MemoryTransport(MOCKS_DIR)
+        game_ids = [game["game_id"] for game in transport.records("mls", "games")]
+        self.client = self.chunking_client(transport, result_cache_bytes=0)
+
+        results = self.client.fetch_many(
+            [{"method": "get_games", "leagues": "mls", "game_ids": game_ids}]
+        )
+        chunked = len(transport.requests)
+        expected = self.client.get_games(leagues="mls", game_ids=game_ids)
+
+        assert chunked > 1
+        assert results["get_games"].equals(expected)
+
+    def season_transport(self):
+        seasons = [str(year) for year in range(2019, date.today().year + 1)]
+        records = [
+            {"player_id": player_id, "season_name": season, "xgoals": float(i)}
+            for i, season in enumerate(seasons)
+            for player_id in ("a", "b")
+        ]
+        return MemoryTransport({"players/xgoals": records}), seasons
+
+    def test_season_queries_sharded(self):
+        transport, seasons = self.season_transport()
+        self.client = AmericanSoccerAnalysis(transport=transport, shard_seasons=True)
+
+        data = self.client.get_player_xgoals(
+            leagues="mls", season_name=seasons[:3], split_by_seasons=True
+        )
+
+        assert list(data["season_name"]) == [s for s in seasons[:3] for _ in "ab"]
+        assert (
+            sorted(query["season_name"] for _, query in transport.requests)
+            == (seasons[:3])
+        )
+
+    def test_added_season_fetches_only_its_shard(self):
+        transport, seasons = self.season_transport()
+        self.client = AmericanSoccerAnalysis(transport=transport, shard_seasons=True)
+
+        self.client.get_player_xgoals(
+            leagues="mls", season_name=seasons[:3], split_by_seasons=True
+        )
+        transport.requests.clear()
+        data = self.client.get_player_xgoals(
+            leagues="mls", season_name=seasons[:4], split_by_seasons=True
+        )
+
+        assert len(data) == 8
+        assert [query["season_name"] for _, query in transport.requests] == [seasons[3]]
+
+    def test_completed_seasons_never_expire(self):
+        transport, seasons = self.season_transport()
+        self.client = AmericanSoccerAnalysis(transport=transport, shard_seasons=True)
+        self.client.result_cache.max_age = 0
+        current = [seasons[0], seasons[-1]]
+
+        self.client.get_player_xgoals(
+            leagues="mls", season_name=current, split_by_seasons=True
+        )
+        transport.requests.clear()
+        self.client.get_player_xgoals(
+            leagues="mls", season_name=current, split_by_seasons=True
+        )
+
+        assert [query["season_name"] for _, query in transport.requests] == [
+            seasons[-1]
+        ]
+
+    def test_season_queries_not_sharded_by_default(self):
+        transport, seasons = self.season_transport()
+        self.client = AmericanSoccerAnalysis(transport=transport)
+
+        self.client.get_player_xgoals(
+            leagues="mls", season_name=seasons[:3], split_by_seasons=True
+        )
+
+        assert [query["season_name"] for _, query in transport.requests] == [
+            ",".join(seasons[:3])
+        ]
+
+    def test_completed_seasons_cached_for_a_year(self):
+        self.client = AmericanSoccerAnalysis(shard_seasons=True)
+        heuristic = self.client.adapter.heuristic
+        current = date.today().year
+
+        def expiry(season, league="mls"):
+            response = Mock(url=f"/api/v1/{league}/players/xgoals?season_name={season}")
+            expires = heuristic.update_headers(response)["expires"]
+            return (parsedate_to_datetime(expires).date() - date.today()).days
+
+        assert expiry(current - 1) >= 364
+        assert expiry(current) <= 1
+        assert expiry(current - 1, league="usls") <= 1
+        assert expiry(f"{current - 2},{current}") <= 1
@@ -0,0 +1,92 @@
+from pandas import DataFrame, read_json
+from pandas.testing import assert_frame_equal
+
+from itscalledsoccer.client import AmericanSoccerAnalysis
+from itscalledsoccer.compact import compact_frame
+from tests.replay_server import MOCKS_DIR, ReplayServer
+
+
+def load_mock_data(endpoint: str) -> DataFrame:
+    return read_json(MOCKS_DIR / f"{endpoint}_payload.json")
+
+
+class TestCompactFrame:
+    def test_values_unchanged(self):
+        for path in MOCKS_DIR.glob("*_payload.json"):
+            endpoint = path.name.removesuffix("_payload.json").replace("_", "/", 1)
+            stats = load_mock_data(path.name.removesuffix("_payload.json"))
+            compacted = compact_frame(stats, endpoint)
+
+            assert_frame_equal(
+                compacted, stats, check_dtype=False, check_categorical=False
+            )
+            assert (
+                compacted.memory_usage(deep=True).sum()
+                <= stats.memory_usage(deep=True).sum()
+            )
+
+    def test_dtypes(self):
+        stats = compact_frame(load_mock_data("players_xgoals"), "players/xgoals")
+
+        assert stats["team_id"].dtype == "category"
+        assert stats["general_position"].dtype == "category"
+        assert stats["minutes_played"].dtype == "int16"
+        assert stats["goals"].dtype == "int8"
+        # Values with 4 decimals are not exact in float32
+        assert stats["xgoals"].dtype == "float64"
+
+    def test_exact_floats_downcast(self):
+        stats = compact_frame(DataFrame({"share": [0.5, 0.25, None]}), "teams/xgoals")
+
+        assert stats["share"].dtype == "float32"
+
+    def test_entity_keys_left_as_is(self):
+        teams = load_mock_data("teams")
+
+        compacted = compact_frame(teams, "teams")
+
+        assert compacted["team_id"].dtype == teams["team_id"].dtype
+
+    def test_nested_values_left_as_is(self):
+        players = load_mock_data("players").assign(competition="mls")
+
+        compacted = compact_frame(players, "players")
+
+        assert compacted["season_name"].dtype == object
+        assert compacted["competition"].dtype == "category"
+
+    def test_attrs_kept(self):
+        stats = load_mock_data("teams_xgoals")
+        stats.attrs["source"] = "mock"
+
+        assert compact_frame(stats, "teams/xgoals").attrs == {"source": "mock"}
+
+
+class TestClientCompact:
+    def test_stats_compacted_across_leagues(self):
+        with ReplayServer() as replay:
+            client = AmericanSoccerAnalysis(compact=True)
+            client.base_url = replay.base_url
+            stats = client.get_player_xgoals(leagues=["mls", "nwsl"])
+
+        assert stats["team_id"].dtype == "category"
+        assert stats["shots"].dtype == "int16"
+
+    def test_entity_partitions_compacted_once_merged(self):
+        with ReplayServer() as replay:
+            client = AmericanSoccerAnalysis(compact=True)
+            client.base_url = replay.base_url
+            client.get_teams(leagues="mls")
+            teams = client.get_teams()
+
+        assert client.teams is teams
+        assert teams["competition"].dtype == "category"
+        assert set(teams["competition"].cat.categories) == set(client.LEAGUES)
+
+    def test_disabled_by_default(self):
+        with ReplayServer() as replay:
+            client = AmericanSoccerAnalysis()
+            client.base_url = replay.base_url
+            games = client.get_games(leagues="mls")
+
+        assert games["home_team_id"].dtype != "category"
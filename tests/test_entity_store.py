@@ -0,0 +1,163 @@
+import multiprocessing
+
+import pytest
+from pandas import DataFrame
+from pandas.testing import assert_frame_equal
+from pytest import fixture
+
+from itscalledsoccer import AmericanSoccerAnalysis, EntityStore
+from tests.replay_server import ReplayServer
+
+pyarrow = pytest.importorskip("pyarrow")
+
+
+UNREACHABLE_URL = "http://127.0.0.1:9/api/v1/"
+
+
+def resolve_player(directory, name, results):
+    client = AmericanSoccerAnalysis(entity_store=directory)
+    client.base_url = UNREACHABLE_URL
+    results.put(
+        (
+            client.entity_store.version(),
+            client._convert_name_to_id("player", name),
+            len(client.get_players()),
+        )
+    )
+
+
+def mapped_region(column):
+    """Returns the start and end addresses of the memory map an Arrow-backed column reads from"""
+    root = pyarrow.array(column).buffers()[-1]
+    while root.parent is not None:
+        root = root.parent
+    return root.address, root.address + root.size
+
+
+@fixture(scope="module")
+def server():
+    with ReplayServer() as replay:
+        yield replay
+
+
+@fixture
+def replay(server):
+    server.reset()
+    return server
+
+
+def client_for(replay, **kwargs) -> AmericanSoccerAnalysis:
+    client = AmericanSoccerAnalysis(**kwargs)
+    client.base_url = replay.base_url
+    return client
+
+
+class TestEntityStore:
+    def test_attached_clients_match_api(self, replay, tmp_path):
+        assert client_for(replay).publish_entities(tmp_path) == 1
+        online = client_for(replay)
+        shared = AmericanSoccerAnalysis(entity_store=tmp_path)
+        # The API is unreachable, every entity must come from the store
+        shared.base_url = UNREACHABLE_URL
+
+        assert_frame_equal(shared.get_players(), online.get_players())
+        assert_frame_equal(
+            shared.get_teams(leagues="mls", names="Chicago").reset_index(drop=True),
+            online.get_teams(leagues="mls", names="Chicago").reset_index(drop=True),
+        )
+        assert len(shared.get_stadia()) == len(online.get_stadia())
+        assert shared.players is shared.entity_store.get("player")
+
+    def test_tables_are_memory_mapped(self, tmp_path):
+        players = DataFrame(
+            {
+                "player_id": [f"id{i}" for i in range(100_000)],
+                "player_name": [f"Player {i}" for i in range(100_000)],
+                "weight_lb": range(100_000),
+                "competition": "mls",
+            }
+        )
+        EntityStore(tmp_path).publish({"player": players})
+        store = EntityStore(tmp_path)
+
+        allocated = pyarrow.total_allocated_bytes()
+        shared = store.get("player")
+
+        # The columns point into the mapped file instead of freshly allocated memory
+        assert pyarrow.total_allocated_bytes() - allocated < 4096
+        start, end = mapped_region(shared["player_id"])
+        assert end - start == (tmp_path / "player-1.arrow").stat().st_size
+        for column in shared:
+            for buffer in filter(None, pyarrow.array(shared[column]).buffers()):
+                assert start <= buffer.address < end
+        assert not shared["weight_lb"].to_numpy().flags.writeable
+        assert_frame_equal(shared, players)
+        assert store.get("player") is shared
+
+    def test_nested_columns_decoded_when_returned(self, replay, tmp_path):
+        client_for(replay).publish_entities(tmp_path)
+        online = client_for(replay).get_players(leagues="mls")
+        shared = AmericanSoccerAnalysis(entity_store=tmp_path)
+        shared.base_url = UNREACHABLE_URL
+
+        players = shared.get_players(leagues="mls")
+
+        # The shared table keeps the JSON text, the returned rows hold the records
+        assert isinstance(shared.players["season_name"].iloc[0], str)
+        assert list(players["season_name"]) == list(online["season_name"])
+
+    def test_refreshed_version_picked_up(self, replay, tmp_path):
+        publisher = client_for(replay, entity_store=tmp_path)
+        publisher.publish_entities()
+        shared = client_for(replay, entity_store=tmp_path)
+        before = shared.get_teams()
+
+        teams = replay.payload("teams")
+        replay.set_payload("teams", teams[:5])
+        try:
+            assert client_for(replay).publish_entities(tmp_path) == 2
+            client_for(replay).publish_entities(tmp_path)
+        finally:
+            replay.set_payload("teams", teams)
+
+        assert len(before) == len(teams) * len(AmericanSoccerAnalysis.LEAGUES)
+        assert len(shared.get_teams()) == 5 * len(AmericanSoccerAnalysis.LEAGUES)
+        assert shared.entity_store.version() == 3
+        # Only the current and previous versions are kept
+        assert sorted(path.name for path in tmp_path.glob("team-*.arrow")) == [
+            "team-2.arrow",
+            "team-3.arrow",
+        ]
+
+    def test_shared_across_processes(self, replay, tmp_path):
+        client_for(replay).publish_entities(tmp_path)
+        player = replay.payload("players")[0]
+
+        context = multiprocessing.get_context("spawn")
+        results = context.Queue()
+        processes = [
+            context.Process(
+                target=resolve_player,
+                args=(tmp_path, player["player_name"], results),
+            )
+            for _ in range(2)
+        ]
+        for process in processes:
+            process.start()
+        outcomes = [results.get(timeout=60) for _ in processes]
+        for process in processes:
+            process.join()
+
+        assert all(process.exitcode == 0 for process in processes)
+        assert (
+            outcomes
+            == [
+                (
+                    1,
+                    player["player_id"],
+                    len(replay.payload("players"))
+                    * len(AmericanSoccerAnalysis.LEAGUES),
+                )
+            ]
+            * 2
+        )
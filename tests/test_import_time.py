@@ -0,0 +1,67 @@
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+HEAVY_MODULES = ("pandas", "requests", "rapidfuzz", "cachecontrol", "urllib3")
+
+
+def run(code: str) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        text=True,
+        cwd=ROOT,
+        check=True,
+    )
+
+
+def import_times(stderr: str) -> dict[str, int]:
+    """Parses `-X importtime` output into the cumulative microseconds of each module"""
+    times = {}
+    for line in stderr.splitlines():
+        if line.startswith("import time:") and "|" in line:
+            _, cumulative, name = line.split("|")
+            if cumulative.strip().isdigit():
+                times[name.strip()] = int(cumulative)
+    return times
+
+
+class TestImportTime:
+    def test_import_defers_heavy_dependencies(self):
+        result = run(
+            "import sys\n"
+            "import itscalledsoccer\n"
+            "itscalledsoccer.AmericanSoccerAnalysis(lazy_load=True)\n"
+            "print(' '.join(sorted(sys.modules)))\n"
+        )
+        imported = set(result.stdout.split())
+
+        assert "itscalledsoccer.client" in imported
+        assert [module for module in HEAVY_MODULES if module in imported] == []
+
+    def test_import_much_faster_than_pandas(self):
+        package = import_times(run("import itscalledsoccer").stderr)
+        pandas = import_times(run("import pandas").stderr)
+
+        assert package["itscalledsoccer"] * 5 < pandas["pandas"]
+
+    def test_dependencies_loaded_on_first_use(self):
+        code = (
+            "import sys\n"
+            "from itscalledsoccer import AmericanSoccerAnalysis\n"
+            "from tests.replay_server import ReplayServer\n"
+            "loaded = lambda: [m for m in ('pandas', 'rapidfuzz') if m in sys.modules]\n"
+            "with ReplayServer() as replay:\n"
+            "    client = AmericanSoccerAnalysis()\n"
+            "    client.base_url = replay.base_url\n"
+            "    print(loaded())\n"
+            "    client.get_team_xgoals(leagues='mls')\n"
+            "    print(loaded())\n"
+            "    team = replay.payload('teams')[0]['team_name'][:-1]\n"
+            "    client.get_team_xgoals(leagues='mls', team_names=team)\n"
+            "    print(loaded())\n"
+        )
+        lines = run(code).stdout.splitlines()
+
+        assert lines == ["[]", "['pandas']", "['pandas', 'rapidfuzz']"]
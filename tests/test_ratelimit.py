@@ -0,0 +1,149 @@
+import multiprocessing
+import time
+from email.utils import formatdate
+
+import pytest
+from pytest import approx
+
+from itscalledsoccer.client import AmericanSoccerAnalysis
+from itscalledsoccer.ratelimit import RateLimiter, parse_retry_after
+from tests.replay_server import ReplayServer
+
+
+def acquire_many(directory, count):
+    limiter = RateLimiter(rate=20, burst=1, directory=directory)
+    for _ in range(count):
+        limiter.acquire()
+        limiter.release(200)
+
+
+class TestRateLimiter:
+    def test_token_bucket_spaces_requests(self):
+        limiter = RateLimiter(rate=20, burst=1)
+        start = time.monotonic()
+        for _ in range(5):
+            limiter.acquire()
+            limiter.release(200)
+
+        assert time.monotonic() - start >= 0.19
+        stats = limiter.stats()
+        assert stats["requests"] == 5
+        assert stats["waited"] == 4
+        assert stats["wait_seconds"] > 0.15
+
+    @pytest.mark.parametrize(
+        "kwargs",
+        [
+            {"rate": 0},
+            {"rate": -1},
+            {"burst": 0},
+            {"max_concurrency": 0},
+            {"min_concurrency": 0},
+            {"min_concurrency": 4, "max_concurrency": 2},
+        ],
+    )
+    def test_invalid_limits_rejected(self, kwargs):
+        with pytest.raises(ValueError):
+            RateLimiter(**kwargs)
+
+    def test_burst_sent_without_waiting(self):
+        limiter = RateLimiter(rate=1, burst=3)
+        for _ in range(3):
+            limiter.acquire()
+            limiter.release(200)
+
+        assert limiter.stats()["waited"] == 0
+
+    def test_concurrency_adapts_to_throttling(self):
+        limiter = RateLimiter(rate=1000, max_concurrency=8)
+        limiter.acquire()
+        limiter.release(429, retry_after=0)
+        limiter.acquire()
+        limiter.release(503, retry_after=0)
+        assert limiter.stats()["concurrency_limit"] == 2
+        assert limiter.stats()["throttled"] == 2
+
+        # Grows back by one for every limit's worth of successful requests
+        for _ in range(40):
+            limiter.acquire()
+            limiter.release(200)
+        assert limiter.stats()["concurrency_limit"] == 8
+
+    def test_retry_after_pauses_requests(self):
+        limiter = RateLimiter(rate=1000)
+        limiter.acquire()
+        limiter.release(429, retry_after=0.2)
+
+        start = time.monotonic()
+        limiter.acquire()
+        assert time.monotonic() - start >= 0.19
+
+    def test_parse_retry_after(self):
+        assert parse_retry_after("3") == 3
+        assert parse_retry_after(formatdate(time.time() + 60, usegmt=True)) == approx(
+            60, abs=2
+        )
+        assert parse_retry_after("soon") is None
+        assert parse_retry_after(None) is None
+
+    def test_bucket_shared_between_processes(self, tmp_path):
+        context = multiprocessing.get_context("spawn")
+        processes = [
+            context.Process(target=acquire_many, args=(tmp_path, 5)) for _ in range(2)
+        ]
+        start = time.monotonic()
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join()
+
+        assert all(process.exitcode == 0 for process in processes)
+        # Ten requests at twenty per second, whatever process sends them
+        assert time.monotonic() - start >= 0.45
+
+    def test_pause_shared_between_limiters(self, tmp_path):
+        first = RateLimiter(rate=1000, directory=tmp_path)
+        second = RateLimiter(rate=1000, directory=tmp_path)
+        first.acquire()
+        first.release(429, retry_after=0.2)
+
+        start = time.monotonic()
+        second.acquire()
+        assert time.monotonic() - start >= 0.19
+
+
+class TestClientRateLimit:
+    def test_throttled_requests_sent_again(self):
+        with ReplayServer() as replay:
+            replay.status_overrides["/api/v1/mls/teams/xgoals"] = [429, 503]
+            replay.retry_after = "0"
+            client = AmericanSoccerAnalysis(rate_limit=100)
+            client.base_url = replay.base_url
+            data = client.get_team_xgoals(leagues="mls")
+
+        assert len(data) == len(replay.payload("teams/xgoals"))
+        assert len(replay.requests) == 3
+        assert client.rate_limiter.stats()["throttled"] == 2
+        assert client.rate_limiter.stats()["requests"] == 3
+
+    def test_cached_responses_do_not_wait(self):
+        with ReplayServer() as replay:
+            client = AmericanSoccerAnalysis(
+                rate_limit=RateLimiter(rate=1, burst=1), result_cache_bytes=0
+            )
+            client.base_url = replay.base_url
+            client.get_team_xgoals(leagues="mls")
+            client.get_team_xgoals(leagues="mls")
+
+        assert client.rate_limiter.stats()["requests"] == 1
+        assert client.rate_limiter.stats()["waited"] == 0
+
+    def test_retry_strategy_leaves_throttling_to_limiter(self):
+        client = AmericanSoccerAnalysis(rate_limit=5)
+        retry = client.session.get_adapter("https://").max_retries
+
+        assert isinstance(client.rate_limiter, RateLimiter)
+        assert client.rate_limiter.rate == 5
+        assert 429 not in retry.status_forcelist
+        assert 503 not in retry.status_forcelist
+        assert not retry.respect_retry_after_header
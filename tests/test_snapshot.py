@@ -0,0 +1,129 @@
+import pytest
+from pandas.testing import assert_frame_equal
+from pytest import fixture
+
+from itscalledsoccer import AmericanSoccerAnalysis, SnapshotError
+from tests.replay_server import ReplayServer
+
+pytest.importorskip("pyarrow")
+
+
+@fixture(scope="module")
+def server():
+    with ReplayServer() as replay:
+        yield replay
+
+
+@fixture
+def replay(server):
+    server.reset()
+    return server
+
+
+@fixture(scope="module")
+def snapshot_dir(server, tmp_path_factory):
+    directory = tmp_path_factory.mktemp("snapshot")
+    client_for(server).snapshot(directory, leagues=["mls", "nwsl"])
+    return directory
+
+
+def client_for(replay, **kwargs) -> AmericanSoccerAnalysis:
+    client = AmericanSoccerAnalysis(**kwargs)
+    client.base_url = replay.base_url
+    return client
+
+
+QUERIES = [
+    ("get_players", {"leagues": ["mls", "nwsl"]}),
+    ("get_teams", {"leagues": "mls", "names": "Chicago"}),
+    ("get_games", {"leagues": "mls", "season_name": "2020"}),
+    ("get_player_xgoals", {"leagues": "mls"}),
+    ("get_player_goals_added", {"leagues": "mls", "split_by_seasons": True}),
+    ("get_team_goals_added", {"leagues": ["mls", "nwsl"], "flatten": "wide"}),
+    ("get_player_salaries", {}),
+    ("get_team_salaries", {}),
+    ("get_game_xgoals", {"leagues": "nwsl"}),
+]
+
+
+class TestSnapshot:
+    @pytest.mark.parametrize("method, kwargs", QUERIES)
+    def test_results_match_api(self, replay, snapshot_dir, method, kwargs):
+        expected = getattr(client_for(replay), method)(**kwargs)
+        replay.requests.clear()
+
+        offline = client_for(replay, snapshot=snapshot_dir)
+        result = getattr(offline, method)(**kwargs)
+
+        assert_frame_equal(result, expected)
+        assert replay.requests == []
+
+    def test_pages_served_from_snapshot(self, replay, snapshot_dir):
+        offline = client_for(replay, snapshot=snapshot_dir)
+        offline.MAX_API_LIMIT = 10
+
+        pages = list(offline.iter_stats("players", "xgoals", leagues="mls"))
+
+        assert [page.offset for page in pages] == list(range(0, 60, 10))
+        assert sum(len(page.data) for page in pages) == len(
+            replay.payload("players/xgoals")
+        )
+
+    def test_games_filtered_by_team(self, replay, snapshot_dir):
+        team_id = replay.payload("games")[0]["home_team_id"]
+        offline = client_for(replay, snapshot=snapshot_dir)
+
+        games = offline.get_games(leagues="mls", team_ids=team_id)
+
+        assert len(games) > 0
+        assert all(
+            team_id in (game.home_team_id, game.away_team_id)
+            for game in games.itertuples()
+        )
+
+    def test_stats_filtered_by_team(self, replay, snapshot_dir):
+        team_id = replay.payload("teams/xgoals")[0]["team_id"]
+        expected = client_for(replay).get_team_xgoals(leagues="mls", team_ids=team_id)
+        replay.requests.clear()
+        offline = client_for(replay, snapshot=snapshot_dir)
+
+        result = offline.get_team_xgoals(leagues="mls", team_ids=team_id)
+
+        assert_frame_equal(result, expected)
+        assert list(result["team_id"]) == [team_id]
+        # Player stats are totaled over every team of a player
+        with pytest.raises(SnapshotError, match="team_id"):
+            offline.get_player_xgoals(leagues="mls", team_ids=team_id)
+        with pytest.raises(SnapshotError, match="team_id"):
+            offline.get_goalkeeper_goals_added(leagues="mls", team_ids=team_id)
+        assert replay.requests == []
+
+    def test_unsupported_queries_raise(self, replay, snapshot_dir):
+        offline = client_for(replay, snapshot=snapshot_dir)
+
+        with pytest.raises(SnapshotError, match="uslc"):
+            offline.get_team_xgoals(leagues="uslc")
+        with pytest.raises(SnapshotError, match="players/xgoals"):
+            offline.get_player_xgoals(leagues="mls", split_by_teams=True)
+        # Aggregated stats hold no season to filter on
+        with pytest.raises(SnapshotError, match="season_name"):
+            offline.get_player_xgoals(leagues="mls", season_name="2020")
+        assert replay.requests == []
+
+    def test_seasons_limited_to_snapshot(self, replay, tmp_path):
+        client_for(replay).snapshot(tmp_path, leagues="mls", seasons="2020")
+        offline = client_for(replay, snapshot=tmp_path)
+
+        assert len(offline.get_games(leagues="mls", season_name="2020")) == len(
+            replay.payload("games")
+        )
+        with pytest.raises(SnapshotError, match="2020"):
+            offline.get_games(leagues="mls")
+        with pytest.raises(SnapshotError, match="2020"):
+            offline.get_games(leagues="mls", season_name="2021")
+
+    def test_missing_snapshot(self, replay, tmp_path):
+        offline = client_for(replay, snapshot=tmp_path)
+
+        with pytest.raises(SnapshotError, match="No snapshot"):
+            offline.get_team_xgoals(leagues="mls")
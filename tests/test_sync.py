@@ -0,0 +1,106 @@
+import json
+
+from pytest import fixture
+
+from itscalledsoccer.client import AmericanSoccerAnalysis
+from itscalledsoccer.sync import GameStore, merge_games, open_game_ids
+from tests.replay_server import MOCKS_DIR, ReplayServer
+
+
+def season_games() -> list[dict]:
+    """Mock games split over two seasons, with a few games still to be played"""
+    games = json.loads((MOCKS_DIR / "games_payload.json").read_text())
+    for i, game in enumerate(games):
+        game["season_name"] = "2019" if i < 20 else "2020"
+        game["status"] = "PreMatch" if i in (5, 30, 31) else "FullTime"
+    return games
+
+
+@fixture
+def replay():
+    with ReplayServer() as replay:
+        replay.set_payload("games", season_games())
+        yield replay
+
+
+def client_for(replay: ReplayServer) -> AmericanSoccerAnalysis:
+    client = AmericanSoccerAnalysis()
+    client.base_url = replay.base_url
+    return client
+
+
+class TestGameStore:
+    def test_save_and_load(self, tmp_path):
+        store = GameStore(tmp_path)
+        games = season_games()
+
+        assert store.save("mls", games) == "2020"
+        assert store.load("mls") == ("2020", games)
+        assert store.load("nwsl") == (None, [])
+
+    def test_open_game_ids_skip_watermark_season(self):
+        games = season_games()
+
+        assert open_game_ids(games, "2020") == [games[5]["game_id"]]
+
+    def test_merge_games(self):
+        games = season_games()
+        updated = {**games[5], "status": "FullTime"}
+        new = {**games[30], "game_id": "new", "season_name": "2021"}
+
+        merged = merge_games(
+            games, "2020", [games[5]["game_id"], games[6]["game_id"]], [updated, new]
+        )
+
+        ids = [g["game_id"] for g in merged]
+        assert ids == sorted(ids)
+        assert "new" in ids
+        assert games[6]["game_id"] not in ids
+        assert games[30]["game_id"] not in ids
+        assert updated in merged
+
+
+class TestSyncGames:
+    def test_first_sync_matches_full_fetch(self, replay, tmp_path):
+        synced = client_for(replay).sync_games(tmp_path, leagues="mls")
+        full = client_for(replay).get_games(leagues="mls")
+
+        assert synced.equals(full)
+        assert list(synced["date_time_utc"]) == sorted(
+            synced["date_time_utc"], reverse=True
+        )
+        assert GameStore(tmp_path).path("mls").exists()
+
+    def test_incremental_sync_matches_full_fetch(self, replay, tmp_path):
+        client_for(replay).sync_games(tmp_path, leagues=["mls", "nwsl"])
+
+        games = season_games()
+        games[5].update(status="FullTime", home_score=2)
+        games[30].update(status="FullTime", attendance=18000)
+        games.append({**games[31], "game_id": "new-game", "season_name": "2021"})
+        replay.set_payload("games", games)
+        replay.reset()
+
+        synced = client_for(replay).sync_games(tmp_path, leagues=["mls", "nwsl"])
+        requests = list(replay.requests)
+        full = client_for(replay).get_games(leagues=["mls", "nwsl"])
+
+        assert synced.equals(full)
+        assert [query for path, query in requests if "/mls/" in path] == [
+            {"season_name": "2020"},
+            {"status": "PreMatch"},
+            {"game_id": games[5]["game_id"]},
+        ]
+
+    def test_sync_after_sync_keeps_new_season(self, replay, tmp_path):
+        client_for(replay).sync_games(tmp_path, leagues="mls")
+        games = season_games()
+        games.append({**games[31], "game_id": "new-game", "season_name": "2021"})
+        replay.set_payload("games", games)
+
+        client_for(replay).sync_games(tmp_path, leagues="mls")
+        synced = client_for(replay).sync_games(tmp_path, leagues="mls")
+
+        assert GameStore(tmp_path).load("mls")[0] == "2021"
+        assert "new-game" in set(synced["game_id"])
+        assert len(synced) == len(games)
@@ -0,0 +1,159 @@
+from pathlib import Path
+
+import pytest
+from pytest import fixture
+from requests import HTTPError
+
+from itscalledsoccer import (
+    AmericanSoccerAnalysis,
+    MemoryTransport,
+    MetricsAggregator,
+    Transport,
+    TransportResponse,
+)
+from tests.replay_server import ReplayServer
+
+MOCKS_DIR = Path(__file__).parent / "mocks"
+
+
+@fixture
+def transport():
+    return MemoryTransport(MOCKS_DIR)
+
+
+def client_for(transport, **kwargs):
+    return AmericanSoccerAnalysis(transport=transport, result_cache_bytes=0, **kwargs)
+
+
+class TestMemoryTransport:
+    def test_matches_http_results(self, transport):
+        with ReplayServer() as replay:
+            http_client = AmericanSoccerAnalysis()
+            http_client.base_url = replay.base_url
+            expected = http_client.get_player_xgoals(leagues=["mls", "nwsl"])
+
+        client = client_for(transport)
+        data = client.get_player_xgoals(leagues=["mls", "nwsl"])
+
+        assert data.equals(expected)
+        assert sorted(path for path, _ in transport.requests) == [
+            "mls/players/xgoals",
+            "nwsl/players/xgoals",
+        ]
+        # No HTTP session is created
+        assert client._session is None
+
+    def test_pages_by_offset(self, transport):
+        transport.page_size = 10
+        client = client_for(transport, page_window=3)
+        client.MAX_API_LIMIT = 10
+
+        players = client.get_players(leagues="mls")
+
+        expected = [p["player_id"] for p in transport.records("mls", "players")]
+        assert list(players["player_id"]) == expected
+
+    def test_filters_rows(self, transport):
+        game = transport.records("mls", "games")[0]
+        client = client_for(transport)
+
+        games = client.get_games(leagues="mls", game_ids=game["game_id"])
+
+        assert list(games["game_id"]) == [game["game_id"]]
+
+    def test_league_records_override_endpoint(self):
+        transport = MemoryTransport(
+            {"teams/xgoals": [{"team_id": "a"}], "mls/teams/xgoals": [{"team_id": "b"}]}
+        )
+        client = client_for(transport)
+
+        data = client.get_team_xgoals(leagues=["mls", "nwsl"])
+
+        assert sorted(data["team_id"]) == ["a", "b"]
+
+    def test_missing_endpoint_answers_404(self):
+        transport = MemoryTransport({"mls/teams/xgoals": [{"team_id": "a"}]})
+
+        with pytest.raises(HTTPError, match="404"):
+            client_for(transport).get_team_xgoals(leagues="nwsl")
+
+        data = client_for(transport, partial_results=True).get_team_xgoals(
+            leagues=["mls", "nwsl"]
+        )
+        [error] = data.attrs["errors"]
+        assert list(data["team_id"]) == ["a"]
+        assert (error["league"], error["status"]) == ("nwsl", 404)
+        assert error["url"].endswith("/nwsl/teams/xgoals")
+
+    def test_keeps_recent_requests(self):
+        transport = MemoryTransport(
+            {"teams/xgoals": [{"team_id": "a"}]}, max_requests=2
+        )
+        client = client_for(transport)
+        for season in ("2022", "2023", "2024"):
+            client.get_team_xgoals(leagues="mls", season_name=season)
+
+        assert [query for _, query in transport.requests] == [
+            {"season_name": "2023"},
+            {"season_name": "2024"},
+        ]
+        transport.clear_requests()
+        assert not transport.requests
+
+    def test_request_events_measure_decoding(self, transport):
+        metrics = MetricsAggregator()
+        client = client_for(transport)
+        client.on_request_end(metrics)
+
+        client.get_team_xgoals(leagues="mls")
+
+        [event] = metrics.events
+        assert (event.url_template, event.status, event.cache_hit) == (
+            "{league}/teams/xgoals",
+            200,
+            False,
+        )
+        assert event.bytes_received > 0
+        assert event.decode_time > 0 and event.build_time > 0
+
+
+class TestTransport:
+    def test_custom_transport(self):
+        class RecordingTransport(Transport):
+            def __init__(self):
+                self.calls = []
+
+            def get(self, url, params, timeout, headers=None):
+                self.calls.append((url, params, timeout))
+                return TransportResponse(
+                    status=200,
+                    records=[{"team_id": "a"}],
+                    error=None,
+                    latency=0.0,
+                    bytes_received=0,
+                )
+
+        transport = RecordingTransport()
+        client = client_for(transport, request_timeout=5)
+
+        data = client.get_team_xgoals(leagues="mls", season_name="2024")
+
+        assert list(data["team_id"]) == ["a"]
+        assert transport.calls == [
+            (f"{client.base_url}mls/teams/xgoals", {"season_name": "2024"}, 5)
+        ]
+
+    def test_get_must_be_implemented(self):
+        class IncompleteTransport(Transport):
+            pass
+
+        with pytest.raises(TypeError):
+            IncompleteTransport()
+
+    def test_default_transport_uses_session(self):
+        with ReplayServer() as replay:
+            client = AmericanSoccerAnalysis()
+            client.base_url = replay.base_url
+            client.get_team_xgoals(leagues="mls")
+
+        assert client.transport.session is client.session